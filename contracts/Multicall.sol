@@ -0,0 +1,52 @@
+// SPDX-License-Identifier: GPL-3.0-only
+
+pragma solidity 0.8.4;
+
+contract Multicall {
+
+    /*----------------------------------------------------------*|
+    |*  # VARIABLES & CONSTANTS DEFINITIONS                     *|
+    |*----------------------------------------------------------*/
+
+    /**
+     * Construct defining a single view call
+     * @param target Address of the called contract
+     * @param callData ABI encoded function selector & arguments
+     */
+    struct Call {
+        address target;
+        bytes callData;
+    }
+
+    /**
+     * Construct defining an outcome of a single view call
+     * @param success False if the call reverted
+     * @param returnData ABI encoded return value || revert reason
+     */
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    /*----------------------------------------------------------*|
+    |*  # FUNCTIONS                                             *|
+    |*----------------------------------------------------------*/
+
+    /**
+     * aggregate
+     * @dev executes a batch of view calls within a single `eth_call`
+     * @dev a reverting call doesn't revert the batch, it is reported via `success == false`
+     * @param _calls List of calls to be executed
+     * @return blockNumber Number of the block the calls were executed against
+     * @return results List of call outcomes in the order of `_calls`
+     */
+    function aggregate(Call[] calldata _calls) external view returns (uint256 blockNumber, Result[] memory results) {
+        blockNumber = block.number;
+        results = new Result[](_calls.length);
+
+        for (uint256 i = 0; i < _calls.length; i++) {
+            (bool success, bytes memory returnData) = _calls[i].target.staticcall(_calls[i].callData);
+            results[i] = Result(success, returnData);
+        }
+    }
+}
@@ -6,6 +6,7 @@ import "./PWNVault.sol";
 import "./PWNDeed.sol";
 import "@pwnfinance/contracts/MultiToken.sol";
 import "@openzeppelin/contracts/access/Ownable.sol";
+import "@openzeppelin/contracts/token/ERC20/extensions/draft-IERC20Permit.sol";
 
 contract PWN is Ownable {
 
@@ -16,6 +17,23 @@ contract PWN is Ownable {
     PWNDeed public deed;
     PWNVault public vault;
 
+    /**
+     * Construct holding an EIP-2612 permit of an ERC20 asset with PWNVault as the spender
+     * @dev the owner is the account the asset is pulled from & the token the asset of the call
+     * @param value Allowance granted by the permit - at least the amount the call pulls
+     * @param deadline Unix timestamp (in seconds) after which the permit is invalid
+     * @param v Recovery byte of the permit signature
+     * @param r First 32 bytes of the permit signature
+     * @param s Second 32 bytes of the permit signature
+     */
+    struct Permit {
+        uint256 value;
+        uint256 deadline;
+        uint8 v;
+        bytes32 r;
+        bytes32 s;
+    }
+
     /*----------------------------------------------------------*|
     |*  # EVENTS & ERRORS DEFINITIONS                           *|
     |*----------------------------------------------------------*/
@@ -64,16 +82,55 @@ contract PWN is Ownable {
         return did;
     }
 
+    /**
+     * createDeedWithPermit - sets & locks ERC20 collateral without a prior approval
+     * @dev variant of `createDeed` for ERC20 collateral approved to PWNVault by an EIP-2612 permit of the caller
+     * @param _assetAddress Address of the ERC20 token supporting EIP-2612
+     * @param _duration Loan duration in seconds
+     * @param _assetAmount Amount of the ERC20 token
+     * @param _permit Permit of the caller for PWNVault to spend `_assetAmount`
+     * @return a Deed ID of the newly created Deed
+     */
+    function createDeedWithPermit(
+        address _assetAddress,
+        uint32 _duration,
+        uint256 _assetAmount,
+        Permit calldata _permit
+    ) external returns (uint256) {
+        uint256 did = deed.create(_assetAddress, MultiToken.Category.ERC20, _duration, 0, _assetAmount, msg.sender);
+        _permitVault(_assetAddress, msg.sender, _permit);
+        vault.push(deed.getDeedCollateral(did), msg.sender);
+
+        return did;
+    }
+
+    /**
+     * createDeeds - sets & locks collateral of multiple Deeds at once
+     * @dev batch variant of `createDeed`, Deed tokens are minted in a single batch
+     * @dev consecutive ERC1155 collaterals of the same contract are locked in a single transfer
+     * @param _collaterals List of collateral assets - for definition see { MultiToken.sol }
+     * @param _durations Loan durations in seconds, one per collateral
+     * @return Deed IDs of the newly created Deeds in the order of `_collaterals`
+     */
+    function createDeeds(
+        MultiToken.Asset[] memory _collaterals,
+        uint32[] memory _durations
+    ) external returns (uint256[] memory) {
+        uint256[] memory dids = deed.createBatch(_collaterals, _durations, msg.sender);
+        vault.pushBatch(_collaterals, msg.sender);
+
+        return dids;
+    }
+
     /**
      * revokeDeed
      * @dev through this function the borrower can delete the Deed token given no offer was accepted
      * @param _did Deed ID specifying the concrete Deed
      */
     function revokeDeed(uint256 _did) external {
-        deed.revoke(_did, msg.sender);
-        vault.pull(deed.getDeedCollateral(_did), msg.sender);
+        MultiToken.Asset memory collateral = deed.revoke(_did, msg.sender);
 
-        deed.burn(_did, msg.sender);
+        vault.pull(collateral, msg.sender);
     }
 
     /**
@@ -96,6 +153,24 @@ contract PWN is Ownable {
         return deed.makeOffer(_assetAddress, _assetAmount, msg.sender, _did, _toBePaid);
     }
 
+    /**
+     * makeOffers
+     * @dev batch variant of `makeOffer` for lenders casting many offers at once
+     * @param _assetAddresses Addresses of the asset contracts, one per offer
+     * @param _assetAmounts Amounts of ERC20 tokens to be offered as loans
+     * @param _dids IDs of the Deeds the offers should be bound to
+     * @param _toBePaid Amounts to be paid back by the borrowers
+     * @return hashes of the newly created offers in the order of the arguments
+     */
+    function makeOffers(
+        address[] memory _assetAddresses,
+        uint256[] memory _assetAmounts,
+        uint256[] memory _dids,
+        uint256[] memory _toBePaid
+    ) external returns (bytes32[] memory) {
+        return deed.makeOffers(_assetAddresses, _assetAmounts, msg.sender, _dids, _toBePaid);
+    }
+
     /**
      * revokeOffer
      * @dev this is the function lenders can use to remove their offers on Deeds they are in the stage of getting offers
@@ -105,6 +180,15 @@ contract PWN is Ownable {
         deed.revokeOffer(_offer, msg.sender);
     }
 
+    /**
+     * revokeOffers
+     * @dev batch variant of `revokeOffer`
+     * @param _offers Identifiers of the offers to be revoked
+     */
+    function revokeOffers(bytes32[] memory _offers) external {
+        deed.revokeOffers(_offers, msg.sender);
+    }
+
     /**
      * acceptOffer
      * @dev through this function a borrower can accept an existing offer
@@ -113,21 +197,63 @@ contract PWN is Ownable {
      * @return true if successful
      */
     function acceptOffer(bytes32 _offer) external returns (bool) {
-        uint256 did = deed.getDeedID(_offer);
-        deed.acceptOffer(did, _offer, msg.sender);
+        (uint256 did, address lender, MultiToken.Asset memory loan) = deed.acceptOffer(_offer, msg.sender);
+
+        _lend(did, lender, loan);
+
+        return true;
+    }
 
-        address lender = deed.getLender(_offer);
-        vault.pullProxy(deed.getOfferLoan(_offer), lender, msg.sender);
+    /**
+     * acceptOfferWithPermit
+     * @dev variant of `acceptOffer` where the lender approves the loan by an EIP-2612 permit instead of a transaction
+     * @dev the lender signs the permit off-chain next to making the offer, the borrower submits it
+     * @param _offer Identifier of the offer to be accepted
+     * @param _lenderPermit Permit of the lender for PWNVault to spend the loan amount
+     * @return true if successful
+     */
+    function acceptOfferWithPermit(bytes32 _offer, Permit calldata _lenderPermit) external returns (bool) {
+        (uint256 did, address lender, MultiToken.Asset memory loan) = deed.acceptOffer(_offer, msg.sender);
 
-        MultiToken.Asset memory collateral;
-        collateral.category = MultiToken.Category.ERC1155;
-        collateral.id = did;
-        collateral.assetAddress = address(deed);
-        vault.pullProxy(collateral, msg.sender, lender);
+        _permitVault(loan.assetAddress, lender, _lenderPermit);
+        _lend(did, lender, loan);
 
         return true;
     }
 
+    /**
+     * acceptSignedOffer
+     * @dev through this function a borrower can accept an offer the lender signed off-chain - see EIP-712
+     * @dev the lender doesn't pay for making the offer, only the accepted offer is ever stored
+     * @dev a UI should do an off-chain balance check on the lender side to make sure the call won't throw
+     * @param _terms Offer terms signed by the lender - for definition see { PWNDeed.sol }
+     * @param _signature Signature of the offer terms by the lender
+     * @return true if successful
+     */
+    function acceptSignedOffer(
+        PWNDeed.OfferTerms calldata _terms,
+        bytes calldata _signature
+    ) external returns (bool) {
+        deed.acceptSignedOffer(_terms, _signature, msg.sender);
+
+        MultiToken.Asset memory loan;
+        loan.assetAddress = _terms.loanAssetAddress;
+        loan.amount = _terms.loanAmount;
+        _lend(_terms.did, _terms.lender, loan);
+
+        return true;
+    }
+
+    /**
+     * revokeSignedOffers
+     * @dev lenders can invalidate signed offers which weren't accepted yet by revoking their nonces
+     * @param _wordPos Position of the nonce bitmap word - nonces `_wordPos * 256` to `_wordPos * 256 + 255`
+     * @param _mask Bits of the nonces to be revoked within the word
+     */
+    function revokeSignedOffers(uint256 _wordPos, uint256 _mask) external {
+        deed.revokeOfferNonces(_wordPos, _mask, msg.sender);
+    }
+
     /**
      * repayLoan
      * @dev the borrower can pay back the funds through this function
@@ -137,14 +263,33 @@ contract PWN is Ownable {
      * @return true if successful
      */
     function repayLoan(uint256 _did) external returns (bool) {
-        deed.repayLoan(_did);
+        (
+            address borrower,
+            MultiToken.Asset memory collateral,
+            MultiToken.Asset memory repayment
+        ) = deed.repayLoan(_did);
 
-        bytes32 offer = deed.getAcceptedOffer(_did);
-        MultiToken.Asset memory loan = deed.getOfferLoan(offer);
-        loan.amount = deed.toBePaid(offer);  //override the num of loan given
+        vault.pushPull(repayment, msg.sender, collateral, borrower);
 
-        vault.pull(deed.getDeedCollateral(_did), deed.getBorrower(_did));
-        vault.push(loan, msg.sender);
+        return true;
+    }
+
+    /**
+     * repayLoanWithPermit
+     * @dev variant of `repayLoan` where the repayment is approved by an EIP-2612 permit of the caller
+     * @param _did Deed ID of the deed being paid back
+     * @param _permit Permit of the caller for PWNVault to spend the amount to be paid back
+     * @return true if successful
+     */
+    function repayLoanWithPermit(uint256 _did, Permit calldata _permit) external returns (bool) {
+        (
+            address borrower,
+            MultiToken.Asset memory collateral,
+            MultiToken.Asset memory repayment
+        ) = deed.repayLoan(_did);
+
+        _permitVault(repayment.assetAddress, msg.sender, _permit);
+        vault.pushPull(repayment, msg.sender, collateral, borrower);
 
         return true;
     }
@@ -156,24 +301,66 @@ contract PWN is Ownable {
      * @return true if successful
      */
     function claimDeed(uint256 _did) external returns (bool) {
-        uint8 status = deed.getDeedStatus(_did);
+        MultiToken.Asset memory asset = deed.claim(_did, msg.sender);
 
-        deed.claim(_did, msg.sender);
+        vault.pull(asset, msg.sender);
 
-        if (status == 3) {
-            bytes32 offer = deed.getAcceptedOffer(_did);
-            MultiToken.Asset memory loan = deed.getOfferLoan(offer);
-            loan.amount = deed.toBePaid(offer);
+        return true;
+    }
 
-            vault.pull(loan, msg.sender);
+    /**
+     * claimDeeds
+     * @dev batch variant of `claimDeed` - every Deed has to be claimable by the caller or the whole batch reverts
+     * @param _dids Deed IDs of the deeds to be claimed
+     * @return true if successful
+     */
+    function claimDeeds(uint256[] memory _dids) external returns (bool) {
+        for (uint256 i = 0; i < _dids.length; i++) {
+            MultiToken.Asset memory asset = deed.claim(_dids[i], msg.sender);
 
-        } else if (status == 4) {
-            vault.pull(deed.getDeedCollateral(_did), msg.sender);
+            vault.pull(asset, msg.sender);
         }
 
-        deed.burn(_did, msg.sender);
-
         return true;
     }
 
+    /*----------------------------------------------------------*|
+    |*  # INTERNAL FUNCTIONS                                    *|
+    |*----------------------------------------------------------*/
+
+    /**
+     * _lend
+     * @dev moves the loan of an accepted offer from the lender to the borrower & the Deed token the other way
+     * @param _did Deed ID of the Deed the offer was accepted for
+     * @param _lender Address of the lender who made the offer
+     * @param _loan The loan asset of the offer - for definition see { MultiToken.sol }
+     */
+    function _lend(uint256 _did, address _lender, MultiToken.Asset memory _loan) internal {
+        MultiToken.Asset memory deedToken;
+        deedToken.category = MultiToken.Category.ERC1155;
+        deedToken.id = _did;
+        deedToken.assetAddress = address(deed);
+        vault.pullProxyPair(_loan, _lender, deedToken, msg.sender);
+    }
+
+    /**
+     * _permitVault
+     * @dev approves PWNVault to spend an ERC20 asset of `_owner` by an EIP-2612 permit
+     * @dev a failing permit is ignored - anyone can submit a seen permit first (front-running), the allowance
+     *      is then already set & a missing one makes the following vault transfer fail anyway
+     * @param _asset Address of the ERC20 token supporting EIP-2612
+     * @param _owner Address of the permit signer
+     * @param _permit The permit - for definition see `Permit`
+     */
+    function _permitVault(address _asset, address _owner, Permit calldata _permit) internal {
+        try IERC20Permit(_asset).permit(
+            _owner,
+            address(vault),
+            _permit.value,
+            _permit.deadline,
+            _permit.v,
+            _permit.r,
+            _permit.s
+        ) {} catch {}
+    }
 }
\ No newline at end of file
@@ -5,8 +5,10 @@ pragma solidity 0.8.4;
 import "@pwnfinance/contracts/MultiToken.sol";
 import "@openzeppelin/contracts/access/Ownable.sol";
 import "@openzeppelin/contracts/token/ERC1155/ERC1155.sol";
+import "@openzeppelin/contracts/utils/cryptography/ECDSA.sol";
+import "@openzeppelin/contracts/utils/cryptography/draft-EIP712.sol";
 
-contract PWNDeed is ERC1155, Ownable {
+contract PWNDeed is ERC1155, Ownable, EIP712 {
 
     /*----------------------------------------------------------*|
     |*  # VARIABLES & CONSTANTS DEFINITIONS                     *|
@@ -16,15 +18,20 @@ contract PWNDeed is ERC1155, Ownable {
     uint256 public id;                  // simple DeedID counter
     uint256 private nonce;              // server for offer hash generation
 
+    bytes32 public constant OFFER_TYPEHASH = keccak256(
+        "Offer(address lender,uint256 did,address loanAssetAddress,uint256 loanAmount,uint256 toBePaid,uint256 nonce,uint256 deadline)"
+    );
+
     /**
      * Construct defining a Deed
+     * @dev `status`, `borrower`, `duration` & `expiration` share the first storage slot, `acceptOffer` & `repayLoan`
+     *      write only that slot & `acceptedOffer` on acceptance, `claim` & `revoke` delete the Deed
      * @param status 0 == none/dead || 1 == new/open || 2 == running/accepted offer || 3 == paid back || 4 == expired
      * @param borrower Address of the issuer / borrower - stays the same for entire lifespan of the token
      * @param duration Loan duration in seconds
      * @param expiration Unix timestamp (in seconds) setting up the default deadline
      * @param collateral Consisting of another an `Asset` struct defined in the MultiToken library
      * @param acceptedOffer Hash of the offer which will be bound to the deed
-     * @param pendingOffers List of offers made to the Deed
      */
     struct Deed {
         uint8 status;
@@ -33,25 +40,59 @@ contract PWNDeed is ERC1155, Ownable {
         uint40 expiration;
         MultiToken.Asset collateral;
         bytes32 acceptedOffer;
-        bytes32[] pendingOffers;
     }
 
     /**
      * Construct defining an offer
+     * @dev the loan asset is stored flat so the offer takes 4 storage slots instead of 6:
+     *      `lender` & `did` | `loanAssetAddress` & `pendingIndex` | `loanAmount` | `toBePaid`
+     * @dev only ERC20 tokens can be offered as loan, so the loan category & id are implied
+     * @param lender Address of the lender to be the loan withdrawn from
      * @param did Deed ID the offer is bound to
+     * @param loanAssetAddress Address of the ERC20 token offered as loan
+     * @param pendingIndex Position in the pending offers of the Deed + 1 || 0 if not pending
+     * @param loanAmount Amount of the ERC20 token offered as loan
      * @param toBePaid Nn amount to be paid back (borrowed + interest)
-     * @param lender Address of the lender to be the loan withdrawn from
-     * @param loan Consisting of another an `Asset` struct defined in the MultiToken library
      */
     struct Offer {
-        uint256 did;
-        uint256 toBePaid;
         address lender;
-        MultiToken.Asset loan;
+        uint96 did;
+        address loanAssetAddress;
+        uint96 pendingIndex;
+        uint256 loanAmount;
+        uint256 toBePaid;
     }
 
     mapping (uint256 => Deed) public deeds;             // mapping of all Deed data
-    mapping (bytes32 => Offer) public offers;           // mapping of all Offer data
+    mapping (bytes32 => Offer) private packedOffers;    // mapping of all Offer data - see `offers(bytes32)`
+
+    /**
+     * Construct defining the terms of an offer signed off-chain by the lender - see EIP-712
+     * @param lender Address of the lender to be the loan withdrawn from
+     * @param did Deed ID the offer is bound to
+     * @param loanAssetAddress Address of the ERC20 token offered as loan
+     * @param loanAmount Amount of the ERC20 token offered as loan
+     * @param toBePaid Nn amount to be paid back (borrowed + interest)
+     * @param nonce Number chosen by the lender making the signature single use - see `revokeOfferNonces`
+     * @param deadline Unix timestamp (in seconds) after which the offer can't be accepted
+     */
+    struct OfferTerms {
+        address lender;
+        uint256 did;
+        address loanAssetAddress;
+        uint256 loanAmount;
+        uint256 toBePaid;
+        uint256 nonce;
+        uint256 deadline;
+    }
+
+    // lender => word position => bitmap of used & revoked signed offer nonces, nonce `n` is bit `n & 0xff` of word `n >> 8`
+    mapping (address => mapping (uint256 => uint256)) public offerNonceBitmap;
+
+    // Offers pending on a Deed - kept outside of the `Deed` struct so burning a Deed doesn't iterate them
+    // revoked offers are swapped with the last one & popped, the list of an accepted Deed is left as is
+    // since it is never read again - neither operation depends on the number of offers
+    mapping (uint256 => bytes32[]) private pendingOffers;
 
     /*----------------------------------------------------------*|
     |*  # EVENTS & ERRORS DEFINITIONS                           *|
@@ -64,6 +105,7 @@ contract PWNDeed is ERC1155, Ownable {
     event OfferAccepted(uint256 did, bytes32 offer);
     event PaidBack(uint256 did, bytes32 offer);
     event DeedClaimed(uint256 did);
+    event OfferNoncesRevoked(address indexed lender, uint256 wordPos, uint256 mask);
 
     /*----------------------------------------------------------*|
     |*  # MODIFIERS                                             *|
@@ -84,7 +126,7 @@ contract PWNDeed is ERC1155, Ownable {
      *  @dev Once the PWN contract is set, you'll have to call `this.setPWN(PWN.address)` for this contract to work
      *  @param _uri Uri to be used for finding the token metadata (https://api.pwn.finance/deed/...)
      */
-    constructor(string memory _uri) ERC1155(_uri) Ownable() {
+    constructor(string memory _uri) ERC1155(_uri) Ownable() EIP712("PWN", "1") {
 
     }
 
@@ -129,20 +171,69 @@ contract PWNDeed is ERC1155, Ownable {
         return id;
     }
 
+    /**
+     * createBatch
+     * @dev Batch variant of `create` - mints all Deed tokens at once via `_mintBatch`
+     * @dev emits a `DeedCreated` event per Deed, the same as `create`
+     * @param _collaterals List of collateral assets - for definition see { MultiToken.sol }
+     * @param _durations Loan durations in seconds, one per collateral
+     * @param _owner Address initiating the new Deeds
+     * @return Deed IDs of the newly minted Deeds in the order of `_collaterals`
+     */
+    function createBatch(
+        MultiToken.Asset[] memory _collaterals,
+        uint32[] memory _durations,
+        address _owner
+    ) external onlyPWN returns (uint256[] memory) {
+        require(_collaterals.length == _durations.length, "Array lengths don't match");
+
+        uint256[] memory dids = new uint256[](_collaterals.length);
+        uint256[] memory amounts = new uint256[](_collaterals.length);
+        for (uint256 i = 0; i < _collaterals.length; i++) {
+            id++;
+
+            Deed storage deed = deeds[id];
+            deed.duration = _durations[i];
+            deed.collateral = _collaterals[i];
+
+            dids[i] = id;
+            amounts[i] = 1;
+        }
+
+        _mintBatch(_owner, dids, amounts, "");
+
+        for (uint256 i = 0; i < dids.length; i++) {
+            deeds[dids[i]].status = 1;
+
+            emit DeedCreated(
+                _collaterals[i].assetAddress,
+                _collaterals[i].category,
+                _collaterals[i].id,
+                _collaterals[i].amount,
+                _durations[i],
+                dids[i]
+            );
+        }
+
+        return dids;
+    }
+
     /**
      * revoke
      * @dev Burns a deed token
      * @param _did Deed ID of the token to be burned
      * @param _owner Address of the borrower who issued the Deed
+     * @return collateral The collateral to be returned to the borrower
      */
     function revoke(
         uint256 _did,
         address _owner
-    ) external onlyPWN {
+    ) external onlyPWN returns (MultiToken.Asset memory collateral) {
         require(balanceOf(_owner, _did) == 1, "The deed doesn't belong to the caller");
         require(getDeedStatus(_did) == 1, "Deed can't be revoked at this stage");
 
-        deeds[_did].status = 0;
+        collateral = deeds[_did].collateral;
+        _burnDeed(_did, _owner);
 
         emit DeedRevoked(_did);
     }
@@ -165,70 +256,145 @@ contract PWNDeed is ERC1155, Ownable {
         uint256 _did,
         uint256 _toBePaid
     ) external onlyPWN returns (bytes32) {
-        require(getDeedStatus(_did) == 1, "Deed not accepting offers");
-
-        bytes32 hash = keccak256(abi.encodePacked(_lender, nonce));
-        nonce++;
-
-        Offer storage offer = offers[hash];
-        offer.loan.assetAddress = _assetAddress;
-        offer.loan.amount = _assetAmount;
-        offer.toBePaid = _toBePaid;
-        offer.lender = _lender;
-        offer.did = _did;
-
-        deeds[_did].pendingOffers.push(hash);
+        return _makeOffer(_assetAddress, _assetAmount, _lender, _did, _toBePaid);
+    }
 
-        emit OfferMade(_assetAddress, _assetAmount, _lender, _toBePaid, _did, hash);
+    /**
+     * makeOffers
+     * @dev Batch variant of `makeOffer` - emits an `OfferMade` event per offer
+     * @param _assetAddresses Addresses of the asset contracts, one per offer
+     * @param _assetAmounts Amounts of ERC20 tokens to be offered as loans
+     * @param _lender Address of the asset lender of all the offers
+     * @param _dids IDs of the Deeds the offers should be bound to
+     * @param _toBePaid Amounts to be paid back by the borrowers
+     * @return hashes of the newly created offers in the order of the arguments
+     */
+    function makeOffers(
+        address[] memory _assetAddresses,
+        uint256[] memory _assetAmounts,
+        address _lender,
+        uint256[] memory _dids,
+        uint256[] memory _toBePaid
+    ) external onlyPWN returns (bytes32[] memory) {
+        require(
+            _assetAddresses.length == _assetAmounts.length &&
+            _assetAddresses.length == _dids.length &&
+            _assetAddresses.length == _toBePaid.length,
+            "Array lengths don't match"
+        );
+
+        bytes32[] memory hashes = new bytes32[](_dids.length);
+        for (uint256 i = 0; i < _dids.length; i++) {
+            hashes[i] = _makeOffer(_assetAddresses[i], _assetAmounts[i], _lender, _dids[i], _toBePaid[i]);
+        }
 
-        return hash;
+        return hashes;
     }
 
     /**
      * revokeOffer
      * @dev function to remove a pending offer
-     * @dev This only removes the offer representation but it doesn't remove the offer from a list of pending offers.
-     *         The offers associated with a deed has to be filtered on the front end to only list the valid ones.
-     *         No longer existent offers will simply return 0 if prompted about their DID.
+     * @dev removes both the offer representation and the offer from the list of pending offers of its Deed
+     * @dev No longer existent offers will simply return 0 if prompted about their DID.
      * @param _offer Hash identifying an offer
      * @param _lender Address of the lender who made the offer
-     * @dev TODO: consider ways to remove the offer from the pending offers array / maybe replace for a mapping
      */
     function revokeOffer(
         bytes32 _offer,
         address _lender
     ) external onlyPWN {
-        require(offers[_offer].lender == _lender, "This address didn't create the offer");
-        require(getDeedStatus(offers[_offer].did) == 1, "Can only remove offers from open Deeds");
-
-        delete offers[_offer];
+        _revokeOffer(_offer, _lender);
+    }
 
-        emit OfferRevoked(_offer);
+    /**
+     * revokeOffers
+     * @dev Batch variant of `revokeOffer` - emits an `OfferRevoked` event per offer
+     * @param _offers Hashes identifying the offers
+     * @param _lender Address of the lender who made all the offers
+     */
+    function revokeOffers(
+        bytes32[] memory _offers,
+        address _lender
+    ) external onlyPWN {
+        for (uint256 i = 0; i < _offers.length; i++) {
+            _revokeOffer(_offers[i], _lender);
+        }
     }
 
     /**
      * acceptOffer
      * @dev function to set accepted offer
-     * @param _did ID of the Deed the offer should be bound to
+     * @dev returns everything PWN needs to move the loan & the deed token, saving it a getter call for each
      * @param _offer Hash identifying an offer
      * @param _owner Address of the borrower who issued the Deed
+     * @return did ID of the Deed the offer is bound to
+     * @return lender Address of the lender who made the offer
+     * @return loan The loan to be sent from the lender to the borrower
      */
     function acceptOffer(
-        uint256 _did,
         bytes32 _offer,
         address _owner
-    ) external onlyPWN {
-        require(balanceOf(_owner, _did) == 1, "The deed doesn't belong to the caller");
-        require(getDeedStatus(_did) == 1, "Deed can't accept more offers");
+    ) external onlyPWN returns (uint256 did, address lender, MultiToken.Asset memory loan) {
+        Offer storage offer = packedOffers[_offer];
+        did = offer.did;
+        lender = offer.lender;
+        loan = MultiToken.Asset(offer.loanAssetAddress, MultiToken.Category.ERC20, offer.loanAmount, 0);
 
-        Deed storage deed = deeds[_did];
-        deed.borrower = _owner;
-        deed.expiration = uint40(block.timestamp) + deed.duration;
-        deed.acceptedOffer = _offer;
-        delete deed.pendingOffers;
-        deed.status = 2;
+        _acceptOffer(did, _offer, _owner);
+    }
 
-        emit OfferAccepted(_did, _offer);
+    /**
+     * acceptSignedOffer
+     * @dev function to set an offer signed off-chain by the lender as accepted
+     * @dev nothing is stored about a signed offer before its acceptance, then it is saved under its EIP-712 hash
+     *      so repaying & claiming work the same as with `acceptOffer`
+     * @dev emits `OfferMade` & `OfferAccepted`, the same events as an offer made & accepted on-chain
+     * @param _terms Offer terms signed by the lender
+     * @param _signature Signature of the EIP-712 hash of `_terms` by the lender
+     * @param _owner Address of the borrower who issued the Deed
+     * @return hash identifying the accepted offer
+     */
+    function acceptSignedOffer(
+        OfferTerms calldata _terms,
+        bytes calldata _signature,
+        address _owner
+    ) external onlyPWN returns (bytes32) {
+        require(block.timestamp <= _terms.deadline, "Offer expired");
+
+        bytes32 hash = getSignedOfferHash(_terms);
+        require(ECDSA.recover(hash, _signature) == _terms.lender, "Invalid offer signature");
+        _useOfferNonce(_terms.lender, _terms.nonce);
+
+        // the cast can't truncate an ID of a Deed `_acceptOffer` lets through
+        Offer storage offer = packedOffers[hash];
+        offer.lender = _terms.lender;
+        offer.did = uint96(_terms.did);
+        offer.loanAssetAddress = _terms.loanAssetAddress;
+        offer.loanAmount = _terms.loanAmount;
+        offer.toBePaid = _terms.toBePaid;
+
+        emit OfferMade(_terms.loanAssetAddress, _terms.loanAmount, _terms.lender, _terms.toBePaid, _terms.did, hash);
+
+        _acceptOffer(_terms.did, hash, _owner);
+
+        return hash;
+    }
+
+    /**
+     * revokeOfferNonces
+     * @dev invalidates signed offers of a lender by marking their nonces as used
+     * @param _wordPos Position of the bitmap word - nonces `_wordPos * 256` to `_wordPos * 256 + 255`
+     * @param _mask Bits of the nonces to be revoked within the word
+     * @param _lender Address of the lender who signed the offers
+     */
+    function revokeOfferNonces(
+        uint256 _wordPos,
+        uint256 _mask,
+        address _lender
+    ) external onlyPWN {
+        offerNonceBitmap[_lender][_wordPos] |= _mask;
+
+        emit OfferNoncesRevoked(_lender, _wordPos, _mask);
     }
 
     /**
@@ -236,12 +402,21 @@ contract PWNDeed is ERC1155, Ownable {
      * @dev function to make proper state transition
      * @param _did ID of the Deed which is paid back
      */
-    function repayLoan(uint256 _did) external onlyPWN {
+    function repayLoan(uint256 _did) external onlyPWN returns (
+        address borrower,
+        MultiToken.Asset memory collateral,
+        MultiToken.Asset memory repayment
+    ) {
         require(getDeedStatus(_did) == 2, "Deed doesn't have an accepted offer to be paid back");
 
-        deeds[_did].status = 3;
+        Deed storage deed = deeds[_did];
+        deed.status = 3;
+
+        borrower = deed.borrower;
+        collateral = deed.collateral;
+        repayment = _getRepayment(deed.acceptedOffer);
 
-        emit PaidBack(_did, deeds[_did].acceptedOffer);
+        emit PaidBack(_did, deed.acceptedOffer);
     }
 
     /**
@@ -249,36 +424,160 @@ contract PWNDeed is ERC1155, Ownable {
      * @dev function that would burn the deed token if the token is in paidBack or expired state
      * @param _did ID of the Deed which is claimed
      * @param _owner Address of the deed token owner
+     * @return asset The paid back loan or the collateral of an expired Deed, to be sent to the owner
      */
     function claim(
         uint256 _did,
         address _owner
-    ) external onlyPWN {
+    ) external onlyPWN returns (MultiToken.Asset memory asset) {
         require(balanceOf(_owner, _did) == 1, "Caller is not the deed owner");
-        require(getDeedStatus(_did) >= 3, "Deed can't be claimed yet");
+        uint8 status = getDeedStatus(_did);
+        require(status >= 3, "Deed can't be claimed yet");
 
-        deeds[_did].status = 0;
+        if (status == 3) {
+            asset = _getRepayment(deeds[_did].acceptedOffer);
+        } else {
+            asset = deeds[_did].collateral;
+        }
+        _burnDeed(_did, _owner);
 
         emit DeedClaimed(_did);
     }
 
+    /*----------------------------------------------------------*|
+    |*  ## INTERNAL FUNCTIONS                                   *|
+    |*----------------------------------------------------------*/
+
     /**
-     * burn
-     * @dev function that would burn the deed token if the token is in dead state
-     * @param _did ID of the Deed which is burned
-     * @param _owner Address of the deed token owner
+     * _makeOffer
+     * @dev shared implementation of `makeOffer` & `makeOffers`
      */
-    function burn(
+    function _makeOffer(
+        address _assetAddress,
+        uint256 _assetAmount,
+        address _lender,
+        uint256 _did,
+        uint256 _toBePaid
+    ) internal returns (bytes32) {
+        require(getDeedStatus(_did) == 1, "Deed not accepting offers");
+
+        bytes32 hash = keccak256(abi.encodePacked(_lender, nonce));
+        nonce++;
+
+        pendingOffers[_did].push(hash);
+
+        // `_did` belongs to an open Deed, so it is within the `id` counter & fits 96 bits
+        Offer storage offer = packedOffers[hash];
+        offer.lender = _lender;
+        offer.did = uint96(_did);
+        offer.loanAssetAddress = _assetAddress;
+        offer.pendingIndex = uint96(pendingOffers[_did].length);
+        offer.loanAmount = _assetAmount;
+        offer.toBePaid = _toBePaid;
+
+        emit OfferMade(_assetAddress, _assetAmount, _lender, _toBePaid, _did, hash);
+
+        return hash;
+    }
+
+    /**
+     * _revokeOffer
+     * @dev shared implementation of `revokeOffer` & `revokeOffers`
+     */
+    function _revokeOffer(
+        bytes32 _offer,
+        address _lender
+    ) internal {
+        Offer storage offer = packedOffers[_offer];
+        require(offer.lender == _lender, "This address didn't create the offer");
+        require(getDeedStatus(offer.did) == 1, "Can only remove offers from open Deeds");
+
+        _removePendingOffer(offer.did, offer.pendingIndex - 1);
+        delete packedOffers[_offer];
+
+        emit OfferRevoked(_offer);
+    }
+
+    /**
+     * _acceptOffer
+     * @dev shared implementation of `acceptOffer` & `acceptSignedOffer`
+     */
+    function _acceptOffer(
         uint256 _did,
+        bytes32 _offer,
         address _owner
-    ) external onlyPWN {
-        require(balanceOf(_owner, _did) == 1, "Caller is not the deed owner");
-        require(deeds[_did].status == 0, "Deed can't be burned at this stage");
+    ) internal {
+        require(balanceOf(_owner, _did) == 1, "The deed doesn't belong to the caller");
+        require(getDeedStatus(_did) == 1, "Deed can't accept more offers");
+
+        Deed storage deed = deeds[_did];
+        deed.borrower = _owner;
+        deed.expiration = uint40(block.timestamp) + deed.duration;
+        deed.acceptedOffer = _offer;
+        deed.status = 2;
+
+        emit OfferAccepted(_did, _offer);
+    }
 
+    /**
+     * _burnDeed
+     * @dev deletes a Deed & burns its token once the Deed reached its end
+     * @param _did ID of the Deed to be burned
+     * @param _owner Address of the deed token owner
+     */
+    function _burnDeed(
+        uint256 _did,
+        address _owner
+    ) internal {
         delete deeds[_did];
         _burn(_owner, _did, 1);
     }
 
+    /**
+     * _getRepayment
+     * @dev the loan asset of an offer with the amount to be paid back instead of the amount lent
+     * @param _offer Hash identifying the accepted offer
+     */
+    function _getRepayment(bytes32 _offer) internal view returns (MultiToken.Asset memory) {
+        Offer storage offer = packedOffers[_offer];
+        return MultiToken.Asset(offer.loanAssetAddress, MultiToken.Category.ERC20, offer.toBePaid, 0);
+    }
+
+    /**
+     * _useOfferNonce
+     * @dev marks a signed offer nonce of a lender as used, reverts if it already was used or revoked
+     * @param _lender Address of the lender who signed the offer
+     * @param _nonce Nonce of the signed offer
+     */
+    function _useOfferNonce(
+        address _lender,
+        uint256 _nonce
+    ) internal {
+        uint256 bit = 1 << (_nonce & 0xff);
+        uint256 word = offerNonceBitmap[_lender][_nonce >> 8];
+        require(word & bit == 0, "Offer nonce already used");
+
+        offerNonceBitmap[_lender][_nonce >> 8] = word | bit;
+    }
+
+    /**
+     * _removePendingOffer
+     * @dev removes an offer from the pending offers of a Deed by moving the last offer in its place
+     * @param _did Deed ID the offer is bound to
+     * @param _index Position of the offer in the pending offers of the Deed
+     */
+    function _removePendingOffer(
+        uint256 _did,
+        uint256 _index
+    ) internal {
+        bytes32[] storage pending = pendingOffers[_did];
+        bytes32 last = pending[pending.length - 1];
+
+        pending[_index] = last;
+        packedOffers[last].pendingIndex = uint96(_index + 1);
+        pending.pop();
+    }
+
     /*----------------------------------------------------------*|
     |*  ## VIEW FUNCTIONS                                       *|
     |*----------------------------------------------------------*/
@@ -345,11 +644,50 @@ contract PWNDeed is ERC1155, Ownable {
     /**
      * getOffers
      * @dev utility function to get a list of all pending offers of a Deed
+     * @dev only an open Deed has pending offers, the order changes as offers get revoked
      * @param _did Deed ID to be checked
      * @return a list of offer hashes
      */
     function getOffers(uint256 _did) public view returns (bytes32[] memory) {
-        return deeds[_did].pendingOffers;
+        if (getDeedStatus(_did) != 1) {
+            return new bytes32[](0);
+        }
+
+        return pendingOffers[_did];
+    }
+
+    /**
+     * getOffers
+     * @dev paginated variant of `getOffers(_did)` for Deeds with too many offers to be listed in one call
+     * @dev the order changes as offers get revoked, so a listing spanning several blocks can miss or repeat offers
+     * @param _did Deed ID to be checked
+     * @param _cursor Position of the first offer to be listed - 0 for the first page
+     * @param _limit Maximal number of offers to be listed
+     * @return page a list of offer hashes
+     * @return nextCursor Cursor of the next page || 0 if there are no more offers
+     */
+    function getOffers(
+        uint256 _did,
+        uint256 _cursor,
+        uint256 _limit
+    ) public view returns (bytes32[] memory page, uint256 nextCursor) {
+        require(_limit > 0, "Limit has to be positive");
+
+        bytes32[] storage pending = pendingOffers[_did];
+        if (getDeedStatus(_did) != 1 || _cursor >= pending.length) {
+            return (new bytes32[](0), 0);
+        }
+
+        uint256 end = pending.length;
+        if (_limit < end - _cursor) {
+            end = _cursor + _limit;
+            nextCursor = end;
+        }
+
+        page = new bytes32[](end - _cursor);
+        for (uint256 i = _cursor; i < end; i++) {
+            page[i - _cursor] = pending[i];
+        }
     }
 
     /**
@@ -367,6 +705,25 @@ contract PWNDeed is ERC1155, Ownable {
     |*  ## VIEW FUNCTIONS - OFFERS    *|
     |*--------------------------------*/
 
+    /**
+     * offers
+     * @dev keeps the interface of the former public `offers` mapping
+     * @param _offer Offer hash of an offer to be prompted
+     * @return did Deed ID the offer is bound to
+     * @return toBePaid Amount to be paid back
+     * @return lender Address of the lender
+     * @return loan Asset construct - for definition see { MultiToken.sol }
+     */
+    function offers(bytes32 _offer) external view returns (
+        uint256 did,
+        uint256 toBePaid,
+        address lender,
+        MultiToken.Asset memory loan
+    ) {
+        Offer storage offer = packedOffers[_offer];
+        return (offer.did, offer.toBePaid, offer.lender, getOfferLoan(_offer));
+    }
+
     /**
      * getDeedID
      * @dev utility function to find out which Deed is an offer associated with
@@ -374,7 +731,7 @@ contract PWNDeed is ERC1155, Ownable {
      * @return Deed ID
      */
     function getDeedID(bytes32 _offer) public view returns (uint256) {
-        return offers[_offer].did;
+        return packedOffers[_offer].did;
     }
 
     /**
@@ -384,7 +741,8 @@ contract PWNDeed is ERC1155, Ownable {
      * @return Asset construct - for definition see { MultiToken.sol }
      */
     function getOfferLoan(bytes32 _offer) public view returns (MultiToken.Asset memory) {
-        return offers[_offer].loan;
+        Offer storage offer = packedOffers[_offer];
+        return MultiToken.Asset(offer.loanAssetAddress, MultiToken.Category.ERC20, offer.loanAmount, 0);
     }
 
     /**
@@ -394,7 +752,7 @@ contract PWNDeed is ERC1155, Ownable {
      * @return Amount to be paid back
      */
     function toBePaid(bytes32 _offer) public view returns (uint256) {
-        return offers[_offer].toBePaid;
+        return packedOffers[_offer].toBePaid;
     }
 
     /**
@@ -404,7 +762,50 @@ contract PWNDeed is ERC1155, Ownable {
      * @return Address of the lender
      */
     function getLender(bytes32 _offer) public view returns (address) {
-        return offers[_offer].lender;
+        return packedOffers[_offer].lender;
+    }
+
+    /*--------------------------------*|
+    |*  ## VIEW FUNCTIONS - SIGNED    *|
+    |*--------------------------------*/
+
+    /**
+     * getSignedOfferHash
+     * @dev EIP-712 hash of signed offer terms - the message a lender signs & the identifier of the offer once accepted
+     * @param _terms Offer terms to be hashed
+     * @return EIP-712 typed data hash
+     */
+    function getSignedOfferHash(OfferTerms calldata _terms) public view returns (bytes32) {
+        return _hashTypedDataV4(keccak256(abi.encode(
+            OFFER_TYPEHASH,
+            _terms.lender,
+            _terms.did,
+            _terms.loanAssetAddress,
+            _terms.loanAmount,
+            _terms.toBePaid,
+            _terms.nonce,
+            _terms.deadline
+        )));
+    }
+
+    /**
+     * isOfferNonceUsed
+     * @dev utility function to find out if a signed offer can still be accepted as far as its nonce goes
+     * @param _lender Address of the lender who signed the offer
+     * @param _nonce Nonce of the signed offer
+     * @return true if the nonce was used or revoked
+     */
+    function isOfferNonceUsed(address _lender, uint256 _nonce) public view returns (bool) {
+        return offerNonceBitmap[_lender][_nonce >> 8] & (1 << (_nonce & 0xff)) != 0;
+    }
+
+    /**
+     * domainSeparator
+     * @dev EIP-712 domain separator of signed offers
+     * @return the domain separator for the current chain
+     */
+    function domainSeparator() external view returns (bytes32) {
+        return _domainSeparatorV4();
     }
 
     /*--------------------------------*|
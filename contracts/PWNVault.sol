@@ -4,6 +4,7 @@ pragma solidity 0.8.4;
 
 import "@pwnfinance/contracts/MultiToken.sol";
 import "@openzeppelin/contracts/access/Ownable.sol";
+import "@openzeppelin/contracts/token/ERC1155/IERC1155.sol";
 import "@openzeppelin/contracts/token/ERC1155/IERC1155Receiver.sol";
 
 contract PWNVault is Ownable, IERC1155Receiver {
@@ -58,6 +59,53 @@ contract PWNVault is Ownable, IERC1155Receiver {
         return true;
     }
 
+    /**
+     * pushBatch
+     * @dev batch variant of `push` - emits a `VaultPush` event per asset
+     * @dev consecutive ERC1155 assets of the same contract are moved with a single `safeBatchTransferFrom`
+     * @param _assets List of asset constructs - for definition see { MultiToken.sol }
+     * @param _origin An address the assets are pulled from
+     * @return true if successful
+     */
+    function pushBatch(MultiToken.Asset[] memory _assets, address _origin) external onlyPWN returns (bool) {
+        uint256 i = 0;
+        while (i < _assets.length) {
+            if (_assets[i].category != MultiToken.Category.ERC1155) {
+                _assets[i].transferAssetFrom(_origin, address(this));
+                i++;
+                continue;
+            }
+
+            uint256 end = i + 1;
+            while (
+                end < _assets.length &&
+                _assets[end].category == MultiToken.Category.ERC1155 &&
+                _assets[end].assetAddress == _assets[i].assetAddress
+            ) {
+                end++;
+            }
+
+            uint256[] memory ids = new uint256[](end - i);
+            uint256[] memory amounts = new uint256[](end - i);
+            for (uint256 j = i; j < end; j++) {
+                // same as `MultiToken.transferAssetFrom` - zero amount of an ERC1155 means one token
+                if (_assets[j].amount == 0) {
+                    _assets[j].amount = 1;
+                }
+                ids[j - i] = _assets[j].id;
+                amounts[j - i] = _assets[j].amount;
+            }
+            IERC1155(_assets[i].assetAddress).safeBatchTransferFrom(_origin, address(this), ids, amounts, "");
+
+            i = end;
+        }
+
+        for (uint256 j = 0; j < _assets.length; j++) {
+            emit VaultPush(_assets[j], _origin);
+        }
+        return true;
+    }
+
     /**
      * pull
      * @dev function pulling an asset FROM the vault, sending to a defined recipient
@@ -86,6 +134,56 @@ contract PWNVault is Ownable, IERC1155Receiver {
         emit VaultProxy(_asset, _origin, _beneficiary);
         return true;
     }
+
+    /**
+     * pullProxyPair
+     * @dev `pullProxy` of an asset & of a counter asset going the other way in a single call - used to exchange the loan
+     *      for the deed token when an offer is accepted
+     * @dev this function assumes prior approval of both assets
+     * @param _asset An asset construct sent from `_origin` to `_beneficiary` - for definition see { MultiToken.sol }
+     * @param _origin An address of the lender who is providing the loan asset
+     * @param _counterAsset An asset construct sent from `_beneficiary` to `_origin`
+     * @param _beneficiary An address of the recipient of the asset & the provider of the counter asset
+     * @return true if successful
+     */
+    function pullProxyPair(
+        MultiToken.Asset memory _asset,
+        address _origin,
+        MultiToken.Asset memory _counterAsset,
+        address _beneficiary
+    ) external onlyPWN returns (bool) {
+        _asset.transferAssetFrom(_origin, _beneficiary);
+        emit VaultProxy(_asset, _origin, _beneficiary);
+
+        _counterAsset.transferAssetFrom(_beneficiary, _origin);
+        emit VaultProxy(_counterAsset, _beneficiary, _origin);
+        return true;
+    }
+
+    /**
+     * pushPull
+     * @dev `push` of one asset followed by `pull` of another in a single call - used to lock the paid back loan
+     *      & to release the collateral on repayment
+     * @dev the function assumes a prior token approval of the pushed asset
+     * @param _pushAsset An asset construct pushed INTO the vault - for definition see { MultiToken.sol }
+     * @param _origin An address the pushed asset is taken from
+     * @param _pullAsset An asset construct pulled FROM the vault
+     * @param _beneficiary An address of the recipient of the pulled asset
+     * @return true if successful
+     */
+    function pushPull(
+        MultiToken.Asset memory _pushAsset,
+        address _origin,
+        MultiToken.Asset memory _pullAsset,
+        address _beneficiary
+    ) external onlyPWN returns (bool) {
+        _pushAsset.transferAssetFrom(_origin, address(this));
+        emit VaultPush(_pushAsset, _origin);
+
+        _pullAsset.transferAsset(_beneficiary);
+        emit VaultPull(_pullAsset, _beneficiary);
+        return true;
+    }
     
     /**
      * @dev Handles the receipt of a single ERC1155 token type. This function is
@@ -167,8 +265,11 @@ contract PWNVault is Ownable, IERC1155Receiver {
             interfaceId == type(IERC1155Receiver).interfaceId || // ERC1155Receiver
             interfaceId == this.PWN.selector
                             ^ this.push.selector
+                            ^ this.pushBatch.selector
                             ^ this.pull.selector
                             ^ this.pullProxy.selector
+                            ^ this.pullProxyPair.selector
+                            ^ this.pushPull.selector
                             ^ this.setPWN.selector; // PWN Vault
 
     }
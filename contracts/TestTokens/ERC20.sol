@@ -2,10 +2,11 @@
 pragma solidity 0.8.3;
 
 import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/extensions/draft-ERC20Permit.sol";
 
-contract ERC20MyToken is ERC20 {
+contract ERC20MyToken is ERC20Permit {
     // wei
-    constructor(uint256 initialSupply) ERC20("Fungible Token", "FT") {
+    constructor(uint256 initialSupply) ERC20("Fungible Token", "FT") ERC20Permit("Fungible Token") {
         _mint(msg.sender, initialSupply);
     }
 }
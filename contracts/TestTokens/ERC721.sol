@@ -17,6 +17,12 @@ contract ERC721MyToken is ERC721, Ownable {
         ++id;
     }
 
+    function mint(address _to) public returns (uint256) {
+        _mint(_to, id);
+        emit TokenCreated(_to, id);
+        return id++;
+    }
+
     function _baseURI() internal view virtual override returns (string memory) {
         return baseURI;
     }
@@ -0,0 +1,204 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+import pytest
+import yaml
+
+
+CONFIG_PATH = "brownie-config.yaml"
+BUILD_DIR = "build"
+ARTIFACT_DIRS = (
+    os.path.join(BUILD_DIR, "contracts"),
+    os.path.join(BUILD_DIR, "interfaces"),
+)
+SOURCE_DIRS = ("contracts", "interfaces")
+# CI jobs point it at their cached directory
+CACHE_DIR = os.environ.get(
+    "PWN_ARTIFACT_CACHE",
+    os.path.join(os.path.expanduser("~"), ".cache", "pwn-artifacts"),
+)
+# dependency sources shipped with the repo - `vendor/<org>/<repo>@<version>`, packages
+# vendored for slither under `slither/<repo>` are used as well
+# vendor/ holds PWNFinance/MultiToken@1.0.3, its imports remapped like the other packages;
+# OpenZeppelin is still installed by brownie until `python -m scripts.artifact_cache vendor`
+# runs with network access
+VENDOR_DIRS = ("vendor", "slither")
+VENDOR_IGNORE = shutil.ignore_patterns(
+    "build", "node_modules", ".git", "test", "package-lock.json"
+)
+
+
+def packages_folder():
+    try:
+        from brownie._config import _get_data_folder
+
+        return str(_get_data_folder().joinpath("packages"))
+    except ImportError:
+        return os.path.join(os.path.expanduser("~"), ".brownie", "packages")
+
+
+def load_config(config_path=CONFIG_PATH):
+    with open(config_path) as f:
+        return yaml.safe_load(f)
+
+
+def vendored_package(package_id):
+    # `OpenZeppelin/openzeppelin-contracts@4.5.0` -> vendor/OpenZeppelin/openzeppelin-contracts@4.5.0
+    # or slither/openzeppelin-contracts, None when the repo doesn't ship it
+    repo = package_id.split("/")[-1].split("@")[0]
+    for path in (
+        os.path.join(VENDOR_DIRS[0], package_id),
+        os.path.join(VENDOR_DIRS[1], repo),
+    ):
+        if os.path.isdir(path):
+            return path
+    return None
+
+
+def install_dependencies(config_path=CONFIG_PATH):
+    # puts the vendored sources where brownie looks for installed packages, so loading the
+    # project doesn't download them - packages the repo doesn't ship are left to brownie
+    installed = []
+    for package_id in load_config(config_path).get("dependencies", []):
+        install_path = os.path.join(packages_folder(), package_id)
+        source = vendored_package(package_id)
+        if os.path.isdir(install_path) or source is None:
+            continue
+        shutil.copytree(source, install_path, ignore=VENDOR_IGNORE)
+        # the same config brownie writes when installing a package without one
+        package_config = os.path.join(install_path, "brownie-config.yaml")
+        if not os.path.exists(package_config):
+            with open(package_config, "w") as f:
+                yaml.dump({"project_structure": {"contracts": "contracts"}}, f)
+        installed.append(package_id)
+    return installed
+
+
+def vendor_dependencies(config_path=CONFIG_PATH):
+    # copies the installed packages into vendor/ to be committed, run once with network access
+    for package_id in load_config(config_path).get("dependencies", []):
+        target = os.path.join(VENDOR_DIRS[0], package_id)
+        if os.path.isdir(target):
+            continue
+        shutil.copytree(
+            os.path.join(packages_folder(), package_id), target, ignore=VENDOR_IGNORE
+        )
+        print(f"Vendored {package_id} to {target}")
+
+
+def project_key(config_path=CONFIG_PATH):
+    # every source, the compiler settings (version, optimizer, remappings) & the pinned
+    # dependencies - the same key always means the same artifacts
+    config = load_config(config_path)
+    digest = hashlib.sha256(
+        json.dumps(
+            [config.get("compiler"), config.get("dependencies")], sort_keys=True
+        ).encode()
+    )
+    for source_dir in SOURCE_DIRS:
+        for path in sorted(
+            glob.glob(os.path.join(source_dir, "**", "*.*"), recursive=True)
+        ):
+            with open(path, "rb") as f:
+                digest.update(f"{path}\0".encode() + hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def _write_atomic(path, data):
+    # concurrent jobs sharing the cache or the build folder never see a half written file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def store(key=None, cache_dir=CACHE_DIR):
+    # artifacts are stored once per content under objects/, the manifest of a key maps
+    # build paths to them - unchanged contracts are shared between keys
+    key = key or project_key()
+    os.makedirs(os.path.join(cache_dir, "objects"), exist_ok=True)
+    os.makedirs(os.path.join(cache_dir, "manifests"), exist_ok=True)
+
+    manifest = {}
+    for artifact_dir in ARTIFACT_DIRS:
+        for path in glob.glob(
+            os.path.join(artifact_dir, "**", "*.json"), recursive=True
+        ):
+            with open(path, "rb") as f:
+                data = f.read()
+            digest = hashlib.sha256(data).hexdigest()
+            blob = os.path.join(cache_dir, "objects", digest + ".json")
+            if not os.path.exists(blob):
+                _write_atomic(blob, data)
+            manifest[os.path.relpath(path, BUILD_DIR)] = digest
+
+    _write_atomic(
+        os.path.join(cache_dir, "manifests", key + ".json"),
+        json.dumps(manifest, sort_keys=True).encode(),
+    )
+    return len(manifest)
+
+
+def restore(key=None, cache_dir=CACHE_DIR):
+    # an exact hit needs no compilation at all, otherwise the latest manifest gives a warm
+    # start - brownie checks the source hash & compiler settings of every artifact and
+    # recompiles only the contracts which changed since
+    key = key or project_key()
+    manifest_path = os.path.join(cache_dir, "manifests", key + ".json")
+    hit = os.path.exists(manifest_path)
+    if not hit:
+        manifests = glob.glob(os.path.join(cache_dir, "manifests", "*.json"))
+        if not manifests:
+            return None
+        manifest_path = max(manifests, key=os.path.getmtime)
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    for relpath, digest in manifest.items():
+        path = os.path.join(BUILD_DIR, relpath)
+        if os.path.exists(path):
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # xdist workers restore at the same time as the master
+        with open(os.path.join(cache_dir, "objects", digest + ".json"), "rb") as f:
+            _write_atomic(path, f.read())
+    return "hit" if hit else "warm"
+
+
+# pytest plugin, opt-in as it writes to brownie's package folder & the artifact cache -
+# `brownie test -p scripts.artifact_cache` (CI jobs set it in PYTEST_ADDOPTS), it runs
+# before brownie loads & compiles the project
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_load_initial_conftests(early_config):
+    install_dependencies()
+    restore()
+
+
+def pytest_sessionfinish(session):
+    # xdist workers share the build folder with the master, which stores it once
+    if not hasattr(session.config, "workerinput") and os.path.isdir(BUILD_DIR):
+        store()
+
+
+# brownie run scripts/artifact_cache.py main [restore|store|install|vendor]
+# or python -m scripts.artifact_cache [restore|store|install|vendor]
+def main(command="restore"):
+    if command == "restore":
+        print(f"Artifact cache: {restore() or 'miss'}")
+    elif command == "store":
+        print(f"Stored {store()} artifacts in {CACHE_DIR}")
+    elif command == "install":
+        print(f"Installed {', '.join(install_dependencies()) or 'nothing'}")
+    elif command == "vendor":
+        vendor_dependencies()
+    else:
+        raise ValueError(f"Unknown command {command}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,242 @@
+import time
+from collections import OrderedDict, defaultdict
+from brownie import PWNDeed, PWNVault, web3
+from scripts.helpful_scripts import fetch_events
+
+
+DEFAULT_MAXSIZE = 4096
+DEED_RUNNING = 2
+
+# cached PWNDeed view functions, by what their first argument identifies
+DEED_FUNCTIONS = {
+    "deeds",
+    "getDeedStatus",
+    "getExpiration",
+    "getDuration",
+    "getBorrower",
+    "getDeedCollateral",
+    "getOffers",
+    "getAcceptedOffer",
+}
+OFFER_FUNCTIONS = {"offers", "getDeedID", "getOfferLoan", "toBePaid", "getLender"}
+
+# events changing what the cached functions return, by the argument naming the deed
+DEED_EVENTS = {
+    "DeedCreated",
+    "DeedRevoked",
+    "OfferMade",
+    "OfferAccepted",
+    "PaidBack",
+    "DeedClaimed",
+}
+VAULT_EVENTS = {"VaultPush", "VaultPull", "VaultProxy"}
+
+
+def _offer_key(offer):
+    # web3 decodes bytes32 as bytes, callers usually pass hex strings
+    if isinstance(offer, (bytes, bytearray)):
+        return "0x" + bytes(offer).hex()
+    return offer.lower()
+
+
+# read-through cache in front of a PWNDeed contract
+# reads are answered as of the cache's head block - hits without any request to the node,
+# misses with a call at that block - the head only moves on `sync` (call it on every new
+# block notification), on `observe` & once `refresh_interval` seconds passed since the last
+# sync if one is given
+# a value read at block N is served for every later block until an event touching its
+# deed is seen - except the running deed status, which turns into expired without any
+# event and so is served only within the block it was read at
+# entries are evicted least recently used first once `maxsize` is reached, the links of a
+# deed to its offers & collateral are kept only while something of the deed is cached
+class CachedDeed:
+    def __init__(
+        self,
+        pwn_deed=None,
+        pwn_vault=None,
+        maxsize=DEFAULT_MAXSIZE,
+        refresh_interval=None,
+    ):
+        self.pwn_deed = pwn_deed or PWNDeed[-1]
+        self.pwn_vault = pwn_vault or PWNVault[-1]
+        self.maxsize = maxsize
+        self.refresh_interval = refresh_interval
+        self.block = None
+        self.synced_at = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (function, args) -> (block, value, reference)
+        self._references = defaultdict(set)  # ("did" | "offer", id) -> cache keys
+        self._offer_deeds = {}  # offer -> did
+        self._deed_offers = defaultdict(set)  # did -> offers
+        self._collateral_deeds = defaultdict(set)  # (asset address, id) -> dids
+        self._deed_collaterals = {}  # did -> (asset address, id)
+
+    def __getattr__(self, name):
+        attribute = getattr(self.pwn_deed, name)
+        if name in DEED_FUNCTIONS or name in OFFER_FUNCTIONS:
+            return lambda *args: self.call(name, *args)
+        return attribute
+
+    def call(self, name, *args):
+        if self.block is None or (
+            self.refresh_interval is not None
+            and time.monotonic() - self.synced_at >= self.refresh_interval
+        ):
+            self.sync()
+        block = self.block
+        key = (name, args)
+        entry = self._entries.get(key)
+        if entry is not None and (
+            entry[0] == block or not self._time_sensitive(name, entry[1])
+        ):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        value = getattr(self.pwn_deed, name)(*args, block_identifier=block)
+        self._store(key, block, value)
+        return value
+
+    def sync(self, to_block=None):
+        # moves the head to `to_block` (default: the chain's head), dropping the entries
+        # touched by the events emitted since the last head - one eth_getLogs call
+        head = web3.eth.block_number if to_block is None else to_block
+        if self.block is not None and head > self.block:
+            for event in fetch_events(
+                [self.pwn_deed, self.pwn_vault], self.block + 1, head
+            ):
+                self.invalidate_event(event.event, event.args)
+        if self.block is None or head > self.block:
+            self.block = head
+        self.synced_at = time.monotonic()
+        return self.block
+
+    def observe(self, tx):
+        # a transaction the caller sent - reads see its effects from now on
+        return self.sync(tx.block_number)
+
+    def invalidate_event(self, name, args):
+        if name in DEED_EVENTS:
+            if "offer" in args:
+                self._link_offer(args["offer"], args["did"])
+            self.invalidate_deed(args["did"])
+        elif name == "OfferRevoked":
+            self.invalidate_offer(args["offer"])
+        elif name in VAULT_EVENTS:
+            asset_address, _, _, asset_id = args["asset"]
+            if asset_address == self.pwn_deed.address:
+                self.invalidate_deed(asset_id)
+            for did in list(self._collateral_deeds.get((asset_address, asset_id), ())):
+                self.invalidate_deed(did)
+
+    def invalidate_deed(self, did):
+        offers = list(self._deed_offers.get(did, ()))
+        self._drop(("did", did))
+        for offer in offers:
+            self._drop(("offer", offer))
+
+    def invalidate_offer(self, offer):
+        offer = _offer_key(offer)
+        did = self._offer_deeds.get(offer)
+        self._drop(("offer", offer))
+        if did is not None:
+            self._drop(("did", did))
+        else:
+            # unknown deed - any cached list of offers may contain it
+            for key in [key for key in self._entries if key[0] == "getOffers"]:
+                self._discard(key)
+
+    def clear(self):
+        self._entries.clear()
+        self._references.clear()
+        self._offer_deeds.clear()
+        self._deed_offers.clear()
+        self._collateral_deeds.clear()
+        self._deed_collaterals.clear()
+
+    def _time_sensitive(self, name, value):
+        return name == "getDeedStatus" and value == DEED_RUNNING
+
+    def _link_offer(self, offer, did):
+        offer = _offer_key(offer)
+        self._offer_deeds[offer] = did
+        self._deed_offers[did].add(offer)
+
+    def _store(self, key, block, value):
+        name, args = key
+        if name in DEED_FUNCTIONS:
+            reference = ("did", args[0])
+            if name == "getDeedCollateral":
+                self._deed_collaterals[args[0]] = (value[0], value[3])
+                self._collateral_deeds[(value[0], value[3])].add(args[0])
+        else:
+            reference = ("offer", _offer_key(args[0]))
+            if name == "getDeedID":
+                self._link_offer(args[0], value)
+
+        self._entries[key] = (block, value, reference)
+        self._entries.move_to_end(key)
+        self._references[reference].add(key)
+        while len(self._entries) > self.maxsize:
+            self._discard(next(iter(self._entries)))
+
+    def _drop(self, reference):
+        for key in self._references.pop(reference, ()):
+            self._entries.pop(key, None)
+        self._release(reference)
+
+    def _discard(self, key):
+        _, _, reference = self._entries.pop(key)
+        keys = self._references[reference]
+        keys.discard(key)
+        if not keys:
+            del self._references[reference]
+            self._release(reference)
+
+    def _cached(self, did):
+        return ("did", did) in self._references or any(
+            ("offer", offer) in self._references
+            for offer in self._deed_offers.get(did, ())
+        )
+
+    def _release(self, reference):
+        # forgets the links of the deed once nothing of it is cached - a dead deed is
+        # invalidated for good, an evicted one is read from the contract again
+        kind, value = reference
+        did = value if kind == "did" else self._offer_deeds.get(value)
+        if did is None or self._cached(did):
+            return
+        for offer in self._deed_offers.pop(did, ()):
+            self._offer_deeds.pop(offer, None)
+        collateral = self._deed_collaterals.pop(did, None)
+        if collateral is not None:
+            dids = self._collateral_deeds[collateral]
+            dids.discard(did)
+            if not dids:
+                del self._collateral_deeds[collateral]
+
+
+def watch(cache, dids, poll_interval=1):
+    # yields (block, {did: status}) whenever a new block changes the status of a deed -
+    # the head moves on the node's new block notifications (an eth_newBlockFilter), a block
+    # without PWN events costs one eth_getLogs & a call per running deed
+    block_filter = web3.eth.filter("latest")
+    statuses = None
+    while True:
+        if statuses is None or block_filter.get_new_entries():
+            cache.sync()
+            current = {did: cache.getDeedStatus(did) for did in dids}
+            if current != statuses:
+                statuses = current
+                yield cache.block, current
+        time.sleep(poll_interval)
+
+
+# brownie run scripts/deed_cache.py main [dids...]
+def main(*dids):
+    cache = CachedDeed()
+    dids = [int(did) for did in dids] or list(range(1, cache.pwn_deed.id() + 1))
+    for block, statuses in watch(cache, dids):
+        print(f"block {block}: {statuses} ({cache.hits} hits, {cache.misses} misses)")
@@ -0,0 +1,219 @@
+import heapq
+import time
+from brownie import PWN, PWNDeed, chain, exceptions, web3
+from scripts.helpful_scripts import fetch_events, get_account
+from scripts.deploy_pwn import claim_deeds
+from scripts.pwn_indexer import (
+    DEFAULT_DB_PATH,
+    DEED_OPEN,
+    DEED_PAID_BACK,
+    DEED_EXPIRED,
+    open_index,
+    get_checkpoint,
+    get_live_deeds,
+    sync as sync_index,
+)
+
+
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_CLAIM_BATCH_SIZE = 50
+DEFAULT_POLL_INTERVAL = 15
+
+
+# claims the paid back & expired deeds owned by the accounts it manages
+# all running deeds sit in a min-heap by expiration - the keeper sleeps until the earliest
+# one expires or the next poll for events, whichever comes first, so no deed is ever
+# polled on its own
+# repayments come from `PaidBack` events, ownership from the Deed token transfers -
+# a deed bought from its lender is claimed as well
+class DeedKeeper:
+    def __init__(
+        self,
+        accounts,
+        pwn=None,
+        pwn_deed=None,
+        start_block=0,
+        batch_size=DEFAULT_BATCH_SIZE,
+        claim_batch_size=DEFAULT_CLAIM_BATCH_SIZE,
+    ):
+        self.accounts = {account.address: account for account in accounts}
+        self.pwn = pwn or PWN[-1]
+        self.pwn_deed = pwn_deed or PWNDeed.at(self.pwn.deed())
+        self.batch_size = batch_size
+        self.claim_batch_size = claim_batch_size
+        self.block = start_block - 1  # the last block applied
+        self.durations = {}  # did -> duration of open deeds
+        self.expirations = {}  # did -> expiration of running deeds
+        self.claimable = set()
+        self.owners = {}  # did -> managed account owning the Deed token
+        # (expiration, did) - entries of deeds repaid or gone since are skipped when popped
+        self._heap = []
+
+    @classmethod
+    def from_index(cls, db, accounts, pwn=None, **kwargs):
+        # starts from the live deeds of a pwn_indexer database instead of replaying the
+        # whole history, the keeper continues from the checkpoint of the index
+        keeper = cls(accounts, pwn, **kwargs)
+        sync_index(db, keeper.pwn_deed)
+        keeper.block = get_checkpoint(db, keeper.pwn_deed.address)
+        for deed in get_live_deeds(db):
+            did = deed["did"]
+            if deed["status"] == DEED_OPEN:
+                keeper.durations[did] = deed["duration"]
+            elif deed["status"] == DEED_PAID_BACK:
+                keeper.claimable.add(did)
+            else:
+                keeper.expirations[did] = deed["expiration"]
+                keeper._heap.append((deed["expiration"], did))
+            if deed["owner"] in keeper.accounts:
+                keeper.owners[did] = keeper.accounts[deed["owner"]]
+        heapq.heapify(keeper._heap)
+        return keeper
+
+    def next_expiration(self):
+        while self._heap and self.expirations.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def due(self, now=None):
+        # deeds the managed accounts can claim at `now`, by owner
+        now = chain.time() if now is None else now
+        expiration = self.next_expiration()
+        # a deed is expired once its expiration is in the past - see PWNDeed.getDeedStatus
+        while expiration is not None and expiration < now:
+            _, did = heapq.heappop(self._heap)
+            del self.expirations[did]
+            self.claimable.add(did)
+            expiration = self.next_expiration()
+
+        due = {}
+        for did, owner in self.owners.items():
+            if did in self.claimable:
+                due.setdefault(owner, []).append(did)
+        return {owner: sorted(dids) for owner, dids in due.items()}
+
+    def sync(self, to_block=None):
+        # applies the PWNDeed events since the last applied block up to `to_block` (default:
+        # head) - one eth_getLogs call per batch of blocks however many deeds there are
+        to_block = web3.eth.block_number if to_block is None else to_block
+        timestamps = {}
+        processed = 0
+        from_block = self.block + 1
+        while from_block <= to_block:
+            batch_end = min(from_block + self.batch_size - 1, to_block)
+            for event in fetch_events([self.pwn_deed], from_block, batch_end):
+                if (
+                    event.event == "OfferAccepted"
+                    and event.blockNumber not in timestamps
+                ):
+                    timestamps[event.blockNumber] = web3.eth.get_block(
+                        event.blockNumber
+                    )["timestamp"]
+                self.apply_event(
+                    event.event, event.args, timestamps.get(event.blockNumber)
+                )
+                processed += 1
+            timestamps.clear()
+            self.block = batch_end
+            from_block = batch_end + 1
+        return processed
+
+    def apply_event(self, name, args, block_timestamp=None):
+        if name == "DeedCreated":
+            self.durations[args["did"]] = args["duration"]
+        elif name == "OfferAccepted":
+            # the same expiration PWNDeed sets when accepting the offer, a deed created
+            # before the keeper's start block is read from the contract
+            did = args["did"]
+            duration = self.durations.pop(did, None)
+            if duration is None:
+                self.expirations[did] = self.pwn_deed.getExpiration(did)
+            else:
+                self.expirations[did] = block_timestamp + duration
+            heapq.heappush(self._heap, (self.expirations[did], did))
+        elif name == "PaidBack":
+            self.expirations.pop(args["did"], None)
+            self.claimable.add(args["did"])
+        elif name in ("DeedClaimed", "DeedRevoked"):
+            self._forget(args["did"])
+        elif name == "TransferSingle":
+            self._set_owner(args["id"], args["to"])
+        elif name == "TransferBatch":
+            for did in args["ids"]:
+                self._set_owner(did, args["to"])
+
+    def claim(self, now=None):
+        # one `claimDeeds` transaction per batch of deeds of an owner, returns the claimed
+        # deeds - they are forgotten once their `DeedClaimed` events are applied
+        claimed = []
+        for owner, dids in self.due(now).items():
+            for start in range(0, len(dids), self.claim_batch_size):
+                batch = dids[start : start + self.claim_batch_size]
+                try:
+                    claim_deeds(batch, owner, self.pwn)
+                except exceptions.VirtualMachineError:
+                    # a deed sold or claimed in the meantime reverts the whole batch,
+                    # the rest is retried on its own
+                    batch = self._recheck(batch, owner)
+                    if not batch:
+                        continue
+                    try:
+                        claim_deeds(batch, owner, self.pwn)
+                    except exceptions.VirtualMachineError as e:
+                        # left for the next round, the deeds stay claimable
+                        print(f"Claiming deeds {batch} of {owner} reverted: {e}")
+                        continue
+                self.claimable.difference_update(batch)
+                claimed.extend(batch)
+        return claimed
+
+    def run(self, poll_interval=DEFAULT_POLL_INTERVAL):
+        while True:
+            self.sync()
+            claimed = self.claim()
+            if claimed:
+                print(f"Claimed deeds {claimed}")
+            # wakes up right when the next deed expires if that's before the next poll
+            expiration = self.next_expiration()
+            wait = poll_interval
+            if expiration is not None:
+                wait = min(wait, max(expiration + 1 - chain.time(), 0))
+            time.sleep(wait)
+
+    def _set_owner(self, did, owner):
+        if owner in self.accounts:
+            self.owners[did] = self.accounts[owner]
+        else:
+            self.owners.pop(did, None)
+
+    def _forget(self, did):
+        self.durations.pop(did, None)
+        self.expirations.pop(did, None)
+        self.claimable.discard(did)
+        self.owners.pop(did, None)
+
+    def _recheck(self, dids, owner):
+        valid = []
+        for did in dids:
+            status = self.pwn_deed.getDeedStatus(did)
+            if status in (DEED_PAID_BACK, DEED_EXPIRED) and self.pwn_deed.balanceOf(
+                owner, did
+            ):
+                valid.append(did)
+            else:
+                self.claimable.discard(did)
+        return valid
+
+
+# brownie run scripts/deed_keeper.py main [db path] [account ids...]
+# the development network manages the default account
+def main(db_path=DEFAULT_DB_PATH, *account_ids):
+    accounts = [get_account(id=account_id) for account_id in account_ids] or [
+        get_account()
+    ]
+    keeper = DeedKeeper.from_index(open_index(db_path), accounts)
+    print(
+        f"Keeping {len(keeper.expirations)} running & {len(keeper.claimable)} paid back "
+        f"deeds, {len(keeper.owners)} of them owned by {len(accounts)} accounts"
+    )
+    keeper.run()
@@ -1,5 +1,8 @@
 from glob import escape
 from scripts.helpful_scripts import get_account
+from scripts.tx_pipeline import tx_params, confirm, receipt, pipelined
+from scripts.signed_offers import terms_tuple, sign_permit
+from scripts.tracing import traced, report as trace_report
 from brownie import (
     PWN,
     PWNDeed,
@@ -17,6 +20,7 @@ ERC721_VAL = 1
 ERC1155_VAL = 2
 
 
+@traced
 def deploy_pwn(owner):
     pwn_deed = PWNDeed.deploy("", {"from": owner})
     print("Deployed PWNDeed")
@@ -30,6 +34,7 @@ def deploy_pwn(owner):
     return pwn_deed, pwn_vault, pwn
 
 
+@traced
 def deploy_testing_tokens(erc20_owner, erc721_owner, erc1155_owner):
     erc20 = ERC20MyToken.deploy(1000, {"from": erc20_owner})
     print("Deployed ERC20 token")
@@ -39,21 +44,25 @@ def deploy_testing_tokens(erc20_owner, erc721_owner, erc1155_owner):
     erc721_id = erc721.tx.events["TokenCreated"]["id"]
 
     erc1155 = ERC1155MyToken.deploy("ERC1155", {"from": erc1155_owner})
-    tx = erc1155.mint(erc1155_owner, 1, 3, 0b10011)
-    tx.wait(1)
+    tx = receipt(erc1155.mint(erc1155_owner, 1, 3, 0b10011, tx_params(erc1155_owner)))
     erc1155_id = tx.events["TokenCreated"]["id"]
 
     return erc20, erc721, erc721_id, erc1155, erc1155_id
 
 
-def set_PWN_ownership(owner):
-    pwn_deed, pwn_vault, pwn = PWNDeed[-1], PWNVault[-1], PWN[-1]
-    tx = pwn_deed.setPWN(pwn.address, {"from": owner})
-    tx = pwn_vault.setPWN(pwn.address, {"from": owner})
+@traced
+def set_PWN_ownership(owner, pwn_deed=None, pwn_vault=None, pwn=None):
+    pwn_deed, pwn_vault, pwn = (
+        pwn_deed or PWNDeed[-1],
+        pwn_vault or PWNVault[-1],
+        pwn or PWN[-1],
+    )
+    confirm(pwn_deed.setPWN(pwn.address, tx_params(owner)))
+    confirm(pwn_vault.setPWN(pwn.address, tx_params(owner)))
     print("Set ownership of PWN")
-    tx.wait(1)
 
 
+@traced
 def set_approve(
     address_owner,
     address_operator,
@@ -64,38 +73,47 @@ def set_approve(
     amount=None,
 ):
     if token_type == ERC20_VAL:
-        tx = token.approve(address_operator, amount, {"from": address_owner})
+        tx = token.approve(address_operator, amount, tx_params(address_owner))
     elif token_type == ERC721_VAL:
         if approve_to_all:
-            tx = token.setApprovalForAll(address_operator, 1, {"from": address_owner})
+            tx = token.setApprovalForAll(address_operator, 1, tx_params(address_owner))
         else:
-            tx = token.approve(address_operator, token_id, {"from": address_owner})
+            tx = token.approve(address_operator, token_id, tx_params(address_owner))
     elif token_type == ERC1155_VAL:
-        tx = token.setApprovalForAll(address_operator, 1, {"from": address_owner})
+        tx = token.setApprovalForAll(address_operator, 1, tx_params(address_owner))
     else:
         print("Incorrect token_type")
+        return
 
-    tx.wait(1)
+    confirm(tx)
 
 
+@traced
 def send_token(address_to, account_from, amount, token, token_type, token_id=None):
     if token_type == ERC20_VAL:
-        tx = token.transfer(address_to, amount, {"from": account_from})
+        tx = token.transfer(address_to, amount, tx_params(account_from))
         print(f"sent {amount} ERC20 tokens to {address_to}")
     elif token_type == ERC721_VAL:
-        tx = token.transferFrom(account_from, address_to, token_id)
+        tx = token.transferFrom(
+            account_from, address_to, token_id, tx_params(account_from)
+        )
         print(f"sent ERC721 tokens to {address_to}")
     else:
-        tx = token.safeTransferFrom(account_from, address_to, token_id, amount, "IDK")
+        tx = token.safeTransferFrom(
+            account_from, address_to, token_id, amount, "IDK", tx_params(account_from)
+        )
 
-    tx.wait(1)
+    confirm(tx)
 
 
+# the helpers below fall back to the latest PWN deployment when not given one,
+# tests pass their own handles so they don't depend on what else was deployed
 # enum Category {
 #     ERC20,
 #     ERC721,
 #     ERC1155
 # }
+@traced
 def pwn_create_deed(
     collateral_address,
     collateral_type,
@@ -103,58 +121,156 @@ def pwn_create_deed(
     collateral_id,
     collateral_amount,
     creator,
+    pwn=None,
 ):
-    pwn = PWN[-1]
+    pwn = pwn or PWN[-1]
     tx = pwn.createDeed(
         collateral_address,
         collateral_type,
         loan_duration,
         collateral_id,
         collateral_amount,
-        {"from": creator},
+        tx_params(creator),
     )
-    deed_id = tx.events["DeedCreated"]["did"]
-    tx.wait(1)
+    deed_id = receipt(tx).events["DeedCreated"]["did"]
     return deed_id
 
 
-def make_offer(asset_addres, amount, deed_id, to_be_paid, offerer):
-    pwn = PWN[-1]
-    tx = pwn.makeOffer(asset_addres, amount, deed_id, to_be_paid, {"from": offerer})
-    offer_id = tx.events["OfferMade"]["offer"]
-    tx.wait(1)
+# ERC20 collateral approved by a permit of the creator - a single transaction
+@traced
+def pwn_create_deed_with_permit(
+    collateral_address, loan_duration, collateral_amount, creator, pwn=None
+):
+    pwn = pwn or PWN[-1]
+    permit = sign_permit(
+        ERC20MyToken.at(collateral_address),
+        creator,
+        pwn.vault(),
+        collateral_amount,
+    )
+    tx = pwn.createDeedWithPermit(
+        collateral_address, loan_duration, collateral_amount, permit, tx_params(creator)
+    )
+    return receipt(tx).events["DeedCreated"]["did"]
+
+
+# collaterals are (asset address, category, amount, id) tuples - MultiToken.Asset
+@traced
+def pwn_create_deeds(collaterals, loan_durations, creator, pwn=None):
+    pwn = pwn or PWN[-1]
+    tx = pwn.createDeeds(collaterals, loan_durations, tx_params(creator))
+    return [event["did"] for event in receipt(tx).events["DeedCreated"]]
+
+
+@traced
+def make_offer(asset_addres, amount, deed_id, to_be_paid, offerer, pwn=None):
+    pwn = pwn or PWN[-1]
+    tx = pwn.makeOffer(asset_addres, amount, deed_id, to_be_paid, tx_params(offerer))
+    offer_id = receipt(tx).events["OfferMade"]["offer"]
 
     return offer_id
 
 
-def accept_offer(offer_id, accepter):
-    pwn = PWN[-1]
-    tx = pwn.acceptOffer(offer_id, {"from": accepter})
-    tx.wait(1)
+@traced
+def make_offers(asset_addresses, amounts, deed_ids, to_be_paid, offerer, pwn=None):
+    pwn = pwn or PWN[-1]
+    tx = pwn.makeOffers(
+        asset_addresses, amounts, deed_ids, to_be_paid, tx_params(offerer)
+    )
+    return [event["offer"] for event in receipt(tx).events["OfferMade"]]
+
+
+@traced
+def accept_offer(offer_id, accepter, pwn=None):
+    pwn = pwn or PWN[-1]
+    return confirm(pwn.acceptOffer(offer_id, tx_params(accepter)))
+
+
+# signed by the lender off-chain next to the offer, handed to the borrower with it
+@traced
+def sign_loan_permit(offer_id, lender, pwn=None):
+    pwn = pwn or PWN[-1]
+    loan_address, _, amount, _ = PWNDeed.at(pwn.deed()).getOfferLoan(offer_id)
+    return sign_permit(
+        ERC20MyToken.at(loan_address),
+        lender,
+        pwn.vault(),
+        amount,
+    )
+
+
+@traced
+def accept_offer_with_permit(offer_id, lender_permit, accepter, pwn=None):
+    pwn = pwn or PWN[-1]
+    return confirm(
+        pwn.acceptOfferWithPermit(offer_id, lender_permit, tx_params(accepter))
+    )
+
 
+# terms & signature as produced by scripts/signed_offers.py
+@traced
+def accept_signed_offer(terms, signature, accepter, pwn=None):
+    pwn = pwn or PWN[-1]
+    tx = pwn.acceptSignedOffer(terms_tuple(terms), signature, tx_params(accepter))
+    return receipt(tx).events["OfferAccepted"]["offer"]
 
-def repay_loan(deed_id, payer):
-    pwn = PWN[-1]
-    tx = pwn.repayLoan(deed_id, {"from": payer})
-    tx.wait(1)
 
+@traced
+def revoke_signed_offers(word_pos, mask, revoker, pwn=None):
+    pwn = pwn or PWN[-1]
+    return confirm(pwn.revokeSignedOffers(word_pos, mask, tx_params(revoker)))
 
-def claim_deed(deed_id, claimer):
-    pwn = PWN[-1]
-    tx = pwn.claimDeed(deed_id, {"from": claimer})
-    tx.wait(1)
+
+@traced
+def repay_loan(deed_id, payer, pwn=None):
+    pwn = pwn or PWN[-1]
+    return confirm(pwn.repayLoan(deed_id, tx_params(payer)))
+
+
+# the repayment approved by a permit of the payer - a single transaction
+@traced
+def repay_loan_with_permit(deed_id, payer, pwn=None):
+    pwn = pwn or PWN[-1]
+    pwn_deed = PWNDeed.at(pwn.deed())
+    offer_id = pwn_deed.getAcceptedOffer(deed_id)
+    loan_address = pwn_deed.getOfferLoan(offer_id)[0]
+    permit = sign_permit(
+        ERC20MyToken.at(loan_address),
+        payer,
+        pwn.vault(),
+        pwn_deed.toBePaid(offer_id),
+    )
+    return confirm(pwn.repayLoanWithPermit(deed_id, permit, tx_params(payer)))
 
 
-def revoke_deed(deed_id, revoker):
-    pwn = PWN[-1]
-    tx = pwn.revokeDeed(deed_id, {"from": revoker})
-    tx.wait(1)
+@traced
+def claim_deed(deed_id, claimer, pwn=None):
+    pwn = pwn or PWN[-1]
+    return confirm(pwn.claimDeed(deed_id, tx_params(claimer)))
 
 
-def revoke_offer(offer_id, revoker):
-    pwn = PWN[-1]
-    tx = pwn.revokeOffer(offer_id, {"from": revoker})
-    tx.wait(1)
+@traced
+def claim_deeds(deed_ids, claimer, pwn=None):
+    pwn = pwn or PWN[-1]
+    return confirm(pwn.claimDeeds(deed_ids, tx_params(claimer)))
+
+
+@traced
+def revoke_deed(deed_id, revoker, pwn=None):
+    pwn = pwn or PWN[-1]
+    return confirm(pwn.revokeDeed(deed_id, tx_params(revoker)))
+
+
+@traced
+def revoke_offer(offer_id, revoker, pwn=None):
+    pwn = pwn or PWN[-1]
+    return confirm(pwn.revokeOffer(offer_id, tx_params(revoker)))
+
+
+@traced
+def revoke_offers(offer_ids, revoker, pwn=None):
+    pwn = pwn or PWN[-1]
+    return confirm(pwn.revokeOffers(offer_ids, tx_params(revoker)))
 
 
 def main():
@@ -163,7 +279,7 @@ def main():
     LENDER = get_account(index=2)
 
     pwn_deed, pwn_vault, pwn = deploy_pwn(PWN_OWNER)
-    set_PWN_ownership(PWN_OWNER)
+    set_PWN_ownership(PWN_OWNER, pwn_deed, pwn_vault, pwn)
     erc20, erc721, erc721_token_id, erc1155, erc1155_id = deploy_testing_tokens(
         LENDER, PLEDGER, PLEDGER
     )
@@ -178,23 +294,29 @@ def main():
 
     set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
     deed_token_id = pwn_create_deed(
-        erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER
+        erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER, pwn
     )
     print(pwn_deed.balanceOf(PLEDGER, deed_token_id))
 
-    offer_id = make_offer(erc20.address, 100, deed_token_id, 120, LENDER)
+    offer_id = make_offer(erc20.address, 100, deed_token_id, 120, LENDER, pwn)
     print(pwn_deed.offers(offer_id))
-    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL, deed_token_id)
-    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
-    accept_offer(offer_id, PLEDGER)
+    # approvals of different accounts don't depend on each other
+    with pipelined():
+        set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL, deed_token_id)
+        set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    accept_offer(offer_id, PLEDGER, pwn)
     print(erc20.balanceOf(PLEDGER))
     print(pwn_deed.balanceOf(LENDER, deed_token_id))
 
     set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=120)
-    repay_loan(deed_token_id, PLEDGER)
+    repay_loan(deed_token_id, PLEDGER, pwn)
     print(erc20.balanceOf(pwn_vault.address))
 
-    claim_deed(deed_token_id, LENDER)
+    claim_deed(deed_token_id, LENDER, pwn)
     print(erc20.balanceOf(PLEDGER))
     print(erc20.balanceOf(LENDER))
     print(pwn_deed.balanceOf(LENDER, deed_token_id))
+
+    trace = trace_report()
+    if trace:
+        print(trace)
@@ -0,0 +1,288 @@
+import ast
+import hashlib
+import sys
+import time
+
+
+# an in-process EVM for the test suite - `brownie test --network eth-tester` runs the same
+# tests on py-evm through eth-tester inside the pytest process instead of spawning
+# ganache, no JSON-RPC request crosses a socket nor gets serialised
+# the chain is set up like the development network's ganache: the accounts derived from
+# the `brownie` mnemonic with 1000 ether each, chain id 1337, a 12M block gas limit & free
+# transactions - deployed addresses, balances, events, timestamps & revert messages match
+# the ganache runs
+# gas used doesn't, eth-tester only runs post-London rulesets (paris here) while ganache
+# runs istanbul, so the gas baseline of scripts/gas_benchmark.py stays a ganache one
+# eth-keys recovers transaction senders in pure python unless coincurve is installed,
+# `pip install coincurve` halves the time of every transaction
+# compare both backends with the tracing of scripts/tracing.py:
+# `PWN_TRACE=ganache.json brownie test` & `PWN_TRACE=eth-tester.json brownie test --network eth-tester`
+# tests/conftest.py registers the network only when it's selected, eth-tester & py-evm
+# are imported by the functions needing them so ganache runs never load them
+NETWORK_ID = "eth-tester"
+NETWORK = {
+    "name": "eth-tester (in-process py-evm)",
+    "id": NETWORK_ID,
+    "cmd": NETWORK_ID,
+    # only probed by `network.connect` before launching, nothing listens there
+    "host": "http://127.0.0.1",
+    "cmd_settings": {
+        "port": 8645,
+        "gas_limit": 12000000,
+        "accounts": 10,
+        "evm_version": "paris",
+        "mnemonic": "brownie",
+        "chain_id": 1337,
+        "default_balance": 1000,
+    },
+}
+HD_PATH = "m/44'/60'/0'/0/{}"
+REVERT_PREFIX = "VM Exception while processing transaction: revert"
+ERROR_SELECTOR = bytes.fromhex("08c379a0")  # Error(string)
+# requests creating a block, its timestamp follows the clock moved by `chain.sleep`
+MINING_METHODS = ("eth_sendTransaction", "eth_sendRawTransaction")
+
+_tester = None
+_time_offset = 0
+_snapshot_offsets = {}
+
+
+def account_keys(mnemonic, count):
+    # the same keys ganache derives from a mnemonic, which it doesn't validate against
+    # the BIP-39 word list (`brownie` isn't one) - eth-tester's own derivation does
+    from eth_account.hdaccount import key_from_seed
+    from eth_keys import keys
+
+    seed = hashlib.pbkdf2_hmac("sha512", mnemonic.encode(), b"mnemonic", 2048)
+    return [
+        keys.PrivateKey(key_from_seed(seed, HD_PATH.format(i))) for i in range(count)
+    ]
+
+
+def vm_configuration(evm_version):
+    from eth.vm import forks
+
+    vm = getattr(forks, evm_version.capitalize() + "VM", None)
+    if vm is None:
+        raise ValueError(f"py-evm has no {evm_version} VM")
+    return ((0, vm),)
+
+
+def now():
+    return int(time.time()) + _time_offset
+
+
+def _set_next_timestamp(timestamp=None):
+    # the pending block gets the current time of the chain, at least a second after its
+    # parent as py-evm doesn't accept blocks sharing a timestamp
+    chain = _tester.backend.chain
+    parent = chain.get_canonical_head()
+    timestamp = max(now() if timestamp is None else timestamp, parent.timestamp + 1)
+    chain.header = chain.header.copy(timestamp=timestamp)
+
+
+def revert_data(reason):
+    # eth-tester hands over the reason of an `Error(string)` revert, any other revert data
+    # as the repr of its bytes
+    from eth_utils import to_hex
+
+    if reason.startswith(("b'", 'b"')):
+        return to_hex(ast.literal_eval(reason))
+    if not reason:
+        return "0x"
+    raw = reason.encode()
+    padded = raw.ljust((len(raw) + 31) // 32 * 32, b"\0")
+    return to_hex(
+        ERROR_SELECTOR
+        + (32).to_bytes(32, "big")
+        + len(raw).to_bytes(32, "big")
+        + padded
+    )
+
+
+def sign_typed_data(address, data):
+    # eth-tester has no eth_signTypedData_v4, the development accounts sign with their keys
+    from eth_account import Account
+    from eth_utils import to_hex
+    from scripts.signed_offers import encode_typed_data
+
+    key = next(
+        key
+        for key in _tester.backend.account_keys
+        if key.public_key.to_checksum_address().lower() == address.lower()
+    )
+    signed = Account.sign_message(encode_typed_data(full_message=data), key.to_bytes())
+    return to_hex(signed.signature)
+
+
+def _revert_error(request_id, data, txid=None):
+    # the error response of ganache, `data` is the revert data of a call or the reverted
+    # transaction it belongs to
+    from brownie.exceptions import decode_typed_error
+
+    reason = decode_typed_error(data) if data != "0x" else ""
+    if txid is not None:
+        data = {
+            txid: {
+                "error": "revert",
+                "program_counter": None,
+                "return": data,
+                "reason": reason,
+            }
+        }
+    return {
+        "id": request_id,
+        "jsonrpc": "2.0",
+        "error": {
+            "code": -32000,
+            "message": f"{REVERT_PREFIX} {reason}".rstrip(),
+            "data": data,
+        },
+    }
+
+
+def _reverted_transaction(request_id, txid):
+    # ganache mines a reverting transaction & answers with an error naming it, the reason
+    # comes from replaying the transaction on top of the previous block
+    from eth_tester.exceptions import TransactionFailed
+
+    receipt = _tester.get_transaction_receipt(txid)
+    if receipt["status"]:
+        return None
+    tx = _tester.get_transaction_by_hash(txid)
+    call = {key: tx[key] for key in ("from", "to", "value", "gas", "data") if tx[key]}
+    try:
+        _tester.call(call, receipt["block_number"] - 1)
+        reason = ""
+    except TransactionFailed as e:
+        reason = str(e.args[0])
+    return _revert_error(request_id, revert_data(reason), txid)
+
+
+def _provider_class():
+    from eth_tester.exceptions import TransactionFailed
+    from eth_utils import to_hex
+    from hexbytes import HexBytes
+    from web3.exceptions import ContractLogicError
+    from web3.providers.eth_tester import EthereumTesterProvider
+
+    class InProcessProvider(EthereumTesterProvider):
+        # answers the way ganache does - failed calls & transactions are error responses
+        # brownie turns into a VirtualMachineError with the revert message
+        endpoint_uri = NETWORK_ID
+
+        def make_request(self, method, params):
+            if method == "eth_signTypedData_v4":
+                return {
+                    "id": self._current_request_id,
+                    "jsonrpc": "2.0",
+                    "result": sign_typed_data(*params),
+                }
+            if method in MINING_METHODS:
+                _set_next_timestamp()
+            try:
+                response = super().make_request(method, params)
+            except TransactionFailed as e:
+                reason = str(e.args[0]).replace("execution reverted", "", 1)
+                data = revert_data(reason.lstrip(": "))
+            except ContractLogicError as e:
+                # panics, raised by web3 with their revert data
+                data = e.data
+            else:
+                if method in MINING_METHODS and "result" in response:
+                    txid = to_hex(HexBytes(response["result"]))
+                    return _reverted_transaction(response["id"], txid) or response
+                return response
+            return _revert_error(self._current_request_id, data)
+
+    return InProcessProvider
+
+
+# brownie rpc backend, see brownie.network.rpc
+
+
+def launch(cmd, **kwargs):
+    global _tester, _time_offset
+    import psutil
+    from brownie.network.web3 import web3
+    from eth_tester import EthereumTester, PyEVMBackend
+    from eth_tester.backends.pyevm.main import generate_genesis_state_for_keys
+    from web3.providers.eth_tester.defaults import API_ENDPOINTS
+
+    settings = dict(NETWORK["cmd_settings"], **kwargs)
+    keys = account_keys(settings["mnemonic"], settings["accounts"])
+    genesis = PyEVMBackend.generate_genesis_params({"gas_limit": settings["gas_limit"]})
+    # free transactions like on ganache, brownie sends them with no gas price
+    genesis["base_fee_per_gas"] = 0
+    backend = PyEVMBackend(
+        genesis_parameters=genesis,
+        genesis_state=generate_genesis_state_for_keys(
+            keys, {"balance": settings["default_balance"] * 10**18}
+        ),
+        vm_configuration=vm_configuration(settings["evm_version"]),
+    )
+    backend.account_keys = tuple(keys)
+    backend.chain.chain_id = settings["chain_id"]
+    _tester = EthereumTester(backend, auto_mine_transactions=True)
+    _time_offset = 0
+    _snapshot_offsets.clear()
+
+    print(f"\nLaunching in-process EVM ({settings['evm_version']})...")
+    # the CHAINID opcode reads it from the chain, eth_chainId is a constant of web3
+    api_endpoints = dict(API_ENDPOINTS, eth=dict(API_ENDPOINTS["eth"]))
+    api_endpoints["eth"]["chainId"] = lambda tester, params: settings["chain_id"]
+    web3.provider = _provider_class()(_tester, api_endpoints)
+    # the "process" is the current one, brownie never kills it
+    return psutil.Process()
+
+
+def on_connection():
+    pass
+
+
+def sleep(seconds):
+    global _time_offset
+    _time_offset += seconds
+    return _time_offset
+
+
+def mine(timestamp=None):
+    # like ganache, mining at a timestamp moves the clock there
+    global _time_offset
+    if timestamp is not None:
+        _time_offset = timestamp - int(time.time())
+    _set_next_timestamp(timestamp)
+    _tester.mine_blocks()
+
+
+def snapshot():
+    # like ganache, reverting to a snapshot also restores the clock
+    snapshot_id = _tester.take_snapshot()
+    _snapshot_offsets[snapshot_id] = _time_offset
+    return snapshot_id
+
+
+def revert(snapshot_id):
+    global _time_offset
+    _tester.revert_to_snapshot(snapshot_id)
+    _time_offset = _snapshot_offsets[snapshot_id]
+
+
+def unlock_account(address):
+    # `accounts.at(address, force=True)` - eth-tester can't impersonate an address, only
+    # the accounts of the mnemonic sign transactions
+    from brownie.exceptions import RPCRequestError
+
+    raise RPCRequestError(
+        f"Cannot unlock {address}: the in-process EVM only signs with the accounts of "
+        "its mnemonic"
+    )
+
+
+def register():
+    # makes `eth-tester` a development network launched through this module
+    from brownie._config import CONFIG
+    from brownie.network.rpc import LAUNCH_BACKENDS
+
+    LAUNCH_BACKENDS.setdefault(NETWORK_ID, sys.modules[__name__])
+    CONFIG.networks.setdefault(NETWORK_ID, NETWORK)
@@ -0,0 +1,215 @@
+import json
+import os
+import subprocess
+from scripts.helpful_scripts import get_account
+from scripts.time_travel import expire_deed
+from scripts.deploy_pwn import (
+    deploy_pwn,
+    set_PWN_ownership,
+    deploy_testing_tokens,
+    set_approve,
+    send_token,
+    revoke_offer,
+    accept_offer,
+    revoke_deed,
+    repay_loan,
+    claim_deed,
+    ERC20_VAL,
+    ERC721_VAL,
+    ERC1155_VAL,
+)
+from scripts.tx_pipeline import receipt, tx_params
+
+
+# bump whenever the measured scenarios change, older baselines are then rejected
+BASELINE_VERSION = 1
+BASELINE_PATH = os.path.join("benchmarks", "gas_baseline.json")
+DEFAULT_THRESHOLD = 0.02
+
+CATEGORY_NAMES = {ERC20_VAL: "ERC20", ERC721_VAL: "ERC721", ERC1155_VAL: "ERC1155"}
+PENDING_OFFERS_SIZES = (1, 10, 50, 100)
+
+LOAN_AMOUNT = 10
+TO_BE_PAID = 11
+LOAN_DURATION = 3600
+
+
+def _new_collateral(category, tokens, pledger):
+    erc20, erc721, erc1155, erc1155_id = tokens
+    if category == ERC20_VAL:
+        return erc20.address, 0, LOAN_AMOUNT
+    if category == ERC721_VAL:
+        tx = erc721.mint(pledger, {"from": pledger})
+        return erc721.address, tx.events["TokenCreated"]["id"], 1
+    return erc1155.address, erc1155_id, 1
+
+
+# createDeed & makeOffer are sent directly, their deploy_pwn helpers return the new IDs
+# & not the receipt the gas is read from
+def _create_deed(category, tokens, pledger, pwn, gas):
+    address, token_id, amount = _new_collateral(category, tokens, pledger)
+    tx = receipt(
+        pwn.createDeed(
+            address, category, LOAN_DURATION, token_id, amount, tx_params(pledger)
+        )
+    )
+    gas[f"createDeed[{CATEGORY_NAMES[category]}]"] = tx.gas_used
+    return tx.events["DeedCreated"]["did"]
+
+
+def _make_offers(did, count, erc20, lender, pwn, gas, key):
+    offers = []
+    for _ in range(count):
+        tx = receipt(
+            pwn.makeOffer(
+                erc20.address, LOAN_AMOUNT, did, TO_BE_PAID, tx_params(lender)
+            )
+        )
+        offers.append(tx.events["OfferMade"]["offer"])
+    # the last offer is recorded, so one-off costs such as the first write of the
+    # pending offers of the deed don't skew the figure
+    gas[key] = tx.gas_used
+    return offers
+
+
+def measure():
+    PWN_OWNER = get_account(index=0)
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+
+    pwn_deed, pwn_vault, pwn = deploy_pwn(PWN_OWNER)
+    set_PWN_ownership(PWN_OWNER, pwn_deed, pwn_vault, pwn)
+    erc20, erc721, erc721_token_id, erc1155, erc1155_id = deploy_testing_tokens(
+        LENDER, PLEDGER, PLEDGER
+    )
+    tokens = (erc20, erc721, erc1155, erc1155_id)
+
+    send_token(PLEDGER, LENDER, 200, erc20, ERC20_VAL)
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=2**256 - 1)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=2**256 - 1)
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, approve_to_all=True)
+    set_approve(PLEDGER, pwn_vault.address, erc1155, ERC1155_VAL)
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+
+    # gas is read from the receipt of each measured transaction, repeated measurements
+    # overwrite each other so one-off costs such as the first write of the Deed ID
+    # counter don't skew the recorded figures
+    gas = {}
+    for category, name in CATEGORY_NAMES.items():
+        # open -> revoked
+        did = _create_deed(category, tokens, PLEDGER, pwn, gas)
+        offers = _make_offers(did, 1, erc20, LENDER, pwn, gas, f"makeOffer[{name}]")
+        tx = revoke_offer(offers[0], LENDER, pwn)
+        gas[f"revokeOffer[{name}]"] = receipt(tx).gas_used
+        tx = revoke_deed(did, PLEDGER, pwn)
+        gas[f"revokeDeed[{name}]"] = receipt(tx).gas_used
+
+        # running -> paid back -> claimed
+        did = _create_deed(category, tokens, PLEDGER, pwn, gas)
+        offers = _make_offers(did, 1, erc20, LENDER, pwn, gas, f"makeOffer[{name}]")
+        tx = accept_offer(offers[0], PLEDGER, pwn)
+        gas[f"acceptOffer[{name},pendingOffers=1]"] = receipt(tx).gas_used
+        tx = repay_loan(did, PLEDGER, pwn)
+        gas[f"repayLoan[{name}]"] = receipt(tx).gas_used
+        tx = claim_deed(did, LENDER, pwn)
+        gas[f"claimDeed[{name},paidBack]"] = receipt(tx).gas_used
+
+        # running -> expired -> claimed
+        did = _create_deed(category, tokens, PLEDGER, pwn, gas)
+        offers = _make_offers(did, 1, erc20, LENDER, pwn, gas, f"makeOffer[{name}]")
+        accept_offer(offers[0], PLEDGER, pwn)
+        expire_deed(did, pwn_deed)
+        tx = claim_deed(did, LENDER, pwn)
+        gas[f"claimDeed[{name},expired]"] = receipt(tx).gas_used
+
+    # acceptOffer cost as a function of the number of offers made to the deed
+    for size in PENDING_OFFERS_SIZES:
+        did = _create_deed(ERC20_VAL, tokens, PLEDGER, pwn, {})
+        offers = _make_offers(
+            did, size, erc20, LENDER, pwn, gas, f"makeOffer[ERC20,pendingOffers={size}]"
+        )
+        tx = accept_offer(offers[0], PLEDGER, pwn)
+        gas[f"acceptOffer[ERC20,pendingOffers={size}]"] = receipt(tx).gas_used
+
+    return gas
+
+
+def load_baseline(path=BASELINE_PATH, ref=None):
+    # `ref` reads the baseline committed at a git revision instead, such as `HEAD~1` to
+    # diff a gas-changing commit against its parent
+    if ref is not None:
+        result = subprocess.run(
+            ["git", "show", f"{ref}:{path}"], capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            return None
+        baseline = json.loads(result.stdout)
+    elif not os.path.exists(path):
+        return None
+    else:
+        with open(path) as f:
+            baseline = json.load(f)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise ValueError(
+            f"Baseline {path} has version {baseline.get('version')}, expected "
+            f"{BASELINE_VERSION} - rerun with `update` to record a new one"
+        )
+    return baseline["gas"]
+
+
+def save_baseline(gas, path=BASELINE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(
+            {"version": BASELINE_VERSION, "gas": dict(sorted(gas.items()))},
+            f,
+            indent=2,
+        )
+        f.write("\n")
+
+
+def compare(gas, baseline, threshold=DEFAULT_THRESHOLD):
+    regressions = []
+    print(f"{'entry point':<42}{'baseline':>10}{'current':>10}{'diff':>9}")
+    for key in sorted(set(gas) | set(baseline)):
+        old, new = baseline.get(key), gas.get(key)
+        if old is None or new is None:
+            old, new = ("-" if old is None else old), ("-" if new is None else new)
+            print(f"{key:<42}{old:>10}{new:>10}")
+            continue
+        diff = (new - old) / old
+        print(f"{key:<42}{old:>10}{new:>10}{diff:>+9.2%}")
+        if diff > threshold:
+            regressions.append(key)
+    return regressions
+
+
+# brownie run scripts/gas_benchmark.py main [update] [threshold] [git ref]
+# a gas-changing commit refreshes the committed baseline with `update` (on the ganache
+# development network), `main false 0.02 HEAD~1` then diffs the working tree against the
+# baseline of its parent
+def main(update=False, threshold=DEFAULT_THRESHOLD, ref=None):
+    update = str(update).lower() in ("true", "1", "update")
+    threshold = float(threshold)
+
+    if update:
+        save_baseline(measure())
+        print(f"Recorded gas baseline to {BASELINE_PATH}")
+        return
+
+    # a missing baseline fails the check, it's only ever recorded with `update`
+    baseline = load_baseline(ref=ref)
+    if baseline is None:
+        raise SystemExit(
+            f"No gas baseline at {BASELINE_PATH}"
+            + (f" in {ref}" if ref is not None else "")
+            + " - record one on the development network with `main update`"
+        )
+
+    gas = measure()
+    regressions = compare(gas, baseline, threshold)
+    if regressions:
+        raise SystemExit(
+            f"{len(regressions)} entry points regressed by more than {threshold:.0%}: "
+            + ", ".join(regressions)
+        )
@@ -0,0 +1,209 @@
+import os
+from brownie import PWN, chain, history
+from scripts.artifact_cache import packages_folder
+
+
+# where PWN transactions spend their gas - every transaction is replayed through
+# `debug_traceTransaction` (brownie's `tx.trace`, so the development ganache network,
+# eth-tester has no tracing), each opcode is charged to the function & source line it
+# belongs to, in contracts/ as well as in the MultiToken & OpenZeppelin packages
+# gas is aggregated across transactions by function (self & inclusive), by line and by
+# call stack - the stacks are written as folded stacks for flamegraphs:
+# `flamegraph.pl gas.folded > gas.svg`, or open the file in speedscope
+DEFAULT_FOLDED_PATH = "gas.folded"
+INTRINSIC_FRAME = "[intrinsic]"
+UNKNOWN_SOURCE = "[no source]"
+
+_sources = {}
+
+
+def step_costs(trace):
+    # gas charged to every step of a trace - a call's own cost excludes the gas its
+    # callee used, whatever the node reports as the cost of the CALL opcode
+    costs = [0] * len(trace)
+    calls = []  # [step index, gas used by the callee so far] of the calls in progress
+    for i, step in enumerate(trace):
+        following = trace[i + 1] if i + 1 < len(trace) else None
+        if following is not None and following["depth"] > step["depth"]:
+            calls.append([i, 0])
+            continue
+        if following is not None and following["depth"] == step["depth"]:
+            costs[i] = step["gas"] - following["gas"]
+        else:
+            # the last step of a call frame
+            costs[i] = step["gasCost"]
+        if calls:
+            calls[-1][1] += costs[i]
+        if following is not None and following["depth"] < step["depth"]:
+            start, used = calls.pop()
+            costs[start] = trace[start]["gas"] - following["gas"] - used
+            if calls:
+                calls[-1][1] += used + costs[start]
+    return costs
+
+
+def call_stacks(trace):
+    # functions on the stack at every step - external calls by depth, the internal ones
+    # of a contract by jump depth
+    frames = []
+    for step in trace:
+        depth = step["depth"]
+        del frames[depth + 1 :]
+        while len(frames) <= depth:
+            frames.append([])
+        calls = frames[depth]
+        del calls[step["jumpDepth"] :]
+        calls.append(step.get("fn") or str(step["address"]))
+        yield tuple(fn for level in frames for fn in level)
+
+
+def intrinsic_gas(tx):
+    # calldata priced as since istanbul - 4 gas per zero byte, 16 per other
+    data = bytes.fromhex(tx.input[2:])
+    zero_bytes = data.count(0)
+    return 21000 + 4 * zero_bytes + 16 * (len(data) - zero_bytes)
+
+
+def short_path(path):
+    # packages are named as brownie installs them, `OpenZeppelin/openzeppelin-contracts@4.5.0/...`
+    packages = packages_folder()
+    if os.path.isabs(path) and path.startswith(packages):
+        return os.path.relpath(path, packages)
+    if os.path.isabs(path) and path.startswith(os.getcwd()):
+        return os.path.relpath(path)
+    return path
+
+
+def source_line(filename, offset):
+    if filename not in _sources:
+        with open(filename) as f:
+            _sources[filename] = f.read()
+    source = _sources[filename]
+    line = source.count("\n", 0, offset[0]) + 1
+    start = source.rfind("\n", 0, offset[0]) + 1
+    end = source.find("\n", offset[0])
+    return line, source[start : end if end != -1 else len(source)].strip()
+
+
+class GasProfiler:
+    def __init__(self, line_frames=True):
+        # line_frames - the source line is the leaf of every folded stack
+        self.line_frames = line_frames
+        self.transactions = 0
+        self.gas_used = 0
+        self.intrinsic = 0
+        self.refunded = 0
+        self.self_gas = {}  # fn -> gas of its own steps
+        self.inclusive_gas = {}  # fn -> gas of its steps & everything it called
+        self.lines = {}  # file:line -> [gas, source text]
+        self.stacks = {}  # folded stack -> gas
+
+    def add(self, tx):
+        # contract deployments aren't traced by brownie, they are skipped
+        trace = tx.trace
+        if tx.contract_address or not trace:
+            return False
+        self.transactions += 1
+        self.gas_used += tx.gas_used
+        costs = step_costs(trace)
+
+        root = None
+        for step, cost, stack in zip(trace, costs, call_stacks(trace)):
+            root = root or stack[0]
+            self.self_gas[stack[-1]] = self.self_gas.get(stack[-1], 0) + cost
+            for fn in set(stack):
+                self.inclusive_gas[fn] = self.inclusive_gas.get(fn, 0) + cost
+
+            label, text = UNKNOWN_SOURCE, ""
+            source = step.get("source")
+            if source:
+                line, text = source_line(source["filename"], source["offset"])
+                label = f"{short_path(source['filename'])}:{line}"
+            self.lines.setdefault(label, [0, text])[0] += cost
+
+            if self.line_frames:
+                stack += (label,)
+            self._add_stack(stack, cost)
+
+        # gas charged outside the trace - the intrinsic cost is paid up front, refunds
+        # (cleared storage) are paid back at the end & don't fit in a flamegraph
+        intrinsic = intrinsic_gas(tx)
+        self.intrinsic += intrinsic
+        self.refunded += intrinsic + sum(costs) - tx.gas_used
+        self.inclusive_gas[root] += intrinsic
+        self._add_stack((root, INTRINSIC_FRAME), intrinsic)
+        return True
+
+    def add_all(self, txs):
+        return sum(self.add(tx) for tx in txs)
+
+    def _add_stack(self, stack, gas):
+        key = ";".join(stack)
+        self.stacks[key] = self.stacks.get(key, 0) + gas
+
+    def by_function(self):
+        # (fn, self gas, inclusive gas), most expensive first
+        return sorted(
+            (
+                (fn, self.self_gas.get(fn, 0), gas)
+                for fn, gas in self.inclusive_gas.items()
+            ),
+            key=lambda row: (-row[1], row[0]),
+        )
+
+    def by_line(self):
+        # (file:line, gas, source text), most expensive first
+        return sorted(
+            ((label, gas, text) for label, (gas, text) in self.lines.items()),
+            key=lambda row: (-row[1], row[0]),
+        )
+
+    def folded(self):
+        # `stack;of;frames gas` lines, the input of flamegraph.pl & speedscope
+        return [
+            f"{stack} {gas}" for stack, gas in sorted(self.stacks.items()) if gas > 0
+        ]
+
+    def write_folded(self, path=DEFAULT_FOLDED_PATH):
+        with open(path, "w") as f:
+            f.write("\n".join(self.folded()) + "\n")
+        return path
+
+    def format_report(self, limit=20):
+        lines = [
+            f"{self.transactions} transactions, {self.gas_used} gas used "
+            f"({self.intrinsic} intrinsic, {self.refunded} refunded)",
+            "",
+            f"{'function':<60}{'self':>10}{'inclusive':>12}",
+        ]
+        for fn, self_gas, inclusive in self.by_function()[:limit]:
+            lines.append(f"{fn:<60}{self_gas:>10}{inclusive:>12}")
+        lines += ["", f"{'line':<60}{'gas':>10}  source"]
+        for label, gas, text in self.by_line()[:limit]:
+            lines.append(f"{label:<60}{gas:>10}  {text[:60]}")
+        return "\n".join(lines)
+
+
+def profile(txs, line_frames=True):
+    profiler = GasProfiler(line_frames)
+    profiler.add_all(txs)
+    return profiler
+
+
+# brownie run scripts/gas_profiler.py main [folded path] [txids...]
+# without txids, the scenarios of scripts/gas_benchmark.py are run & every transaction
+# they sent to PWN is profiled
+def main(path=DEFAULT_FOLDED_PATH, *txids):
+    if txids:
+        txs = [chain.get_transaction(txid) for txid in txids]
+    else:
+        from scripts.gas_benchmark import measure
+
+        start = len(history)
+        measure()
+        pwn = PWN[-1]
+        txs = [tx for tx in history[start:] if tx.receiver == pwn.address]
+
+    profiler = profile(txs)
+    print(profiler.format_report())
+    print(f"\nFolded stacks written to {profiler.write_folded(path)}")
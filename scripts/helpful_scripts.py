@@ -1,4 +1,5 @@
-from brownie import accounts, network, config
+from brownie import accounts, network, config, web3
+from eth_utils import event_abi_to_log_topic
 
 FORKED_LOCAL_ENVIRONMENTS = ["mainnet-fork", "mainnet-fork-dev"]
 LOCAL_BLOCKCHAIN_ENVIRONMENTS = ["development", "ganache-local"]
@@ -19,3 +20,33 @@ def get_account(index=None, id=None):
         return accounts[0]
     return accounts.add(config["wallets"]["from_key"])
 
+
+def fetch_events(contracts, from_block, to_block):
+    # decoded events of all `contracts` in the block range, in the order they were emitted
+    # one eth_getLogs call for the whole range instead of one per contract & event type
+    decoders = {}
+    for contract in contracts:
+        web3_contract = web3.eth.contract(address=contract.address, abi=contract.abi)
+        for abi in contract.abi:
+            if abi["type"] == "event" and not abi.get("anonymous"):
+                event = getattr(web3_contract.events, abi["name"])()
+                # web3 v5 names it processLog, newer versions process_log
+                decode = getattr(event, "process_log", None) or event.processLog
+                decoders[(contract.address, event_abi_to_log_topic(abi))] = decode
+
+    logs = web3.eth.get_logs(
+        {
+            "address": [contract.address for contract in contracts],
+            "fromBlock": from_block,
+            "toBlock": to_block,
+        }
+    )
+    events = []
+    for log in logs:
+        if not log["topics"]:
+            continue
+        decode = decoders.get((log["address"], bytes(log["topics"][0])))
+        if decode is not None:
+            events.append(decode(log))
+
+    return sorted(events, key=lambda event: (event.blockNumber, event.logIndex))
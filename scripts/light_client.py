@@ -0,0 +1,190 @@
+import json
+import os
+import sys
+
+
+# read-only access to a PWN deployment with nothing but web3 - no brownie project is
+# loaded nor compiled, `python -m scripts.light_client deed <did>` starts in the time it
+# takes to import web3
+# the ABIs are exported from the build artifacts once per contract change:
+# `brownie compile && python -m scripts.light_client export`, tests/test_light_client.py
+# fails while they differ from the build - until then the ABIs are read from the build
+# artifacts themselves
+ABI_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "abi")
+BUILD_DIR = os.path.join("build", "contracts")
+DEPLOYMENTS_MAP = os.path.join("build", "deployments", "map.json")
+CONTRACTS = ("PWNDeed", "PWNVault", "PWN")
+RPC_ENV = "WEB3_PROVIDER_URI"
+ADDRESS_ENV = {"PWNDeed": "PWN_DEED_ADDRESS", "PWNVault": "PWN_VAULT_ADDRESS"}
+
+_abis = {}
+
+
+def export_abis(build_dir=BUILD_DIR, abi_dir=ABI_DIR, names=CONTRACTS):
+    # only the ABI of each artifact, a fraction of its size & parsed in no time
+    os.makedirs(abi_dir, exist_ok=True)
+    for name in names:
+        with open(os.path.join(build_dir, name + ".json")) as f:
+            abi = json.load(f)["abi"]
+        with open(os.path.join(abi_dir, name + ".json"), "w") as f:
+            json.dump(abi, f, indent=1)
+            f.write("\n")
+    return list(names)
+
+
+def load_abi(name, build_dir=BUILD_DIR):
+    if name not in _abis:
+        path = os.path.join(ABI_DIR, name + ".json")
+        if os.path.exists(path):
+            with open(path) as f:
+                _abis[name] = json.load(f)
+        elif os.path.exists(os.path.join(build_dir, name + ".json")):
+            with open(os.path.join(build_dir, name + ".json")) as f:
+                _abis[name] = json.load(f)["abi"]
+        else:
+            raise FileNotFoundError(
+                f"No ABI of {name} at {path} nor in {build_dir} - run "
+                "`brownie compile` & `python -m scripts.light_client export`"
+            )
+    return _abis[name]
+
+
+def connect(rpc_url=None):
+    # web3 is imported only once a connection is needed
+    from web3 import Web3
+
+    rpc_url = rpc_url or os.environ.get(RPC_ENV)
+    if not rpc_url:
+        raise ValueError(f"No RPC url given, pass one or set {RPC_ENV}")
+    return Web3(Web3.HTTPProvider(rpc_url))
+
+
+def deployed_address(name, w3, deployments_map=DEPLOYMENTS_MAP):
+    # the latest deployment brownie recorded for a live network
+    if not os.path.exists(deployments_map):
+        return None
+    with open(deployments_map) as f:
+        addresses = json.load(f).get(str(w3.eth.chain_id), {}).get(name)
+    return addresses[0] if addresses else None
+
+
+class ReadClient:
+    # `client.getDeedStatus(did)`, `client.getDeedCollateral(did)`, ... - any view function
+    # of PWNDeed, then PWNVault, called at `block` (default: latest)
+    # addresses default to PWN_DEED_ADDRESS / PWN_VAULT_ADDRESS, then to the deployments
+    # brownie recorded in build/deployments/map.json
+
+    def __init__(self, rpc_url=None, deed_address=None, vault_address=None, w3=None):
+        from eth_utils import to_checksum_address
+
+        self.w3 = w3 or connect(rpc_url)
+        self.block = "latest"
+        self.contracts = {}
+        for name, address in (("PWNDeed", deed_address), ("PWNVault", vault_address)):
+            address = (
+                address
+                or os.environ.get(ADDRESS_ENV[name])
+                or deployed_address(name, self.w3)
+            )
+            if address:
+                self.contracts[name] = self.w3.eth.contract(
+                    address=to_checksum_address(address), abi=load_abi(name)
+                )
+        if "PWNDeed" not in self.contracts:
+            raise ValueError(
+                f"No PWNDeed address, pass one or set {ADDRESS_ENV['PWNDeed']}"
+            )
+        self._views = {
+            item["name"]: contract
+            for contract in reversed(list(self.contracts.values()))
+            for item in contract.abi
+            if item["type"] == "function"
+            and item.get("stateMutability") in ("view", "pure")
+        }
+
+    @property
+    def deed(self):
+        return self.contracts["PWNDeed"]
+
+    @property
+    def vault(self):
+        return self.contracts.get("PWNVault")
+
+    def __getattr__(self, name):
+        if name.startswith("_") or name not in self.__dict__.get("_views", {}):
+            raise AttributeError(name)
+        contract = self._views[name]
+        return lambda *args: getattr(contract.functions, name)(*args).call(
+            block_identifier=self.block
+        )
+
+    def get_deed(self, did):
+        return {
+            "did": did,
+            "status": self.getDeedStatus(did),
+            "borrower": self.getBorrower(did),
+            "duration": self.getDuration(did),
+            "expiration": self.getExpiration(did),
+            "collateral": self.getDeedCollateral(did),
+            "accepted_offer": "0x" + bytes(self.getAcceptedOffer(did)).hex(),
+        }
+
+    def events(self, from_block, to_block="latest"):
+        # decoded events of PWNDeed & PWNVault in the block range, in the order they were
+        # emitted - one eth_getLogs call, the same as helpful_scripts.fetch_events
+        from eth_utils import event_abi_to_log_topic
+
+        decoders = {}
+        for contract in self.contracts.values():
+            for abi in contract.abi:
+                if abi["type"] == "event" and not abi.get("anonymous"):
+                    event = getattr(contract.events, abi["name"])()
+                    decode = getattr(event, "process_log", None) or event.processLog
+                    decoders[(contract.address, event_abi_to_log_topic(abi))] = decode
+
+        logs = self.w3.eth.get_logs(
+            {
+                "address": [contract.address for contract in self.contracts.values()],
+                "fromBlock": from_block,
+                "toBlock": to_block,
+            }
+        )
+        events = []
+        for log in logs:
+            if not log["topics"]:
+                continue
+            decode = decoders.get((log["address"], bytes(log["topics"][0])))
+            if decode is not None:
+                events.append(decode(log))
+        return sorted(events, key=lambda event: (event.blockNumber, event.logIndex))
+
+
+def _json(value):
+    return "0x" + bytes(value).hex() if isinstance(value, bytes) else str(value)
+
+
+# python -m scripts.light_client export
+# python -m scripts.light_client deed <did>
+# python -m scripts.light_client events <from block> [to block]
+def main(command="deed", *args):
+    if command == "export":
+        print(f"Exported the ABIs of {', '.join(export_abis())} to {ABI_DIR}")
+        return
+
+    client = ReadClient()
+    if command == "deed":
+        print(json.dumps(client.get_deed(int(args[0])), default=_json))
+    elif command == "events":
+        to_block = int(args[1]) if len(args) > 1 else "latest"
+        for event in client.events(int(args[0]), to_block):
+            print(
+                event.blockNumber,
+                event.event,
+                json.dumps(dict(event.args), default=_json),
+            )
+    else:
+        raise ValueError(f"Unknown command {command}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
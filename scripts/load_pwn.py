@@ -0,0 +1,337 @@
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from brownie import (
+    accounts,
+    network,
+    history,
+    exceptions,
+    ERC20MyToken,
+    ERC721MyToken,
+    ERC1155MyToken,
+)
+from scripts.helpful_scripts import get_account, LOCAL_BLOCKCHAIN_ENVIRONMENTS
+from scripts.tx_pipeline import tx_params, confirm, pipelined
+from scripts.time_travel import mine_at
+from scripts.deploy_pwn import (
+    deploy_pwn,
+    set_PWN_ownership,
+    set_approve,
+    send_token,
+    pwn_create_deed,
+    make_offer,
+    revoke_offer,
+    accept_offer,
+    revoke_deed,
+    repay_loan,
+    claim_deed,
+    ERC20_VAL,
+    ERC721_VAL,
+    ERC1155_VAL,
+)
+
+
+LOAN_DURATION = 3600
+LOAN_AMOUNT = 100
+TO_BE_PAID = 110
+ERC20_COLLATERAL_AMOUNT = 10
+ACCOUNT_ERC20_BALANCE = 10**24
+
+_lock = threading.Lock()
+_samples = defaultdict(list)  # operation -> [(latency in s, gas used)]
+_failures = defaultdict(int)  # operation -> number of reverted calls
+_phases = []  # [(phase, operations, wall time in s)]
+
+
+def _load_accounts(funder, borrowers, lenders):
+    needed = 1 + borrowers + lenders
+    if len(accounts) < needed:
+        if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+            raise ValueError(
+                f"Load test needs {needed} accounts, {len(accounts)} loaded"
+            )
+        for _ in range(needed - len(accounts)):
+            account = accounts.add()
+            funder.transfer(account, "10 ether")
+
+    return list(accounts[1 : 1 + borrowers]), list(accounts[1 + borrowers : needed])
+
+
+def _run_task(op, account, fn, *args):
+    start = time.perf_counter()
+    try:
+        result = fn(*args)
+    except exceptions.VirtualMachineError:
+        with _lock:
+            _failures[op] += 1
+        return None
+    latency = time.perf_counter() - start
+
+    # every account is driven by a single worker, so its last transaction is this one
+    gas_used = history.from_sender(account.address)[-1].gas_used
+    with _lock:
+        _samples[op].append((latency, gas_used))
+    return result
+
+
+def _run_phase(name, tasks):
+    # tasks of one account run in order, accounts run concurrently
+    by_account = defaultdict(list)
+    for index, task in enumerate(tasks):
+        by_account[task[1].address].append((index, task))
+
+    def run_account(account_tasks):
+        return [(index, _run_task(*task)) for index, task in account_tasks]
+
+    results = [None] * len(tasks)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(len(by_account), 1)) as executor:
+        for account_results in executor.map(run_account, by_account.values()):
+            for index, result in account_results:
+                results[index] = result
+    _phases.append((name, len(tasks), time.perf_counter() - start))
+
+    return results
+
+
+def _deploy_collateral(owner, borrower_accounts, deed_specs):
+    supply = ACCOUNT_ERC20_BALANCE * (len(accounts) + 1)
+    erc20 = ERC20MyToken.deploy(supply, {"from": owner})
+    erc721 = ERC721MyToken.deploy("ERC721", {"from": owner})
+    erc1155 = ERC1155MyToken.deploy("ERC1155", {"from": owner})
+
+    # every ERC721 deed needs its own token, ERC1155 deeds of a borrower share one id
+    deeds_per_borrower = defaultdict(int)
+    for category, borrower in deed_specs:
+        deeds_per_borrower[(category, borrower.address)] += 1
+
+    mints = []
+    with pipelined():
+        for index, borrower in enumerate(borrower_accounts):
+            for _ in range(deeds_per_borrower[(ERC721_VAL, borrower.address)]):
+                tx = erc721.mint(borrower, tx_params(owner))
+                mints.append((borrower, confirm(tx)))
+            erc1155_amount = deeds_per_borrower[(ERC1155_VAL, borrower.address)]
+            if erc1155_amount:
+                tx = erc1155.mint(
+                    borrower, index + 1, erc1155_amount, "", tx_params(owner)
+                )
+                confirm(tx)
+
+    erc721_ids = defaultdict(list)
+    for borrower, tx in mints:
+        erc721_ids[borrower.address].append(tx.events["TokenCreated"]["id"])
+
+    return erc20, erc721, erc721_ids, erc1155
+
+
+def _set_up_accounts(
+    owner, borrower_accounts, lender_accounts, pwn_deed, pwn_vault, tokens
+):
+    erc20, erc721, erc1155 = tokens
+    with pipelined():
+        for account in borrower_accounts + lender_accounts:
+            send_token(account, owner, ACCOUNT_ERC20_BALANCE, erc20, ERC20_VAL)
+            set_approve(account, pwn_vault.address, erc20, ERC20_VAL, amount=2**256 - 1)
+        for borrower in borrower_accounts:
+            set_approve(
+                borrower, pwn_vault.address, erc721, ERC721_VAL, approve_to_all=True
+            )
+            set_approve(borrower, pwn_vault.address, erc1155, ERC1155_VAL)
+            set_approve(borrower, pwn_vault.address, pwn_deed, ERC1155_VAL)
+
+
+def _percentile(values, percent):
+    # nearest-rank percentile
+    values = sorted(values)
+    rank = max(int(round(percent / 100 * len(values) + 0.5)) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def _report():
+    print()
+    print(
+        f"{'operation':<14}{'count':>8}{'failed':>8}{'p50 ms':>10}{'p95 ms':>10}"
+        f"{'p99 ms':>10}{'avg gas':>12}{'max gas':>12}"
+    )
+    for op in sorted(set(_samples) | set(_failures)):
+        latencies = [latency * 1000 for latency, _ in _samples[op]] or [0]
+        gas = [gas_used for _, gas_used in _samples[op]] or [0]
+        print(
+            f"{op:<14}{len(_samples[op]):>8}{_failures[op]:>8}"
+            f"{_percentile(latencies, 50):>10.1f}{_percentile(latencies, 95):>10.1f}"
+            f"{_percentile(latencies, 99):>10.1f}{sum(gas) // len(gas):>12}{max(gas):>12}"
+        )
+
+    print()
+    print(f"{'phase':<14}{'ops':>8}{'seconds':>10}{'ops/s':>10}")
+    for phase, count, elapsed in _phases:
+        print(
+            f"{phase:<14}{count:>8}{elapsed:>10.2f}{count / elapsed if elapsed else 0:>10.1f}"
+        )
+    total_ops = sum(count for _, count, _ in _phases)
+    total_time = sum(elapsed for _, _, elapsed in _phases)
+    print(
+        f"{'total':<14}{total_ops:>8}{total_time:>10.2f}{total_ops / total_time if total_time else 0:>10.1f}"
+    )
+
+
+# brownie run scripts/load_pwn.py main <borrowers> <lenders> <deeds per category> <offers per deed> ...
+def main(
+    borrowers=4,
+    lenders=4,
+    deeds_per_category=5,
+    offers_per_deed=3,
+    accept_ratio=0.7,
+    revoke_deed_ratio=0.1,
+    revoke_offer_ratio=0.2,
+    repay_ratio=0.6,
+    seed=0,
+):
+    borrowers, lenders = int(borrowers), int(lenders)
+    deeds_per_category, offers_per_deed = int(deeds_per_category), int(offers_per_deed)
+    accept_ratio, revoke_deed_ratio = float(accept_ratio), float(revoke_deed_ratio)
+    revoke_offer_ratio, repay_ratio = float(revoke_offer_ratio), float(repay_ratio)
+    rng = random.Random(int(seed))
+
+    PWN_OWNER = get_account(index=0)
+    borrower_accounts, lender_accounts = _load_accounts(PWN_OWNER, borrowers, lenders)
+
+    pwn_deed, pwn_vault, pwn = deploy_pwn(PWN_OWNER)
+    set_PWN_ownership(PWN_OWNER, pwn_deed, pwn_vault, pwn)
+
+    # every collateral category gets `deeds_per_category` deeds spread over the borrowers
+    deed_specs = [
+        (category, borrower_accounts[i % borrowers])
+        for category in (ERC20_VAL, ERC721_VAL, ERC1155_VAL)
+        for i in range(deeds_per_category)
+    ]
+    erc20, erc721, erc721_ids, erc1155 = _deploy_collateral(
+        PWN_OWNER, borrower_accounts, deed_specs
+    )
+    _set_up_accounts(
+        PWN_OWNER,
+        borrower_accounts,
+        lender_accounts,
+        pwn_deed,
+        pwn_vault,
+        (erc20, erc721, erc1155),
+    )
+
+    create_tasks = []
+    for category, borrower in deed_specs:
+        if category == ERC20_VAL:
+            collateral = (erc20.address, 0, ERC20_COLLATERAL_AMOUNT)
+        elif category == ERC721_VAL:
+            collateral = (erc721.address, erc721_ids[borrower.address].pop(), 1)
+        else:
+            collateral = (erc1155.address, borrower_accounts.index(borrower) + 1, 1)
+        address, token_id, amount = collateral
+        create_tasks.append(
+            (
+                "create_deed",
+                borrower,
+                pwn_create_deed,
+                address,
+                category,
+                LOAN_DURATION,
+                token_id,
+                amount,
+                borrower,
+            )
+        )
+    deeds = _run_phase("create", create_tasks)
+    deeds = [
+        (did, borrower)
+        for did, (_, borrower) in zip(deeds, deed_specs)
+        if did is not None
+    ]
+
+    offer_tasks, offered = [], []  # offered - (did, lender) of every offer task
+    for deed_index, (did, _) in enumerate(deeds):
+        for offer_index in range(offers_per_deed):
+            lender = lender_accounts[(deed_index + offer_index) % lenders]
+            offer_tasks.append(
+                (
+                    "make_offer",
+                    lender,
+                    make_offer,
+                    erc20.address,
+                    LOAN_AMOUNT,
+                    did,
+                    TO_BE_PAID,
+                    lender,
+                )
+            )
+            offered.append((did, lender))
+    offers = _run_phase("offer", offer_tasks)
+    offers_by_deed = defaultdict(list)
+    for offer, (did, lender) in zip(offers, offered):
+        if offer is not None:
+            offers_by_deed[did].append((offer, lender))
+
+    # the first offer of every deed is kept for acceptance
+    _run_phase(
+        "revoke_offer",
+        [
+            ("revoke_offer", lender, revoke_offer, offer, lender)
+            for did, _ in deeds
+            for offer, lender in offers_by_deed[did][1:]
+            if rng.random() < revoke_offer_ratio
+        ],
+    )
+
+    deed_tasks, accepting = [], []
+    for did, borrower in deeds:
+        roll = rng.random()
+        if roll < accept_ratio and offers_by_deed[did]:
+            offer, lender = offers_by_deed[did][0]
+            accepting.append((did, borrower, lender))
+            deed_tasks.append(("accept_offer", borrower, accept_offer, offer, borrower))
+        elif roll < accept_ratio + revoke_deed_ratio:
+            accepting.append(None)
+            deed_tasks.append(("revoke_deed", borrower, revoke_deed, did, borrower))
+    results = _run_phase("accept", deed_tasks)
+    accepted = [deed for deed, tx in zip(accepting, results) if deed and tx is not None]
+
+    repaying = [deed for deed in accepted if rng.random() < repay_ratio]
+    results = _run_phase(
+        "repay",
+        [
+            ("repay_loan", borrower, repay_loan, did, borrower)
+            for did, borrower, _ in repaying
+        ],
+    )
+    repaid = [deed for deed, tx in zip(repaying, results) if tx is not None]
+
+    claimable = repaid
+    expire = network.show_active() in LOCAL_BLOCKCHAIN_ENVIRONMENTS
+    if expire and accepted:
+        # let all running loans default so their collateral can be claimed too
+        mine_at(max(pwn_deed.getExpiration(did) for did, _, _ in accepted) + 1)
+        claimable = accepted
+    _run_phase(
+        "claim",
+        [
+            ("claim_deed", lender, claim_deed, did, lender)
+            for did, _, lender in claimable
+        ],
+    )
+
+    _report()
+
+    # every phase the ratios ask for sends transactions, an empty one means the scenario
+    # lost track of its deeds or offers
+    expected = {
+        "create": True,
+        "offer": offers_per_deed > 0,
+        "revoke_offer": offers_per_deed > 1 and revoke_offer_ratio > 0,
+        "accept": accept_ratio + revoke_deed_ratio > 0,
+        "repay": accept_ratio > 0 and repay_ratio > 0,
+        "claim": accept_ratio > 0 and (expire or repay_ratio > 0),
+    }
+    empty = [phase for phase, count, _ in _phases if expected[phase] and not count]
+    if empty:
+        raise RuntimeError(f"No transactions sent in the phases {', '.join(empty)}")
@@ -0,0 +1,320 @@
+import sqlite3
+import time
+from brownie import PWNDeed, web3
+from scripts.helpful_scripts import fetch_events
+
+
+DEFAULT_DB_PATH = "pwn_index.sqlite"
+DEFAULT_BATCH_SIZE = 2000
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# deed statuses follow PWNDeed.getDeedStatus, expiry is derived from `expiration` at query
+# time - against the timestamp of the last indexed block, the chain's clock not the host's
+DEED_DEAD = 0
+DEED_OPEN = 1
+DEED_RUNNING = 2
+DEED_PAID_BACK = 3
+DEED_EXPIRED = 4
+
+OFFER_PENDING = 1
+OFFER_ACCEPTED = 2
+OFFER_REVOKED = 3
+OFFER_VOID = 4  # the deed stopped accepting offers before this one was accepted
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    contract TEXT PRIMARY KEY,
+    block INTEGER NOT NULL,
+    timestamp INTEGER
+);
+CREATE TABLE IF NOT EXISTS deeds (
+    did INTEGER PRIMARY KEY,
+    status INTEGER NOT NULL,
+    borrower TEXT,
+    collateral_address TEXT NOT NULL,
+    collateral_category INTEGER NOT NULL,
+    collateral_id TEXT NOT NULL,
+    collateral_amount TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    expiration INTEGER,
+    accepted_offer TEXT,
+    created_block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS offers (
+    offer TEXT PRIMARY KEY,
+    did INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    lender TEXT NOT NULL,
+    loan_address TEXT NOT NULL,
+    loan_amount TEXT NOT NULL,
+    to_be_paid TEXT NOT NULL,
+    created_block INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS deed_owners (
+    did INTEGER PRIMARY KEY,
+    owner TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS deeds_by_status ON deeds (status);
+CREATE INDEX IF NOT EXISTS deed_owners_by_owner ON deed_owners (owner);
+CREATE INDEX IF NOT EXISTS offers_by_deed ON offers (did, status);
+"""
+
+
+def open_index(path=DEFAULT_DB_PATH):
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.executescript(SCHEMA)
+    return db
+
+
+def get_checkpoint(db, contract_address):
+    row = db.execute(
+        "SELECT block FROM checkpoints WHERE contract = ?", (contract_address,)
+    ).fetchone()
+    return row["block"] if row else None
+
+
+def get_index_time(db):
+    # the timestamp of the newest indexed block, the latest block's before the first sync
+    row = db.execute("SELECT MAX(timestamp) AS timestamp FROM checkpoints").fetchone()
+    if row["timestamp"] is None:
+        return web3.eth.get_block("latest")["timestamp"]
+    return row["timestamp"]
+
+
+def _hex(value):
+    return "0x" + bytes(value).hex()
+
+
+def _void_pending_offers(db, did):
+    db.execute(
+        "UPDATE offers SET status = ? WHERE did = ? AND status = ?",
+        (OFFER_VOID, did, OFFER_PENDING),
+    )
+
+
+def _on_deed_created(db, args, event, block_timestamp):
+    # uint256 values are stored as text, sqlite integers are only 64 bits wide
+    db.execute(
+        "INSERT OR REPLACE INTO deeds (did, status, collateral_address, collateral_category,"
+        " collateral_id, collateral_amount, duration, created_block)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            args["did"],
+            DEED_OPEN,
+            args["assetAddress"],
+            args["category"],
+            str(args["id"]),
+            str(args["amount"]),
+            args["duration"],
+            event.blockNumber,
+        ),
+    )
+
+
+def _on_offer_made(db, args, event, block_timestamp):
+    db.execute(
+        "INSERT OR REPLACE INTO offers (offer, did, status, lender, loan_address,"
+        " loan_amount, to_be_paid, created_block) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            _hex(args["offer"]),
+            args["did"],
+            OFFER_PENDING,
+            args["lender"],
+            args["assetAddress"],
+            str(args["amount"]),
+            str(args["toBePaid"]),
+            event.blockNumber,
+        ),
+    )
+
+
+def _on_deed_revoked(db, args, event, block_timestamp):
+    db.execute("UPDATE deeds SET status = ? WHERE did = ?", (DEED_DEAD, args["did"]))
+    _void_pending_offers(db, args["did"])
+
+
+def _on_offer_revoked(db, args, event, block_timestamp):
+    db.execute(
+        "UPDATE offers SET status = ? WHERE offer = ?",
+        (OFFER_REVOKED, _hex(args["offer"])),
+    )
+
+
+def _on_offer_accepted(db, args, event, block_timestamp):
+    # the deed token moves to the lender only after this event,
+    # so its current owner is the borrower
+    offer = _hex(args["offer"])
+    db.execute(
+        "UPDATE deeds SET status = ?, accepted_offer = ?, expiration = ? + duration,"
+        " borrower = (SELECT owner FROM deed_owners WHERE deed_owners.did = deeds.did)"
+        " WHERE did = ?",
+        (DEED_RUNNING, offer, block_timestamp(event.blockNumber), args["did"]),
+    )
+    db.execute("UPDATE offers SET status = ? WHERE offer = ?", (OFFER_ACCEPTED, offer))
+    _void_pending_offers(db, args["did"])
+
+
+def _on_paid_back(db, args, event, block_timestamp):
+    db.execute(
+        "UPDATE deeds SET status = ? WHERE did = ?", (DEED_PAID_BACK, args["did"])
+    )
+
+
+def _on_deed_claimed(db, args, event, block_timestamp):
+    db.execute("UPDATE deeds SET status = ? WHERE did = ?", (DEED_DEAD, args["did"]))
+
+
+def _set_owner(db, did, owner):
+    # kept apart from `deeds` - the mint transfer is emitted before `DeedCreated`
+    if owner == ZERO_ADDRESS:
+        db.execute("DELETE FROM deed_owners WHERE did = ?", (did,))
+    else:
+        db.execute(
+            "INSERT OR REPLACE INTO deed_owners (did, owner) VALUES (?, ?)",
+            (did, owner),
+        )
+
+
+def _on_transfer_single(db, args, event, block_timestamp):
+    _set_owner(db, args["id"], args["to"])
+
+
+def _on_transfer_batch(db, args, event, block_timestamp):
+    for did in args["ids"]:
+        _set_owner(db, did, args["to"])
+
+
+EVENT_HANDLERS = {
+    "DeedCreated": _on_deed_created,
+    "OfferMade": _on_offer_made,
+    "DeedRevoked": _on_deed_revoked,
+    "OfferRevoked": _on_offer_revoked,
+    "OfferAccepted": _on_offer_accepted,
+    "PaidBack": _on_paid_back,
+    "DeedClaimed": _on_deed_claimed,
+    "TransferSingle": _on_transfer_single,
+    "TransferBatch": _on_transfer_batch,
+}
+
+
+def sync(
+    db,
+    pwn_deed=None,
+    start_block=0,
+    to_block=None,
+    batch_size=DEFAULT_BATCH_SIZE,
+):
+    # indexes `PWNDeed` events from the last checkpoint up to `to_block` (default: head)
+    # every batch is committed together with its checkpoint, so an interrupted sync resumes
+    pwn_deed = pwn_deed or PWNDeed[-1]
+    to_block = web3.eth.block_number if to_block is None else to_block
+    checkpoint = get_checkpoint(db, pwn_deed.address)
+    from_block = start_block if checkpoint is None else checkpoint + 1
+
+    timestamps = {}
+
+    def block_timestamp(number):
+        if number not in timestamps:
+            timestamps[number] = web3.eth.get_block(number)["timestamp"]
+        return timestamps[number]
+
+    processed = 0
+    while from_block <= to_block:
+        batch_end = min(from_block + batch_size - 1, to_block)
+        events = fetch_events([pwn_deed], from_block, batch_end)
+        with db:
+            for event in events:
+                handler = EVENT_HANDLERS.get(event.event)
+                if handler is not None:
+                    handler(db, event.args, event, block_timestamp)
+            db.execute(
+                "INSERT OR REPLACE INTO checkpoints (contract, block, timestamp)"
+                " VALUES (?, ?, ?)",
+                (pwn_deed.address, batch_end, block_timestamp(batch_end)),
+            )
+        processed += len(events)
+        timestamps.clear()
+        from_block = batch_end + 1
+
+    return processed
+
+
+def follow(db, pwn_deed=None, poll_interval=5, batch_size=DEFAULT_BATCH_SIZE):
+    while True:
+        sync(db, pwn_deed, batch_size=batch_size)
+        time.sleep(poll_interval)
+
+
+def _deed_status(row, now):
+    if row["status"] == DEED_RUNNING and row["expiration"] < now:
+        return DEED_EXPIRED
+    return row["status"]
+
+
+def _deed_record(row, now):
+    deed = dict(row)
+    deed["status"] = _deed_status(row, now)
+    return deed
+
+
+DEED_QUERY = (
+    "SELECT deeds.*, deed_owners.owner FROM deeds"
+    " LEFT JOIN deed_owners ON deed_owners.did = deeds.did"
+)
+
+
+def get_deed(db, did, now=None):
+    now = get_index_time(db) if now is None else now
+    row = db.execute(DEED_QUERY + " WHERE deeds.did = ?", (did,)).fetchone()
+    return _deed_record(row, now) if row else None
+
+
+def get_live_deeds(db, owner=None, now=None):
+    # open, running, paid back and expired deeds - everything not revoked or claimed yet
+    now = get_index_time(db) if now is None else now
+    query, params = DEED_QUERY + " WHERE deeds.status != ?", [DEED_DEAD]
+    if owner is not None:
+        query += " AND deed_owners.owner = ?"
+        params.append(owner)
+    rows = db.execute(query + " ORDER BY deeds.did", params).fetchall()
+    return [_deed_record(row, now) for row in rows]
+
+
+def get_open_deeds(db):
+    rows = db.execute(
+        DEED_QUERY + " WHERE deeds.status = ? ORDER BY deeds.did", (DEED_OPEN,)
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_valid_offers(db, did):
+    # the same offers `PWNDeed.getOffers` lists, in the order they were made - not in the
+    # contract's order, revoking an offer moves the last pending one into its slot
+    rows = db.execute(
+        "SELECT offers.* FROM offers JOIN deeds ON deeds.did = offers.did"
+        " WHERE offers.did = ? AND offers.status = ? AND deeds.status = ?"
+        " ORDER BY offers.created_block, offers.rowid",
+        (did, OFFER_PENDING, DEED_OPEN),
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+def get_offers_of(db, lender, status=OFFER_PENDING):
+    rows = db.execute(
+        "SELECT * FROM offers WHERE lender = ? AND status = ?"
+        " ORDER BY created_block, rowid",
+        (lender, status),
+    ).fetchall()
+    return [dict(row) for row in rows]
+
+
+# brownie run scripts/pwn_indexer.py main [db path]
+def main(db_path=DEFAULT_DB_PATH):
+    db = open_index(db_path)
+    processed = sync(db)
+    print(
+        f"Indexed {processed} events up to block {get_checkpoint(db, PWNDeed[-1].address)}"
+    )
+    print(f"Open deeds: {len(get_open_deeds(db))}")
+    print(f"Live deeds: {len(get_live_deeds(db))}")
@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from brownie import Multicall, PWNDeed, network, config
+from scripts.helpful_scripts import get_account, LOCAL_BLOCKCHAIN_ENVIRONMENTS
+
+
+DEFAULT_BATCH_SIZE = 500
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+ZERO_HASH = "0x" + "00" * 32
+
+
+@dataclass(frozen=True)
+class Asset:
+    asset_address: str
+    category: int
+    amount: int
+    id: int
+
+
+@dataclass(frozen=True)
+class Offer:
+    offer: str
+    did: int
+    lender: str
+    loan: Asset
+    to_be_paid: int
+
+
+@dataclass(frozen=True)
+class Deed:
+    did: int
+    status: int
+    borrower: str
+    duration: int
+    expiration: int
+    collateral: Asset
+    accepted_offer: str
+    # pending offers of an open deed, the accepted one of a running / paid back deed
+    offers: list
+
+
+def get_multicall(account=None):
+    # networks.<name>.multicall in brownie-config.yaml points to an existing deployment,
+    # local networks get their own one
+    address = (config["networks"].get(network.show_active(), {}) or {}).get("multicall")
+    if address:
+        return Multicall.at(address)
+    if len(Multicall) > 0:
+        return Multicall[-1]
+    if network.show_active() not in LOCAL_BLOCKCHAIN_ENVIRONMENTS:
+        raise ValueError(
+            f"No multicall address configured for network {network.show_active()}"
+        )
+    return Multicall.deploy({"from": account or get_account()})
+
+
+def _method(contract, name, args):
+    # overloaded functions such as getOffers resolve by the number of arguments
+    method = getattr(contract, name)
+    if hasattr(method, "methods"):
+        method = next(fn for key, fn in method.methods.items() if len(key) == len(args))
+    return method
+
+
+def aggregate(calls, multicall=None, batch_size=DEFAULT_BATCH_SIZE, block=None):
+    # `calls` is a list of (contract, function name, args)
+    # returns the decoded values in the same order, None for calls that reverted
+    # all batches are read at the block of the first one so the results are consistent
+    multicall = multicall or get_multicall()
+    values = []
+    for start in range(0, len(calls), batch_size):
+        batch = calls[start : start + batch_size]
+        block_number, results = multicall.aggregate(
+            [
+                (contract.address, _method(contract, name, args).encode_input(*args))
+                for contract, name, args in batch
+            ],
+            block_identifier=block,
+        )
+        block = block_number if block is None else block
+        for (contract, name, args), (success, return_data) in zip(batch, results):
+            values.append(
+                _method(contract, name, args).decode_output(return_data)
+                if success
+                else None
+            )
+
+    return values, block
+
+
+def _asset(value):
+    asset_address, category, amount, token_id = value
+    return Asset(asset_address, category, amount, token_id)
+
+
+def get_offers(offers, pwn_deed=None, multicall=None, block=None):
+    # revoked offers are left out - their lender reads as the zero address
+    pwn_deed = pwn_deed or PWNDeed[-1]
+    names = ("getDeedID", "getLender", "getOfferLoan", "toBePaid")
+    calls = [(pwn_deed, name, (offer,)) for offer in offers for name in names]
+    values, block = aggregate(calls, multicall, block=block)
+
+    records = {}
+    for index, offer in enumerate(offers):
+        did, lender, loan, to_be_paid = values[
+            index * len(names) : (index + 1) * len(names)
+        ]
+        if lender is not None and lender != ZERO_ADDRESS:
+            records[offer] = Offer(offer, did, lender, _asset(loan), to_be_paid)
+    return records, block
+
+
+def get_deeds(dids, pwn_deed=None, multicall=None):
+    pwn_deed = pwn_deed or PWNDeed[-1]
+    multicall = multicall or get_multicall()
+    names = (
+        "getDeedStatus",
+        "getBorrower",
+        "getDuration",
+        "getExpiration",
+        "getDeedCollateral",
+        "getAcceptedOffer",
+        "getOffers",
+    )
+    calls = [(pwn_deed, name, (did,)) for did in dids for name in names]
+    values, block = aggregate(calls, multicall)
+
+    deeds = []
+    for index, did in enumerate(dids):
+        deeds.append(values[index * len(names) : (index + 1) * len(names)])
+
+    # second round - all offers referenced by the deeds, read at the same block
+    offer_hashes = []
+    for *_, accepted_offer, pending_offers in deeds:
+        if accepted_offer != ZERO_HASH:
+            offer_hashes.append(accepted_offer)
+        offer_hashes.extend(pending_offers)
+    offers, _ = get_offers(
+        list(dict.fromkeys(offer_hashes)), pwn_deed, multicall, block
+    )
+
+    records = []
+    for did, deed in zip(dids, deeds):
+        status, borrower, duration, expiration, collateral, accepted, pending = deed
+        related = [accepted] if accepted != ZERO_HASH else pending
+        records.append(
+            Deed(
+                did,
+                status,
+                borrower,
+                duration,
+                expiration,
+                _asset(collateral),
+                accepted,
+                [offers[offer] for offer in related if offer in offers],
+            )
+        )
+    return records
+
+
+# brownie run scripts/pwn_reader.py main
+def main():
+    pwn_deed = PWNDeed[-1]
+    for deed in get_deeds(list(range(1, pwn_deed.id() + 1)), pwn_deed):
+        print(deed)
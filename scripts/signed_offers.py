@@ -0,0 +1,172 @@
+from brownie import PWNDeed, chain, web3
+from eth_account import Account
+from eth_utils import keccak, to_checksum_address
+from hexbytes import HexBytes
+
+
+try:
+    from eth_account.messages import encode_typed_data
+except ImportError:  # eth-account < 0.9
+    from eth_account.messages import encode_structured_data
+
+    def encode_typed_data(full_message):
+        return encode_structured_data(primitive=full_message)
+
+
+# must match the EIP712 constructor arguments & OfferTerms of PWNDeed
+EIP712_NAME = "PWN"
+EIP712_VERSION = "1"
+
+OFFER_FIELDS = [
+    ("lender", "address"),
+    ("did", "uint256"),
+    ("loanAssetAddress", "address"),
+    ("loanAmount", "uint256"),
+    ("toBePaid", "uint256"),
+    ("nonce", "uint256"),
+    ("deadline", "uint256"),
+]
+
+OFFER_TYPES = {
+    "EIP712Domain": [
+        {"name": "name", "type": "string"},
+        {"name": "version", "type": "string"},
+        {"name": "chainId", "type": "uint256"},
+        {"name": "verifyingContract", "type": "address"},
+    ],
+    "Offer": [{"name": name, "type": type_} for name, type_ in OFFER_FIELDS],
+}
+
+# EIP-2612 - the version OpenZeppelin's ERC20Permit signs with
+PERMIT_VERSION = "1"
+PERMIT_TTL = 3600
+
+PERMIT_TYPES = {
+    "EIP712Domain": OFFER_TYPES["EIP712Domain"],
+    "Permit": [
+        {"name": "owner", "type": "address"},
+        {"name": "spender", "type": "address"},
+        {"name": "value", "type": "uint256"},
+        {"name": "nonce", "type": "uint256"},
+        {"name": "deadline", "type": "uint256"},
+    ],
+}
+
+
+def domain(pwn_deed=None):
+    pwn_deed = pwn_deed or PWNDeed[-1]
+    return {
+        "name": EIP712_NAME,
+        "version": EIP712_VERSION,
+        "chainId": chain.id,
+        "verifyingContract": pwn_deed.address,
+    }
+
+
+def offer_terms(lender, deed_id, asset_address, amount, to_be_paid, nonce, deadline):
+    # a signed offer is never stored before it's accepted, the lender picks a nonce
+    # (see `next_nonce`) & a deadline after which the signature is worthless
+    return {
+        "lender": to_checksum_address(str(lender)),
+        "did": deed_id,
+        "loanAssetAddress": to_checksum_address(str(asset_address)),
+        "loanAmount": amount,
+        "toBePaid": to_be_paid,
+        "nonce": nonce,
+        "deadline": deadline,
+    }
+
+
+def typed_data(terms, pwn_deed=None):
+    return {
+        "types": OFFER_TYPES,
+        "primaryType": "Offer",
+        "domain": domain(pwn_deed),
+        "message": terms,
+    }
+
+
+def terms_tuple(terms):
+    # PWNDeed.OfferTerms as a contract call argument
+    return tuple(terms[name] for name, _ in OFFER_FIELDS)
+
+
+def offer_hash(terms, pwn_deed=None):
+    # same as PWNDeed.getSignedOfferHash - the offer is stored under it once accepted
+    message = encode_typed_data(full_message=typed_data(terms, pwn_deed))
+    return keccak(b"\x19" + message.version + message.header + message.body)
+
+
+def sign_typed_data(data, signer):
+    # local accounts sign in process, unlocked node accounts through eth_signTypedData_v4
+    private_key = getattr(signer, "private_key", None)
+    if private_key:
+        signed = Account.sign_message(encode_typed_data(full_message=data), private_key)
+        return signed.signature
+
+    signature = web3.provider.make_request("eth_signTypedData_v4", [str(signer), data])[
+        "result"
+    ]
+    return signature
+
+
+def sign_offer(terms, lender, pwn_deed=None):
+    return sign_typed_data(typed_data(terms, pwn_deed), lender)
+
+
+def sign_permit(token, owner, spender, value, deadline=None):
+    # EIP-2612 permit of `token` as PWN.Permit - (value, deadline, v, r, s)
+    deadline = chain.time() + PERMIT_TTL if deadline is None else deadline
+    data = {
+        "types": PERMIT_TYPES,
+        "primaryType": "Permit",
+        "domain": {
+            "name": token.name(),
+            "version": PERMIT_VERSION,
+            "chainId": chain.id,
+            "verifyingContract": token.address,
+        },
+        "message": {
+            "owner": to_checksum_address(str(owner)),
+            "spender": to_checksum_address(str(spender)),
+            "value": value,
+            "nonce": token.nonces(owner),
+            "deadline": deadline,
+        },
+    }
+    signature = bytes(HexBytes(sign_typed_data(data, owner)))
+    v = signature[64] if signature[64] >= 27 else signature[64] + 27
+    return (value, deadline, v, signature[:32], signature[32:64])
+
+
+def recover_signer(terms, signature, pwn_deed=None):
+    message = encode_typed_data(full_message=typed_data(terms, pwn_deed))
+    return Account.recover_message(message, signature=signature)
+
+
+def verify_offer(terms, signature, pwn_deed=None):
+    # checks a borrower can do before paying for `acceptSignedOffer`, the lender's
+    # balance & allowance are up to the caller
+    pwn_deed = pwn_deed or PWNDeed[-1]
+    if recover_signer(terms, signature, pwn_deed) != terms["lender"]:
+        return False, "Invalid offer signature"
+    if pwn_deed.isOfferNonceUsed(terms["lender"], terms["nonce"]):
+        return False, "Offer nonce already used"
+    if terms["deadline"] < chain[-1].timestamp:
+        return False, "Offer expired"
+    return True, None
+
+
+def next_nonce(lender, start=0, pwn_deed=None):
+    # lowest nonce from `start` the lender hasn't used nor revoked yet
+    # one call per 256 nonces, full words are skipped
+    pwn_deed = pwn_deed or PWNDeed[-1]
+    word_pos, bit = start >> 8, start & 0xFF
+    while True:
+        word = pwn_deed.offerNonceBitmap(lender, word_pos) >> bit
+        if word != (1 << (256 - bit)) - 1:
+            while word & 1:
+                word >>= 1
+                bit += 1
+            return (word_pos << 8) + bit
+        word_pos, bit = word_pos + 1, 0
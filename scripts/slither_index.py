@@ -0,0 +1,237 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+
+
+DEFAULT_REPORT_PATH = os.path.join("slither", "results.txt")
+DEFAULT_INDEX_PATH = os.path.join("slither", "index.sqlite")
+# bump whenever the record layout changes, older JSON indexes are then rejected
+INDEX_VERSION = 1
+
+REFERENCE_PREFIX = "Reference: "
+# `(slither/pwn_contracts/contracts/PWNDeed.sol#247-266)`
+SOURCE_REF = re.compile(r"\(([^\s()]+\.sol)#(\d+)(?:-(\d+))?\)")
+# `PWNDeed.acceptOffer(uint256,bytes32,address)._owner`, `PWNDeed.PWN`
+ELEMENT = re.compile(r"^([A-Za-z_]\w*)\.([A-Za-z_]\w*)(\([^)]*\))?")
+CONTRACT = re.compile(r"^[A-Z]\w*$")
+
+FIELDS = (
+    "fingerprint",
+    "detector",
+    "contract",
+    "function",
+    "element",
+    "file",
+    "line_start",
+    "line_end",
+    "description",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS findings (
+    fingerprint TEXT PRIMARY KEY,
+    detector TEXT NOT NULL,
+    contract TEXT,
+    function TEXT,
+    element TEXT,
+    file TEXT,
+    line_start INTEGER,
+    line_end INTEGER,
+    description TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS findings_by_detector ON findings (detector);
+CREATE INDEX IF NOT EXISTS findings_by_contract ON findings (contract, function);
+CREATE INDEX IF NOT EXISTS findings_by_line ON findings (file, line_start);
+"""
+
+
+def _fingerprint(detector, description, seen):
+    # line numbers move with every unrelated edit, the fingerprint ignores them so a
+    # finding keeps its identity between runs as long as its text stays the same
+    text = SOURCE_REF.sub(lambda match: f"({match.group(1)})", description)
+    digest = hashlib.sha1(f"{detector}\0{text}".encode()).hexdigest()[:16]
+    # identical findings (e.g. the same reentrancy reported twice) stay distinct
+    seen[digest] = seen.get(digest, 0) + 1
+    return digest if seen[digest] == 1 else f"{digest}-{seen[digest]}"
+
+
+def _record(detector, lines, seen):
+    description = "\n".join(lines)
+    # the first source reference is the subject of the finding, the header line of
+    # some detectors (pragma versions, external functions) has none
+    match = SOURCE_REF.search(description)
+    element = contract = function = file = line_start = line_end = None
+    if match:
+        element = description[: match.start()].split()[-1].strip("'") or None
+        file = match.group(1)
+        line_start = int(match.group(2))
+        line_end = int(match.group(3) or match.group(2))
+
+    member = ELEMENT.match(element or "")
+    if member:
+        contract = member.group(1)
+        if member.group(3) is not None:
+            function = member.group(2) + member.group(3)
+    elif element and CONTRACT.match(element):
+        contract = element
+
+    return {
+        "fingerprint": _fingerprint(detector, description, seen),
+        "detector": detector,
+        "contract": contract,
+        "function": function,
+        "element": element,
+        "file": file,
+        "line_start": line_start,
+        "line_end": line_end,
+        "description": description,
+    }
+
+
+def iter_findings(lines):
+    # streams findings out of a slither text report - findings are top level lines with
+    # indented continuations, every group of them ends with the `Reference:` of its detector
+    # only the current group is held in memory
+    group = []
+    current = None
+    seen = {}
+    for line in lines:
+        line = line.rstrip("\n").rstrip()
+        if not line:
+            continue
+        if line.startswith(REFERENCE_PREFIX):
+            if current:
+                group.append(current)
+            detector = line.rsplit("#", 1)[-1]
+            for finding in group:
+                yield _record(detector, finding, seen)
+            group, current = [], None
+        elif line[0].isspace():
+            if current is not None:
+                current.append(line)
+        else:
+            if current:
+                group.append(current)
+            current = [line]
+
+
+def parse_report(path=DEFAULT_REPORT_PATH):
+    with open(path) as f:
+        yield from iter_findings(f)
+
+
+def _is_sqlite(path):
+    return os.path.splitext(path)[1] in (".sqlite", ".db")
+
+
+def save_index(findings, path=DEFAULT_INDEX_PATH):
+    # `.sqlite`/`.db` paths get a queryable database, anything else a JSON file
+    if _is_sqlite(path):
+        db = sqlite3.connect(path)
+        with db:
+            db.executescript(SCHEMA)
+            db.execute("DELETE FROM findings")
+            db.executemany(
+                f"INSERT INTO findings ({', '.join(FIELDS)})"
+                f" VALUES ({', '.join('?' * len(FIELDS))})",
+                (tuple(finding[field] for field in FIELDS) for finding in findings),
+            )
+        db.close()
+        return
+
+    with open(path, "w") as f:
+        json.dump({"version": INDEX_VERSION, "findings": list(findings)}, f, indent=2)
+        f.write("\n")
+
+
+def load_findings(path):
+    # a raw report, a JSON index or a SQLite index - whichever `path` points to
+    if path.endswith(".txt"):
+        return list(parse_report(path))
+
+    if _is_sqlite(path):
+        db = sqlite3.connect(path)
+        db.row_factory = sqlite3.Row
+        rows = db.execute(f"SELECT {', '.join(FIELDS)} FROM findings").fetchall()
+        db.close()
+        return [dict(row) for row in rows]
+
+    with open(path) as f:
+        index = json.load(f)
+    if index.get("version") != INDEX_VERSION:
+        raise ValueError(
+            f"Index {path} has version {index.get('version')}, expected "
+            f"{INDEX_VERSION} - rebuild it from the report"
+        )
+    return index["findings"]
+
+
+def query(path=DEFAULT_INDEX_PATH, detector=None, contract=None, function=None):
+    # findings of a SQLite index narrowed down by any of the keys, in source order
+    clauses, params = [], []
+    for column, value in (
+        ("detector", detector),
+        ("contract", contract),
+        ("function", function),
+    ):
+        if value is not None:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    rows = db.execute(
+        f"SELECT {', '.join(FIELDS)} FROM findings{where} ORDER BY file, line_start",
+        params,
+    ).fetchall()
+    db.close()
+    return [dict(row) for row in rows]
+
+
+def diff(old, new):
+    # findings of `new` missing in `old` & the other way around, matched by fingerprint
+    old_keys = {finding["fingerprint"] for finding in old}
+    new_keys = {finding["fingerprint"] for finding in new}
+    added = [finding for finding in new if finding["fingerprint"] not in old_keys]
+    removed = [finding for finding in old if finding["fingerprint"] not in new_keys]
+    return added, removed
+
+
+def _print_findings(findings, marker):
+    for finding in sorted(
+        findings, key=lambda finding: (finding["detector"], finding["file"] or "")
+    ):
+        header = finding["description"].splitlines()[0]
+        print(f"{marker} [{finding['detector']}] {header}")
+
+
+# brownie run scripts/slither_index.py main index [report] [index]
+# brownie run scripts/slither_index.py main diff <old> <new>
+# old & new are reports (.txt) or indexes (.json/.sqlite), `diff` fails on new findings
+def main(command="index", *paths):
+    if command == "index":
+        report = paths[0] if paths else DEFAULT_REPORT_PATH
+        index = paths[1] if len(paths) > 1 else DEFAULT_INDEX_PATH
+        findings = list(parse_report(report))
+        save_index(findings, index)
+        print(f"Indexed {len(findings)} findings of {report} to {index}")
+        return
+
+    if command == "diff":
+        added, removed = diff(load_findings(paths[0]), load_findings(paths[1]))
+        _print_findings(removed, "-")
+        _print_findings(added, "+")
+        print(f"{len(added)} new, {len(removed)} resolved findings")
+        if added:
+            raise SystemExit(1)
+        return
+
+    raise ValueError(f"Unknown command {command}, expected `index` or `diff`")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
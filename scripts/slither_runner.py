@@ -0,0 +1,185 @@
+import glob
+import hashlib
+import os
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+import yaml
+from scripts.slither_index import iter_findings, DEFAULT_REPORT_PATH
+from scripts.artifact_cache import packages_folder, vendored_package
+
+
+CONFIG_PATH = "brownie-config.yaml"
+CACHE_DIR = os.path.join("slither", ".cache")
+DEFAULT_TARGETS = os.path.join("contracts", "*.sol")
+REFERENCE_URL = "https://github.com/crytic/slither/wiki/Detector-Documentation#"
+
+# `import "./PWNVault.sol";`, `import {ECDSA} from "@openzeppelin/...";`
+IMPORT = re.compile(r"""^\s*import\s+(?:[^"';]*\s+from\s+)?["']([^"']+)["']""", re.M)
+
+
+def load_remappings(config_path=CONFIG_PATH):
+    # prefix -> directory, brownie's package folder first, then the vendored copy
+    # (`PWNFinance/MultiToken@1.0.3` -> slither/MultiToken, see scripts/artifact_cache.py)
+    with open(config_path) as f:
+        config = yaml.safe_load(f)
+    remappings = {}
+    for remapping in config["compiler"]["solc"].get("remappings", []):
+        prefix, package = remapping.split("=", 1)
+        installed = os.path.join(packages_folder(), package)
+        remappings[prefix] = (
+            installed if os.path.isdir(installed) else vendored_package(package)
+        ) or installed
+    return remappings
+
+
+def resolve_import(path, source_file, remappings):
+    if path.startswith("."):
+        return os.path.normpath(os.path.join(os.path.dirname(source_file), path))
+    for prefix, directory in remappings.items():
+        if path.startswith(prefix + "/"):
+            return os.path.normpath(os.path.join(directory, path[len(prefix) + 1 :]))
+    return os.path.normpath(path)
+
+
+class ClosureHasher:
+    # file contents are read & hashed once per run however many closures share them
+
+    def __init__(self, remappings):
+        self.remappings = remappings
+        self.file_hashes = {}
+        self.imports = {}
+
+    def _read(self, path):
+        if path not in self.file_hashes:
+            if not os.path.exists(path):
+                # dependency not installed yet, slither itself reports it
+                self.file_hashes[path], self.imports[path] = "missing", []
+                return []
+            with open(path, "rb") as f:
+                source = f.read()
+            self.file_hashes[path] = hashlib.sha256(source).hexdigest()
+            self.imports[path] = [
+                resolve_import(imported, path, self.remappings)
+                for imported in IMPORT.findall(source.decode("utf-8", "replace"))
+            ]
+        return self.imports[path]
+
+    def closure(self, target):
+        closure, stack = set(), [os.path.normpath(target)]
+        while stack:
+            path = stack.pop()
+            if path in closure:
+                continue
+            closure.add(path)
+            stack.extend(self._read(path))
+        return sorted(closure)
+
+    def closure_hash(self, target, salt=""):
+        digest = hashlib.sha256(salt.encode())
+        for path in self.closure(target):
+            digest.update(f"{path}\0{self.file_hashes[path]}\n".encode())
+        return digest.hexdigest()
+
+
+def slither_version():
+    return subprocess.run(
+        ["slither", "--version"], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+
+def run_slither(target, remappings, extra_args=()):
+    # slither prints the detector results to stderr & exits non-zero when it found any,
+    # a run counts as failed only when it didn't get to the summary line
+    remaps = " ".join(f"{prefix}={path}" for prefix, path in remappings.items())
+    process = subprocess.run(
+        ["slither", target, "--solc-remaps", remaps, "--disable-color", *extra_args],
+        capture_output=True,
+        text=True,
+    )
+    output = process.stdout + process.stderr
+    if process.returncode != 0 and " analyzed (" not in output:
+        raise RuntimeError(f"Slither failed on {target}:\n{output}")
+    return "\n".join(
+        line for line in output.splitlines() if not line.startswith("INFO:")
+    )
+
+
+def merge_reports(reports):
+    # one group per detector in order of first appearance, findings reported by several
+    # targets (shared imports) are kept once - the same layout as slither/results.txt
+    groups = {}
+    for report in reports:
+        for finding in iter_findings(report.splitlines()):
+            group = groups.setdefault(finding["detector"], {})
+            group.setdefault(finding["description"], None)
+
+    lines = []
+    for detector, descriptions in groups.items():
+        lines.extend(descriptions)
+        lines.append(f"Reference: {REFERENCE_URL}{detector}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def analyse(
+    targets,
+    cache_dir=CACHE_DIR,
+    workers=None,
+    config_path=CONFIG_PATH,
+    extra_args=(),
+    prune=True,
+):
+    # re-runs slither only for the targets whose import closure changed since the cached
+    # run, returns the per-target reports & the number of targets actually analysed
+    remappings = load_remappings(config_path)
+    hasher = ClosureHasher(remappings)
+    salt = "\0".join([slither_version(), *sorted(remappings), *extra_args])
+    os.makedirs(cache_dir, exist_ok=True)
+
+    cache_paths = {
+        target: os.path.join(cache_dir, hasher.closure_hash(target, salt) + ".txt")
+        for target in targets
+    }
+    stale = [target for target, path in cache_paths.items() if not os.path.exists(path)]
+
+    # every analysis is a separate slither process, the pool threads only wait on them
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        outputs = pool.map(
+            lambda target: run_slither(target, remappings, extra_args), stale
+        )
+        for target, output in zip(stale, outputs):
+            with open(cache_paths[target], "w") as f:
+                f.write(output)
+
+    # entries of closures which no longer exist would only pile up, a run over a subset
+    # of the contracts keeps the entries of the others
+    current = set(cache_paths.values())
+    for path in glob.glob(os.path.join(cache_dir, "*.txt")) if prune else ():
+        if path not in current:
+            os.remove(path)
+
+    reports = {}
+    for target, path in cache_paths.items():
+        with open(path) as f:
+            reports[target] = f.read()
+    return reports, len(stale)
+
+
+# brownie run scripts/slither_runner.py main [out] [workers] [targets...]
+# or python -m scripts.slither_runner [out] [workers] [targets...]
+def main(out=DEFAULT_REPORT_PATH, workers=0, *targets):
+    prune = not targets
+    targets = sorted(targets or glob.glob(DEFAULT_TARGETS))
+    reports, analysed = analyse(targets, workers=int(workers) or None, prune=prune)
+    with open(out, "w") as f:
+        f.write(merge_reports(reports[target] for target in targets))
+    print(
+        f"Analysed {analysed} of {len(targets)} contracts, "
+        f"{len(targets) - analysed} from cache - report written to {out}"
+    )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,36 @@
+from brownie import PWNDeed, chain
+
+
+# return values of PWNDeed.getDeedStatus
+DEED_DEAD = 0
+DEED_OPEN = 1
+DEED_RUNNING = 2
+DEED_PAID_BACK = 3
+DEED_EXPIRED = 4
+
+
+def mine_at(timestamp):
+    # the mined block carries exactly `timestamp`, following transactions
+    # are stamped relative to it
+    if timestamp < chain[-1].timestamp:
+        raise ValueError(
+            f"Can't travel back in time to {timestamp}, last block is at {chain[-1].timestamp}"
+        )
+    chain.mine(timestamp=timestamp)
+    return timestamp
+
+
+def travel_to_expiration(deed_id, offset=0, pwn_deed=None):
+    # mines a block at `getExpiration(deed_id) + offset`
+    # offset <= 0 keeps a running deed running, offset > 0 expires it
+    pwn_deed = pwn_deed or PWNDeed[-1]
+    expiration = pwn_deed.getExpiration(deed_id)
+    if expiration == 0:
+        raise ValueError(f"Deed {deed_id} has no accepted offer, it has no expiration")
+
+    return mine_at(expiration + offset)
+
+
+def expire_deed(deed_id, pwn_deed=None):
+    # Deed is expired once `expiration < block.timestamp`
+    return travel_to_expiration(deed_id, 1, pwn_deed)
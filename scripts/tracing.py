@@ -0,0 +1,249 @@
+import glob
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from brownie import web3
+from brownie.network import account, contract, transaction
+
+
+# opt-in: `PWN_TRACE=trace.json brownie test` or `PWN_TRACE=trace.json brownie run ...`
+# the file opens in chrome://tracing or https://ui.perfetto.dev
+TRACE_ENV = "PWN_TRACE"
+
+_enabled = False
+_origin = time.perf_counter()
+_local = threading.local()
+_events = []
+_counted_txs = set()
+
+
+def is_enabled():
+    return _enabled
+
+
+def _stack():
+    # spans of background threads (brownie's confirmation watchers) aren't recorded
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _count_rpc_calls():
+    # every JSON-RPC request of the current provider is counted towards the innermost span
+    provider = web3.provider
+    if provider is None or getattr(provider, "_pwn_traced", False):
+        return
+    make_request = provider.make_request
+
+    def counted(method, params):
+        stack = _stack()
+        if stack:
+            stack[-1]["rpc"] += 1
+        return make_request(method, params)
+
+    provider.make_request = counted
+    provider._pwn_traced = True
+
+
+def _add_gas(tx):
+    # a transaction is counted once, when it's first seen confirmed - pipelined ones are
+    # still pending when sent, their gas then goes to the span that waited for them
+    stack = _stack()
+    if not stack or tx is None or getattr(tx, "txid", None) in _counted_txs:
+        return
+    if tx.status == -1 or tx.gas_used is None:
+        return
+    _counted_txs.add(tx.txid)
+    stack[-1]["gas"] += tx.gas_used
+
+
+@contextmanager
+def span(name, category="helper"):
+    # wall time, RPC requests, gas & block wait time of the enclosed code, the figures of
+    # nested spans are included in the enclosing ones
+    if not _enabled:
+        yield None
+        return
+
+    _count_rpc_calls()
+    stack = _stack()
+    record = {"rpc": 0, "gas": 0, "wait": 0.0}
+    stack.append(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        duration = time.perf_counter() - start
+        stack.pop()
+        if category == "wait":
+            record["wait"] = duration
+        if stack:
+            for key in record:
+                stack[-1][key] += record[key]
+        _events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - _origin) * 1e6,
+                "dur": duration * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": dict(record, wait=round(record["wait"], 6)),
+            }
+        )
+
+
+def traced(fn):
+    # for the lifecycle helpers, free when tracing is off
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return fn(*args, **kwargs)
+        with span(fn.__name__):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def _patch(cls, name, make_wrapper):
+    original = getattr(cls, name, None)
+    if original is not None:
+        setattr(cls, name, make_wrapper(original))
+
+
+def _trace_transact(transact):
+    @wraps(transact)
+    def wrapper(self, *args, **kwargs):
+        with span(self._name, "transact"):
+            tx = transact(self, *args, **kwargs)
+            _add_gas(tx)
+            return tx
+
+    return wrapper
+
+
+def _trace_call(call):
+    @wraps(call)
+    def wrapper(self, *args, **kwargs):
+        with span(self._name, "call"):
+            return call(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _trace_deploy(deploy):
+    @wraps(deploy)
+    def wrapper(self, *args, **kwargs):
+        with span(f"{self._name}.deploy", "deploy"):
+            deployed = deploy(self, *args, **kwargs)
+            _add_gas(getattr(deployed, "tx", deployed))
+            return deployed
+
+    return wrapper
+
+
+def _trace_wait(wait):
+    @wraps(wait)
+    def wrapper(self, *args, **kwargs):
+        with span("wait", "wait"):
+            result = wait(self, *args, **kwargs)
+            _add_gas(result if hasattr(result, "txid") else self)
+            return result
+
+    return wrapper
+
+
+def _trace_events(events):
+    # brownie decodes the logs on the first access only
+    @wraps(events.fget)
+    def getter(self):
+        if self._events is not None:
+            return events.fget(self)
+        with span("events", "decode"):
+            return events.fget(self)
+
+    return property(getter)
+
+
+def enable():
+    # wraps brownie's contract calls, transactions, deployments, confirmation waits &
+    # event decoding - idempotent
+    global _enabled
+    if _enabled:
+        return
+    _enabled = True
+    _patch(contract._ContractMethod, "transact", _trace_transact)
+    _patch(contract._ContractMethod, "call", _trace_call)
+    _patch(contract.ContractConstructor, "__call__", _trace_deploy)
+    _patch(transaction.TransactionReceipt, "wait", _trace_wait)
+    # transactions sent the usual way are awaited inside `transact`
+    _patch(account._PrivateKeyAccount, "_await_confirmation", _trace_wait)
+    _patch(transaction.TransactionReceipt, "events", _trace_events)
+
+
+def summary(events=None):
+    # per span name: calls, total wall time (ms), RPC requests, gas & block wait time (ms)
+    rows = {}
+    for event in _events if events is None else events:
+        row = rows.setdefault(
+            (event["cat"], event["name"]),
+            {"calls": 0, "ms": 0.0, "rpc": 0, "gas": 0, "wait_ms": 0.0},
+        )
+        row["calls"] += 1
+        row["ms"] += event["dur"] / 1000
+        row["rpc"] += event["args"]["rpc"]
+        row["gas"] += event["args"]["gas"]
+        row["wait_ms"] += event["args"]["wait"] * 1000
+    return sorted(rows.items(), key=lambda item: -item[1]["ms"])
+
+
+def format_summary(rows):
+    lines = [
+        f"{'span':<44}{'kind':<10}{'calls':>7}{'total ms':>11}{'avg ms':>9}"
+        f"{'rpc':>7}{'gas':>12}{'wait ms':>10}"
+    ]
+    for (category, name), row in rows:
+        lines.append(
+            f"{name:<44}{category:<10}{row['calls']:>7}{row['ms']:>11.1f}"
+            f"{row['ms'] / row['calls']:>9.2f}{row['rpc']:>7}{row['gas']:>12}"
+            f"{row['wait_ms']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def _worker_path(path, worker):
+    root, ext = os.path.splitext(path)
+    return f"{root}.{worker}{ext or '.json'}"
+
+
+def save(path=None):
+    # xdist workers write next to `path`, the master merges their files into it
+    path = path or os.environ[TRACE_ENV]
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    events = list(_events)
+    if worker:
+        path = _worker_path(path, worker)
+    else:
+        for worker_path in glob.glob(_worker_path(path, "gw*")):
+            with open(worker_path) as f:
+                events.extend(json.load(f)["traceEvents"])
+            os.remove(worker_path)
+
+    with open(path, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    return events
+
+
+def report(path=None):
+    # saves the trace & returns the summary table, None when tracing is off
+    if not _enabled:
+        return None
+    return format_summary(summary(save(path)))
+
+
+if os.environ.get(TRACE_ENV):
+    enable()
@@ -0,0 +1,97 @@
+from contextlib import contextmanager
+from brownie import network, config
+
+
+DEFAULT_CONFIRMATIONS = 1
+
+_depth = 0  # pipelined blocks entered & not exited yet
+_pending = []
+_nonces = {}
+
+
+def _network_settings():
+    return config["networks"].get(network.show_active(), {}) or {}
+
+
+def required_confirmations():
+    return _network_settings().get("confirmations", DEFAULT_CONFIRMATIONS)
+
+
+def is_pipelined():
+    return _depth > 0
+
+
+def tx_params(account):
+    # outside of a pipeline the transaction is sent the usual way,
+    # inside one it is broadcast without waiting, with a locally tracked nonce
+    if not _depth:
+        return {"from": account}
+
+    if account.address not in _nonces:
+        _nonces[account.address] = account.nonce
+    params = {
+        "from": account,
+        "nonce": _nonces[account.address],
+        "required_confs": 0,
+    }
+    _nonces[account.address] += 1
+
+    # a transaction depending on a not yet mined one can't be gas estimated
+    gas_limit = _network_settings().get("pipeline_gas_limit")
+    if gas_limit:
+        params["gas_limit"] = gas_limit
+    return params
+
+
+def confirm(tx):
+    # inside a pipeline the receipt is collected later by `sync`
+    if _depth:
+        _pending.append(tx)
+    else:
+        tx.wait(required_confirmations())
+    return tx
+
+
+def receipt(tx):
+    # for callers that need the events of the transaction right away
+    tx.wait(max(required_confirmations(), 1))
+    return tx
+
+
+def sync():
+    confirmations = max(required_confirmations(), 1)
+    txs = list(_pending)
+    _pending.clear()
+
+    for tx in txs:
+        tx.wait(confirmations)
+
+    failed = [tx for tx in txs if tx.status != 1]
+    if failed:
+        raise RuntimeError(
+            f"{len(failed)} of {len(txs)} pipelined transactions failed: "
+            + ", ".join(tx.txid for tx in failed)
+        )
+    return txs
+
+
+@contextmanager
+def pipelined():
+    # transactions sent inside the block are awaited in bulk when it exits,
+    # call `sync()` in between wherever a transaction depends on another account's one
+    # a nested block joins the outer one, which awaits the transactions of both
+    global _depth
+    _depth += 1
+    try:
+        yield
+    except BaseException:
+        if _depth == 1:
+            # the error of the block is raised as is, its transactions aren't awaited
+            _pending.clear()
+        raise
+    finally:
+        _depth -= 1
+        if not _depth:
+            _nonces.clear()
+    if not _depth:
+        sync()
@@ -0,0 +1,262 @@
+import json
+import os
+import time
+from dataclasses import dataclass
+from brownie import Contract, PWNVault, web3
+from scripts.helpful_scripts import fetch_events
+from scripts.pwn_reader import aggregate, get_multicall
+
+
+DEFAULT_CHECKPOINT_PATH = "vault_checkpoint.json"
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_CHECK_INTERVAL = 100
+
+# MultiToken.Category
+ERC20 = 0
+ERC721 = 1
+ERC1155 = 2
+
+BALANCE_ABIS = {
+    ERC20: [
+        {
+            "name": "balanceOf",
+            "type": "function",
+            "stateMutability": "view",
+            "inputs": [{"name": "account", "type": "address"}],
+            "outputs": [{"name": "", "type": "uint256"}],
+        }
+    ],
+    ERC721: [
+        {
+            "name": "ownerOf",
+            "type": "function",
+            "stateMutability": "view",
+            "inputs": [{"name": "tokenId", "type": "uint256"}],
+            "outputs": [{"name": "", "type": "address"}],
+        }
+    ],
+    ERC1155: [
+        {
+            "name": "balanceOf",
+            "type": "function",
+            "stateMutability": "view",
+            "inputs": [
+                {"name": "account", "type": "address"},
+                {"name": "id", "type": "uint256"},
+            ],
+            "outputs": [{"name": "", "type": "uint256"}],
+        }
+    ],
+}
+
+
+@dataclass(frozen=True)
+class Drift:
+    block: int
+    asset_address: str
+    category: int
+    id: int
+    expected: int
+    # None when the balance couldn't be read (the call reverted)
+    actual: int
+
+    @property
+    def difference(self):
+        return None if self.actual is None else self.actual - self.expected
+
+
+def asset_key(asset):
+    # the id of an ERC20 asset means nothing, the amount of an ERC721 one neither
+    asset_address, category, amount, asset_id = asset
+    return (asset_address, category, 0 if category == ERC20 else asset_id)
+
+
+def asset_units(asset):
+    # what MultiToken actually transfers - ERC721 is always one token, ERC1155 amount 0 is 1
+    _, category, amount, _ = asset
+    if category == ERC721:
+        return 1
+    if category == ERC1155:
+        return amount or 1
+    return amount
+
+
+# what PWNVault should hold, kept up to date from its events alone
+# `VaultPush` adds to the expected balance of the asset, `VaultPull` subtracts & `VaultProxy`
+# passes the vault by - the balances left are the collateral of open & running deeds plus the
+# repaid loans not claimed yet
+# every `check_interval` blocks the expected balances are compared against the real ones,
+# read in multicall batches at that block - a check costs one read per held asset however
+# long the history is
+class VaultReconciler:
+    def __init__(
+        self,
+        pwn_vault=None,
+        multicall=None,
+        start_block=0,
+        check_interval=DEFAULT_CHECK_INTERVAL,
+        batch_size=DEFAULT_BATCH_SIZE,
+    ):
+        self.pwn_vault = pwn_vault or PWNVault[-1]
+        self.multicall = multicall
+        self.check_interval = check_interval
+        self.batch_size = batch_size
+        self.block = start_block - 1  # the last block applied
+        self.expected = {}  # (asset address, category, id) -> units
+        self.checked_block = None
+        self._tokens = {}
+
+    @classmethod
+    def load(cls, path=DEFAULT_CHECKPOINT_PATH, pwn_vault=None, **kwargs):
+        # a missing checkpoint starts from `start_block`, a checkpoint of another vault fails
+        reconciler = cls(pwn_vault, **kwargs)
+        if not os.path.exists(path):
+            return reconciler
+        with open(path) as f:
+            checkpoint = json.load(f)
+        if checkpoint["vault"] != reconciler.pwn_vault.address:
+            raise ValueError(
+                f"Checkpoint {path} belongs to vault {checkpoint['vault']}, "
+                f"not {reconciler.pwn_vault.address}"
+            )
+        reconciler.block = checkpoint["block"]
+        reconciler.checked_block = checkpoint["checked_block"]
+        # uint256 values are stored as text, JSON numbers aren't safe past 2**53
+        reconciler.expected = {
+            (asset_address, category, int(asset_id)): int(units)
+            for asset_address, category, asset_id, units in checkpoint["expected"]
+        }
+        return reconciler
+
+    def save(self, path=DEFAULT_CHECKPOINT_PATH):
+        checkpoint = {
+            "vault": self.pwn_vault.address,
+            "block": self.block,
+            "checked_block": self.checked_block,
+            "expected": [
+                [asset_address, category, str(asset_id), str(units)]
+                for (asset_address, category, asset_id), units in self.expected.items()
+            ],
+        }
+        # an interrupted save leaves the previous checkpoint intact
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, path)
+
+    def apply_event(self, name, args):
+        if name == "VaultPush":
+            sign = 1
+        elif name == "VaultPull":
+            sign = -1
+        else:
+            return
+        key = asset_key(args["asset"])
+        # an asset drained to zero stays until the next check confirms the vault let it go
+        self.expected[key] = self.expected.get(key, 0) + sign * asset_units(
+            args["asset"]
+        )
+
+    def sync(self, to_block=None):
+        # applies the vault events from the last applied block up to `to_block` (default:
+        # head), checking at every multiple of `check_interval` on the way
+        # returns the drift found by those checks
+        head = web3.eth.block_number
+        to_block = head if to_block is None else to_block
+        drifts = []
+        from_block = self.block + 1
+        while from_block <= to_block:
+            next_check = (from_block // self.check_interval + 1) * self.check_interval
+            batch_end = min(from_block + self.batch_size - 1, to_block, next_check)
+            for event in fetch_events([self.pwn_vault], from_block, batch_end):
+                self.apply_event(event.event, event.args)
+            self.block = batch_end
+            # a catch up checks only the last interval, the balances of older blocks
+            # would need an archive node
+            if batch_end == next_check and batch_end > head - self.check_interval:
+                drifts.extend(self.check())
+            from_block = batch_end + 1
+        return drifts
+
+    def check(self):
+        # compares the expected balances with the vault's balances at the last applied block
+        block = self.block
+        keys = list(self.expected)
+        values, _ = aggregate(
+            [self._balance_call(key) for key in keys],
+            self.multicall or get_multicall(),
+            block=block,
+        )
+
+        drifts = []
+        for key, value in zip(keys, values):
+            asset_address, category, asset_id = key
+            actual = value
+            if category == ERC721:
+                actual = None if value is None else int(value == self.pwn_vault.address)
+            if actual != self.expected[key]:
+                drifts.append(
+                    Drift(
+                        block,
+                        asset_address,
+                        category,
+                        asset_id,
+                        self.expected[key],
+                        actual,
+                    )
+                )
+            elif actual == 0:
+                del self.expected[key]
+        self.checked_block = block
+        return drifts
+
+    def follow(self, poll_interval=5, on_drift=None):
+        on_drift = on_drift or print_drifts
+        while True:
+            drifts = self.sync()
+            if drifts:
+                on_drift(drifts)
+            time.sleep(poll_interval)
+
+    def _balance_call(self, key):
+        asset_address, category, asset_id = key
+        if (asset_address, category) not in self._tokens:
+            self._tokens[(asset_address, category)] = Contract.from_abi(
+                "VaultAsset", asset_address, BALANCE_ABIS[category], persist=False
+            )
+        token = self._tokens[(asset_address, category)]
+        if category == ERC20:
+            return (token, "balanceOf", (self.pwn_vault.address,))
+        if category == ERC721:
+            return (token, "ownerOf", (asset_id,))
+        return (token, "balanceOf", (self.pwn_vault.address, asset_id))
+
+
+def print_drifts(drifts):
+    for drift in drifts:
+        actual = "unreadable" if drift.actual is None else drift.actual
+        print(
+            f"Drift at block {drift.block}: {drift.asset_address} (category "
+            f"{drift.category}, id {drift.id}) expected {drift.expected}, actual {actual}"
+        )
+
+
+# brownie run scripts/vault_reconciler.py main [checkpoint path] [check interval]
+# syncs up to the head, checks there & fails on any drift
+def main(
+    checkpoint_path=DEFAULT_CHECKPOINT_PATH, check_interval=DEFAULT_CHECK_INTERVAL
+):
+    reconciler = VaultReconciler.load(
+        checkpoint_path, check_interval=int(check_interval)
+    )
+    drifts = reconciler.sync()
+    if reconciler.checked_block != reconciler.block:
+        drifts.extend(reconciler.check())
+    reconciler.save(checkpoint_path)
+    print_drifts(drifts)
+    print(
+        f"Checked {len(reconciler.expected)} vault assets at block "
+        f"{reconciler.block}, {len(drifts)} drifted"
+    )
+    if drifts:
+        raise SystemExit(1)
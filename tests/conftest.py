@@ -0,0 +1,70 @@
+import os
+from brownie import chain
+from scripts.helpful_scripts import get_account
+from scripts.deploy_pwn import (
+    deploy_pwn,
+    set_PWN_ownership,
+    deploy_testing_tokens,
+    send_token,
+    ERC20_VAL,
+)
+from scripts.tracing import is_enabled as tracing_enabled, save, report, TRACE_ENV
+from scripts.evm_backend import NETWORK_ID as EVM_NETWORK_ID, register as register_evm
+import pytest
+
+
+# `brownie test -n auto` spreads the test modules over xdist workers, every worker
+# launches its own development chain on the configured port + worker id
+# `brownie test --network eth-tester` runs the suite on an in-process EVM instead of
+# ganache, see scripts/evm_backend.py
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    # before brownie's own configure, the xdist workers look up the network's settings
+    if EVM_NETWORK_ID in (config.getoption("network", None) or ()):
+        register_evm()
+
+
+@pytest.fixture(scope="session")
+def base_set_up():
+    # the whole PWN stack and the testing tokens are deployed only once per session - once
+    # per xdist worker, on the worker's own chain - every test then starts from the
+    # snapshot taken in `isolation`
+    PWN_OWNER = get_account(index=0)
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+
+    pwn_deed, pwn_vault, pwn = deploy_pwn(PWN_OWNER)
+    set_PWN_ownership(PWN_OWNER, pwn_deed, pwn_vault, pwn)
+    erc20, erc721, erc721_token_id, erc1155, erc1155_id = deploy_testing_tokens(
+        LENDER, PLEDGER, PLEDGER
+    )
+
+    send_token(PLEDGER, LENDER, 200, erc20, ERC20_VAL)
+    return pwn_deed, pwn_vault, pwn, erc20, erc721, erc721_token_id, erc1155, erc1155_id
+
+
+@pytest.fixture(autouse=True)
+def isolation(base_set_up):
+    # brownie's `fn_isolation` resets the chain per module, which would throw away
+    # the session deployment, so the snapshot is handled here instead
+    chain.snapshot()
+    yield
+    chain.revert()
+
+
+# `PWN_TRACE=trace.json brownie test` traces the helpers & contract calls, see scripts/tracing.py
+
+
+def pytest_sessionfinish(session):
+    # xdist workers leave their spans for the master to merge
+    if tracing_enabled() and os.environ.get("PYTEST_XDIST_WORKER"):
+        save()
+
+
+def pytest_terminal_summary(terminalreporter):
+    if tracing_enabled() and not os.environ.get("PYTEST_XDIST_WORKER"):
+        summary = report()
+        terminalreporter.write_sep("=", f"trace written to {os.environ[TRACE_ENV]}")
+        terminalreporter.write_line(summary)
@@ -0,0 +1,175 @@
+from scripts.helpful_scripts import get_account
+from brownie import chain, exceptions
+from scripts.deploy_pwn import (
+    set_approve,
+    pwn_create_deeds,
+    make_offers,
+    revoke_offers,
+    accept_offer,
+    repay_loan,
+    claim_deeds,
+    ERC1155_VAL,
+    ERC721_VAL,
+    ERC20_VAL,
+)
+import pytest
+
+
+def test_create_deeds(base_set_up):
+    PLEDGER = get_account(index=1)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    collaterals = [
+        (erc20.address, ERC20_VAL, 50, 0),
+        (erc1155.address, ERC1155_VAL, 1, erc1155_id),
+        (erc1155.address, ERC1155_VAL, 2, erc1155_id),
+        (erc721.address, ERC721_VAL, 1, erc721_token_id),
+    ]
+
+    with pytest.raises(exceptions.VirtualMachineError):
+        pwn_create_deeds(collaterals, [3600, 3600, 3600, 3600], PLEDGER, pwn)
+
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=50)
+    set_approve(PLEDGER, pwn_vault.address, erc1155, ERC1155_VAL)
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+
+    # revert: Array lengths don't match
+    with pytest.raises(exceptions.VirtualMachineError):
+        pwn_create_deeds(collaterals, [3600], PLEDGER, pwn)
+
+    tx = pwn.createDeeds(collaterals, [3600, 60, 120, 7200], {"from": PLEDGER})
+    dids = [event["did"] for event in tx.events["DeedCreated"]]
+    assert dids == [1, 2, 3, 4]
+    assert len(tx.events["VaultPush"]) == 4
+    assert len(tx.events["TransferBatch"]) == 2  # Deed tokens & ERC1155 collateral
+
+    for did, collateral, duration in zip(dids, collaterals, [3600, 60, 120, 7200]):
+        assert collateral == pwn_deed.getDeedCollateral(did)
+        assert duration == pwn_deed.getDuration(did)
+        assert 1 == pwn_deed.getDeedStatus(did)
+        assert 1 == pwn_deed.balanceOf(PLEDGER, did)
+
+    assert erc20.balanceOf(pwn_vault) == 50
+    assert erc721.balanceOf(pwn_vault) == 1
+    assert erc1155.balanceOf(pwn_vault, erc1155_id) == 3
+
+
+def test_make_and_revoke_offers(base_set_up):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    RANDOM_USER = get_account(index=3)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_erc20, did_erc721 = pwn_create_deeds(
+        [
+            (erc20.address, ERC20_VAL, 100, 0),
+            (erc721.address, ERC721_VAL, 1, erc721_token_id),
+        ],
+        [3600, 3600],
+        PLEDGER,
+        pwn,
+    )
+
+    # revert: Array lengths don't match
+    with pytest.raises(exceptions.VirtualMachineError):
+        make_offers([erc20.address], [110, 120], [did_erc20], [130], LENDER, pwn)
+
+    offers = make_offers(
+        [erc20.address] * 3,
+        [110, 120, 90],
+        [did_erc20, did_erc721, did_erc721],
+        [130, 140, 100],
+        LENDER,
+        pwn,
+    )
+    assert len(set(offers)) == 3
+    assert (did_erc20, 130, LENDER.address, (erc20.address, 0, 110, 0)) == (
+        pwn_deed.offers(offers[0])
+    )
+    assert (did_erc721, 140, LENDER.address, (erc20.address, 0, 120, 0)) == (
+        pwn_deed.offers(offers[1])
+    )
+    assert list(pwn_deed.getOffers(did_erc721)) == offers[1:]
+
+    # revert: This address didn't create the offer
+    with pytest.raises(exceptions.VirtualMachineError):
+        revoke_offers(offers[1:], RANDOM_USER, pwn)
+
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=110)
+    accept_offer(offers[0], PLEDGER, pwn)
+
+    # revert: Can only remove offers from open Deeds - the whole batch reverts
+    with pytest.raises(exceptions.VirtualMachineError):
+        revoke_offers(offers, LENDER, pwn)
+
+    tx = revoke_offers(offers[1:], LENDER, pwn)
+    assert [event["offer"] for event in tx.events["OfferRevoked"]] == offers[1:]
+    assert pwn_deed.getLender(offers[1]) == "0x0000000000000000000000000000000000000000"
+    assert pwn_deed.getLender(offers[2]) == "0x0000000000000000000000000000000000000000"
+
+
+def test_claim_deeds(base_set_up):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=50)
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    dids = pwn_create_deeds(
+        [
+            (erc20.address, ERC20_VAL, 50, 0),
+            (erc721.address, ERC721_VAL, 1, erc721_token_id),
+        ],
+        [3600, 60],
+        PLEDGER,
+        pwn,
+    )
+    offers = make_offers([erc20.address] * 2, [100, 100], dids, [110, 120], LENDER, pwn)
+
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=200)
+    for offer in offers:
+        accept_offer(offer, PLEDGER, pwn)
+
+    # revert: Deed can't be claimed yet - the whole batch reverts
+    with pytest.raises(exceptions.VirtualMachineError):
+        claim_deeds(dids, LENDER, pwn)
+
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=110)
+    repay_loan(dids[0], PLEDGER, pwn)
+    chain.sleep(120)
+    chain.mine()
+
+    # a paid back & an expired Deed claimed at once
+    tx = claim_deeds(dids, LENDER, pwn)
+    assert [event["did"] for event in tx.events["DeedClaimed"]] == dids
+    assert [pwn_deed.getDeedStatus(did) for did in dids] == [0, 0]
+    assert erc20.balanceOf(LENDER) == 710
+    assert erc721.ownerOf(erc721_token_id) == LENDER
@@ -0,0 +1,162 @@
+from scripts.helpful_scripts import get_account
+from brownie import exceptions
+from scripts.deploy_pwn import (
+    set_approve,
+    send_token,
+    pwn_create_deed,
+    make_offer,
+    revoke_deed,
+    accept_offer,
+    ERC1155_VAL,
+    ERC721_VAL,
+    ERC20_VAL,
+)
+import pytest
+
+
+def test_set_pwn(base_set_up):
+    pwn_deed, pwn_vault, pwn = base_set_up[:3]
+    assert pwn.address == pwn_deed.PWN()
+    assert pwn.address == pwn_vault.PWN()
+
+
+def test_create_deed(base_set_up):
+    PWN_OWNER = get_account(index=0)
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+
+    with pytest.raises(exceptions.VirtualMachineError):
+        deed_token_id = pwn_create_deed(
+            erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER, pwn
+        )
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    deed_token_id = pwn_create_deed(
+        erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER, pwn
+    )
+    assert (
+        1,
+        "0x0000000000000000000000000000000000000000",
+        3600,
+        0,
+        (erc721.address, 1, 1, 0),
+        "0x0000000000000000000000000000000000000000000000000000000000000000",
+    ) == pwn_deed.deeds(deed_token_id)
+    assert (
+        erc721.address,
+        1,
+        1,
+        0,
+    ) == pwn_deed.getDeedCollateral(deed_token_id)
+    assert "0x0000000000000000000000000000000000000000" == pwn_deed.getBorrower(
+        deed_token_id
+    )
+    assert 3600 == pwn_deed.getDuration(deed_token_id)
+    assert 0 == pwn_deed.getExpiration(deed_token_id)
+    assert 1 == pwn_deed.getDeedStatus(deed_token_id)
+
+    with pytest.raises(exceptions.VirtualMachineError):
+        deed_token_id = pwn_create_deed(erc20.address, 0, 3600, 0, 50, PLEDGER, pwn)
+
+    with pytest.raises(exceptions.VirtualMachineError):
+        deed_token_id = pwn_create_deed(
+            erc1155.address, 2, 3600, erc1155_id, 2, PLEDGER, pwn
+        )
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=50)
+    set_approve(PLEDGER, pwn_vault.address, erc1155, ERC1155_VAL, erc1155_id)
+    did_erc20 = pwn_create_deed(erc20.address, 0, 3600, 0, 50, PLEDGER, pwn)
+    did_erc1155 = pwn_create_deed(erc1155.address, 2, 3600, erc1155_id, 2, PLEDGER, pwn)
+    assert pwn_deed.deeds(did_erc20) == (
+        1,
+        "0x0000000000000000000000000000000000000000",
+        3600,
+        0,
+        (erc20.address, 0, 50, 0),
+        "0x0000000000000000000000000000000000000000000000000000000000000000",
+    )
+    assert pwn_deed.deeds(did_erc1155) == (
+        1,
+        "0x0000000000000000000000000000000000000000",
+        3600,
+        0,
+        (erc1155.address, 2, 2, 1),
+        "0x0000000000000000000000000000000000000000000000000000000000000000",
+    )
+    assert erc20.balanceOf(pwn_vault) == 50
+    assert erc20.balanceOf(PLEDGER) == 150
+
+    assert erc721.balanceOf(pwn_vault) == 1
+    assert erc721.balanceOf(PLEDGER) == 0
+
+    assert erc1155.balanceOf(pwn_vault, erc1155_id) == 2
+    assert erc1155.balanceOf(PLEDGER, erc1155_id) == 1
+
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=50)
+    with pytest.raises(OverflowError):
+        did_erc20 = pwn_create_deed(erc20.address, 0, -10, 0, 50, PLEDGER, pwn)
+
+
+def test_revoke_deed(base_set_up):
+    PWN_OWNER = get_account(index=0)
+    PLEDGER_1 = get_account(index=1)
+    PLEDGER_2 = get_account(index=4)
+    RANDOM_USER = get_account(index=3)
+    LENDER = get_account(index=2)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    set_approve(PLEDGER_1, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_1 = pwn_create_deed(erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER_1, pwn)
+    send_token(PLEDGER_2, LENDER, 100, erc20, ERC20_VAL)
+    set_approve(PLEDGER_2, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    did_2 = pwn_create_deed(erc20.address, 0, 3600, 0, 100, PLEDGER_2, pwn)
+    set_approve(PLEDGER_1, pwn_vault.address, erc1155, ERC1155_VAL, erc1155_id)
+    did_3 = pwn_create_deed(erc1155.address, 2, 3600, erc1155_id, 3, PLEDGER_1, pwn)
+
+    with pytest.raises(exceptions.VirtualMachineError):
+        revoke_deed(did_1, RANDOM_USER, pwn)
+
+    with pytest.raises(exceptions.VirtualMachineError):
+        revoke_deed(did_1, PLEDGER_2, pwn)
+
+    revoke_deed(did_1, PLEDGER_1, pwn)
+    assert 0 == pwn_deed.getDeedStatus(did_1)
+
+    assert pwn_deed.balanceOf(PLEDGER_1, did_1) == 0
+    assert erc721.balanceOf(PLEDGER_1) == 1
+
+    revoke_deed(did_2, PLEDGER_2, pwn)
+    assert pwn_deed.balanceOf(PLEDGER_2, did_2) == 0
+    assert erc20.balanceOf(PLEDGER_2) == 100
+
+    print(pwn_deed.deeds(did_3))
+
+    revoke_deed(did_3, PLEDGER_1, pwn)
+    assert pwn_deed.balanceOf(PLEDGER_1, did_3) == 0
+    assert erc1155.balanceOf(PLEDGER_1, erc1155_id) == 3
+
+    set_approve(PLEDGER_1, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_4 = pwn_create_deed(erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER_1, pwn)
+    offer_id = make_offer(erc20.address, 100, did_4, 120, LENDER, pwn)
+    set_approve(PLEDGER_1, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    accept_offer(offer_id, PLEDGER_1, pwn)
+
+    with pytest.raises(exceptions.VirtualMachineError):
+        revoke_deed(did_4, LENDER, pwn)
@@ -0,0 +1,208 @@
+from scripts.helpful_scripts import get_account
+from brownie import chain, web3
+from scripts.deploy_pwn import (
+    set_approve,
+    pwn_create_deeds,
+    make_offer,
+    accept_offer,
+    revoke_deed,
+    repay_loan,
+    claim_deed,
+    ERC1155_VAL,
+    ERC20_VAL,
+)
+from scripts.deed_cache import CachedDeed
+from scripts.time_travel import DEED_DEAD, DEED_OPEN, DEED_RUNNING
+import pytest
+
+
+def open_deeds(base_set_up, count):
+    # `count` deeds with ERC20 collateral, with the approvals to lend & repay them
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    dids = pwn_create_deeds(
+        [(erc20.address, ERC20_VAL, 10, 0)] * count, [3600] * count, PLEDGER, pwn
+    )
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    return dids
+
+
+@pytest.fixture
+def rpc_requests(monkeypatch):
+    # JSON-RPC methods requested from the node
+    methods = []
+    make_request = web3.provider.make_request
+
+    def counting_request(method, params):
+        methods.append(method)
+        return make_request(method, params)
+
+    monkeypatch.setattr(web3.provider, "make_request", counting_request)
+    return methods
+
+
+def test_cache_hits_without_requests(base_set_up, rpc_requests):
+    pwn_deed, pwn_vault = base_set_up[:2]
+    did, other = open_deeds(base_set_up, 2)
+    cache = CachedDeed(pwn_deed, pwn_vault)
+    assert cache.getDeedStatus(did) == DEED_OPEN
+    assert cache.getDuration(did) == 3600
+    assert cache.misses == 2
+
+    # new blocks don't move the head of the cache
+    chain.mine(2)
+    rpc_requests.clear()
+    assert cache.getDeedStatus(did) == DEED_OPEN
+    assert cache.getDuration(did) == 3600
+    assert cache.hits == 2
+    assert rpc_requests == []
+
+    assert cache.getDuration(other) == 3600
+    assert cache.misses == 3
+    assert "eth_blockNumber" not in rpc_requests
+
+    # an explicit sync reads the head & the events since the last one
+    rpc_requests.clear()
+    assert cache.sync() == web3.eth.block_number
+    assert "eth_blockNumber" in rpc_requests and "eth_getLogs" in rpc_requests
+
+
+def test_cache_refresh_interval(base_set_up):
+    PLEDGER = get_account(index=1)
+    pwn_deed, pwn_vault, pwn = base_set_up[:3]
+    (did,) = open_deeds(base_set_up, 1)
+    cache = CachedDeed(pwn_deed, pwn_vault, refresh_interval=3600)
+    assert cache.getDeedStatus(did) == DEED_OPEN
+
+    revoke_deed(did, PLEDGER, pwn)
+    assert cache.getDeedStatus(did) == DEED_OPEN
+
+    # the interval passed, the next read syncs first
+    cache.refresh_interval = 0
+    assert cache.getDeedStatus(did) == DEED_DEAD
+    assert cache.block == web3.eth.block_number
+
+
+def test_cache_lru_eviction(base_set_up):
+    pwn_deed, pwn_vault = base_set_up[:2]
+    dids = open_deeds(base_set_up, 3)
+    cache = CachedDeed(pwn_deed, pwn_vault, maxsize=2)
+    cache.getDuration(dids[0])
+    cache.getDuration(dids[1])
+    cache.getDuration(dids[0])
+    assert (cache.hits, cache.misses) == (1, 2)
+
+    # the least recently used entry goes first
+    cache.getDuration(dids[2])
+    assert list(cache._entries) == [
+        ("getDuration", (dids[0],)),
+        ("getDuration", (dids[2],)),
+    ]
+    cache.getDuration(dids[0])
+    assert (cache.hits, cache.misses) == (2, 3)
+    cache.getDuration(dids[1])
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert len(cache._entries) == 2
+
+
+def test_cache_forgets_released_deeds(base_set_up):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    dids = open_deeds(base_set_up, 3)
+    offers = [make_offer(erc20.address, 20, did, 25, LENDER, pwn) for did in dids]
+    cache = CachedDeed(pwn_deed, pwn_vault, maxsize=2)
+    for did, offer in zip(dids, offers):
+        cache.getDeedID(offer)
+        cache.getDeedCollateral(did)
+
+    # the links of the evicted deeds went with their entries
+    assert list(cache._deed_offers) == [dids[2]]
+    assert list(cache._offer_deeds.values()) == [dids[2]]
+    assert list(cache._collateral_deeds.values()) == [{dids[2]}]
+
+    # a dead deed is forgotten altogether
+    revoke_deed(dids[2], PLEDGER, pwn)
+    cache.sync()
+    assert not cache._entries and not cache._references
+    assert not cache._deed_offers and not cache._offer_deeds
+    assert not cache._collateral_deeds and not cache._deed_collaterals
+
+    cache.getDeedID(offers[0])
+    cache.getDeedCollateral(dids[0])
+    cache.clear()
+    assert not cache._entries and not cache._references
+    assert not cache._deed_offers and not cache._offer_deeds
+    assert not cache._collateral_deeds and not cache._deed_collaterals
+
+
+@pytest.mark.parametrize(
+    "event",
+    [
+        "DeedCreated",
+        "DeedRevoked",
+        "OfferMade",
+        "OfferAccepted",
+        "PaidBack",
+        "DeedClaimed",
+    ],
+)
+def test_cache_invalidates_deed_on_event(base_set_up, event):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    did, other = open_deeds(base_set_up, 2)
+    offer = make_offer(erc20.address, 20, did, 25, LENDER, pwn)
+    if event in ("PaidBack", "DeedClaimed"):
+        accept_offer(offer, PLEDGER, pwn)
+    if event == "DeedClaimed":
+        set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=25)
+        repay_loan(did, PLEDGER, pwn)
+    if event == "DeedCreated":
+        did = other + 1
+
+    cache = CachedDeed(pwn_deed, pwn_vault)
+    name = "getOffers" if event == "OfferMade" else "deeds"
+    read = getattr(cache, name)
+    before = read(did)
+    cache.deeds(other)
+
+    if event == "DeedCreated":
+        set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=10)
+        pwn_create_deeds([(erc20.address, ERC20_VAL, 10, 0)], [3600], PLEDGER, pwn)
+    elif event == "DeedRevoked":
+        revoke_deed(did, PLEDGER, pwn)
+    elif event == "OfferMade":
+        make_offer(erc20.address, 30, did, 35, LENDER, pwn)
+    elif event == "OfferAccepted":
+        accept_offer(offer, PLEDGER, pwn)
+    elif event == "PaidBack":
+        set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=25)
+        repay_loan(did, PLEDGER, pwn)
+    else:
+        claim_deed(did, LENDER, pwn)
+    assert read(did) == before
+
+    cache.sync()
+    assert ("deeds", (other,)) in cache._entries
+    assert read(did) != before
+    assert read(did) == getattr(pwn_deed, name)(did)
+    cache.deeds(other)
+    assert cache.misses == 3
+
+
+def test_cache_observe(base_set_up):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    (did,) = open_deeds(base_set_up, 1)
+    offer = make_offer(erc20.address, 20, did, 25, LENDER, pwn)
+    cache = CachedDeed(pwn_deed, pwn_vault)
+    assert cache.getDeedStatus(did) == DEED_OPEN
+
+    tx = accept_offer(offer, PLEDGER, pwn)
+    assert cache.observe(tx) == tx.block_number
+    assert cache.getDeedStatus(did) == DEED_RUNNING
@@ -0,0 +1,120 @@
+from scripts.helpful_scripts import get_account
+from scripts.deploy_pwn import (
+    set_approve,
+    pwn_create_deeds,
+    make_offers,
+    accept_offer,
+    repay_loan,
+    ERC1155_VAL,
+    ERC20_VAL,
+)
+from scripts.deed_keeper import DeedKeeper
+from scripts.time_travel import expire_deed, DEED_DEAD, DEED_PAID_BACK
+
+
+def running_deeds(base_set_up, count):
+    # `count` deeds with ERC20 collateral, lent by LENDER for an hour
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=10 * count)
+    dids = pwn_create_deeds(
+        [(erc20.address, ERC20_VAL, 10, 0)] * count, [3600] * count, PLEDGER, pwn
+    )
+    offers = make_offers(
+        [erc20.address] * count, [20] * count, dids, [25] * count, LENDER, pwn
+    )
+
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=20 * count)
+    for offer in offers:
+        accept_offer(offer, PLEDGER, pwn)
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=25 * count)
+    return dids
+
+
+def test_keeper_claims_paid_back_deed(base_set_up):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    pwn_deed, pwn = base_set_up[0], base_set_up[2]
+    dids = running_deeds(base_set_up, 2)
+    keeper = DeedKeeper([LENDER], pwn, pwn_deed)
+    keeper.sync()
+    assert keeper.due() == {}
+    assert keeper.next_expiration() == pwn_deed.getExpiration(dids[0])
+
+    repay_loan(dids[0], PLEDGER, pwn)
+    keeper.sync()
+    assert keeper.due() == {LENDER: [dids[0]]}
+
+    assert keeper.claim() == [dids[0]]
+    assert pwn_deed.getDeedStatus(dids[0]) == DEED_DEAD
+    assert keeper.claim() == []
+
+    # the `DeedClaimed` event makes the keeper forget the deed
+    keeper.sync()
+    assert dids[0] not in keeper.owners
+    assert dids[1] in keeper.expirations
+
+
+def test_keeper_claims_expired_deed(base_set_up):
+    LENDER = get_account(index=2)
+    pwn_deed, pwn = base_set_up[0], base_set_up[2]
+    dids = running_deeds(base_set_up, 2)
+    keeper = DeedKeeper([LENDER], pwn, pwn_deed)
+    keeper.sync()
+
+    expire_deed(dids[-1], pwn_deed)
+    assert keeper.due() == {LENDER: dids}
+    assert keeper.claim() == dids
+    assert [pwn_deed.getDeedStatus(did) for did in dids] == [DEED_DEAD, DEED_DEAD]
+    assert keeper.next_expiration() is None
+
+
+def test_keeper_skips_deed_transferred_away(base_set_up):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    BUYER = get_account(index=3)
+    pwn_deed, pwn = base_set_up[0], base_set_up[2]
+    dids = running_deeds(base_set_up, 1)
+    keeper = DeedKeeper([LENDER], pwn, pwn_deed)
+    keeper.sync()
+
+    pwn_deed.safeTransferFrom(LENDER, BUYER, dids[0], 1, b"", {"from": LENDER})
+    repay_loan(dids[0], PLEDGER, pwn)
+    keeper.sync()
+    assert keeper.due() == {}
+    assert keeper.claim() == []
+    assert pwn_deed.getDeedStatus(dids[0]) == DEED_PAID_BACK
+
+
+def test_keeper_recovers_from_reverted_batch(base_set_up, monkeypatch):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    BUYER = get_account(index=3)
+    pwn_deed, pwn = base_set_up[0], base_set_up[2]
+    dids = running_deeds(base_set_up, 3)
+    keeper = DeedKeeper([LENDER], pwn, pwn_deed)
+    for did in dids:
+        repay_loan(did, PLEDGER, pwn)
+    keeper.sync()
+
+    # sold after the keeper's last sync - the batch reverts, the rest is retried on its own
+    pwn_deed.safeTransferFrom(LENDER, BUYER, dids[0], 1, b"", {"from": LENDER})
+    assert keeper.claim() == dids[1:]
+    assert pwn_deed.getDeedStatus(dids[0]) == DEED_PAID_BACK
+    assert keeper.due() == {}
+
+    # a retry reverting as well leaves the deeds for the next round
+    dids = running_deeds(base_set_up, 2)
+    for did in dids:
+        repay_loan(did, PLEDGER, pwn)
+    keeper.sync()
+    pwn_deed.safeTransferFrom(LENDER, BUYER, dids[0], 1, b"", {"from": LENDER})
+    with monkeypatch.context() as m:
+        m.setattr(keeper, "_recheck", lambda batch, owner: batch)
+        assert keeper.claim() == []
+    assert keeper.due() == {LENDER: dids}
+
+    keeper.sync()
+    assert keeper.claim() == dids[1:]
@@ -0,0 +1,42 @@
+import json
+import os
+from scripts.helpful_scripts import get_account
+from brownie import PWN, PWNDeed, PWNVault, web3
+from scripts.deploy_pwn import set_approve, pwn_create_deeds, ERC20_VAL
+from scripts.light_client import ReadClient, ABI_DIR
+from scripts.time_travel import DEED_OPEN
+import pytest
+
+
+@pytest.mark.parametrize("container", [PWNDeed, PWNVault, PWN])
+def test_exported_abis_match_build(container):
+    path = os.path.join(ABI_DIR, container._name + ".json")
+    if not os.path.exists(path):
+        pytest.skip(f"{container._name} ABI not exported")
+    # scripts/abi is out of date - `brownie compile && python -m scripts.light_client export`
+    with open(path) as f:
+        assert json.load(f) == container.abi
+
+
+def test_read_client(base_set_up):
+    PLEDGER = get_account(index=1)
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=10)
+    (did,) = pwn_create_deeds([(erc20.address, ERC20_VAL, 10, 0)], [3600], PLEDGER, pwn)
+
+    client = ReadClient(
+        deed_address=pwn_deed.address, vault_address=pwn_vault.address, w3=web3
+    )
+    deed = client.get_deed(did)
+    assert deed["status"] == DEED_OPEN
+    assert deed["borrower"] == PLEDGER.address
+    assert deed["duration"] == 3600
+    assert list(deed["collateral"]) == list(pwn_deed.getDeedCollateral(did))
+    assert client.PWN() == pwn.address
+
+    events = client.events(web3.eth.block_number)
+    assert [event.event for event in events] == [
+        "TransferBatch",
+        "DeedCreated",
+        "VaultPush",
+    ]
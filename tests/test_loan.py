@@ -0,0 +1,287 @@
+from scripts.helpful_scripts import get_account
+from brownie import chain, exceptions
+from scripts.deploy_pwn import (
+    set_approve,
+    pwn_create_deed,
+    make_offer,
+    accept_offer,
+    revoke_deed,
+    repay_loan,
+    claim_deed,
+    ERC1155_VAL,
+    ERC721_VAL,
+    ERC20_VAL,
+)
+from scripts.time_travel import expire_deed
+import pytest
+
+
+def test_repay_loan(base_set_up):
+    PWN_OWNER = get_account(index=0)
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    RANDOM_USER = get_account(index=3)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    did_erc20 = pwn_create_deed(erc20.address, 0, 3600, 0, 100, PLEDGER, pwn)
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_erc721 = pwn_create_deed(
+        erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER, pwn
+    )
+    set_approve(PLEDGER, pwn_vault.address, erc1155, ERC1155_VAL, erc1155_id)
+    did_erc1155 = pwn_create_deed(erc1155.address, 2, 3600, erc1155_id, 3, PLEDGER, pwn)
+
+    offer_erc20 = make_offer(erc20.address, 110, did_erc20, 130, LENDER, pwn)
+    offer_erc721 = make_offer(erc20.address, 110, did_erc721, 130, LENDER, pwn)
+    offer_erc1155 = make_offer(erc20.address, 110, did_erc1155, 130, LENDER, pwn)
+
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=1000)
+
+    # revert: Deed doesn't have an accepted offer to be paid back
+    with pytest.raises(exceptions.VirtualMachineError):
+        repay_loan(did_erc721, PLEDGER, pwn)
+
+    accept_offer(offer_erc20, PLEDGER, pwn)
+    accept_offer(offer_erc721, PLEDGER, pwn)
+    accept_offer(offer_erc1155, PLEDGER, pwn)
+
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=390)
+    tx = repay_loan(did_erc20, PLEDGER, pwn)
+    repay_loan(did_erc721, PLEDGER, pwn)
+    repay_loan(did_erc1155, PLEDGER, pwn)
+
+    # the repayment is locked & the collateral released by a single vault call
+    assert (erc20.address, ERC20_VAL, 130, 0) == tx.events["VaultPush"]["asset"]
+    assert PLEDGER == tx.events["VaultPull"]["beneficiary"]
+    assert 390 == erc20.balanceOf(pwn_vault)
+    assert 0 == erc721.balanceOf(pwn_vault)
+    assert 0 == erc1155.balanceOf(pwn_vault, erc1155_id)
+    assert 1 == pwn_deed.balanceOf(LENDER, did_erc20)
+    assert 1 == pwn_deed.balanceOf(LENDER, did_erc721)
+    assert 1 == pwn_deed.balanceOf(LENDER, did_erc1155)
+
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_erc20_time_out = pwn_create_deed(
+        erc721.address, 1, 1, erc721_token_id, 1, PLEDGER, pwn
+    )
+    offer_timeout = make_offer(erc20.address, 110, did_erc20_time_out, 130, LENDER, pwn)
+    accept_offer(offer_timeout, PLEDGER, pwn)
+    expire_deed(did_erc20_time_out, pwn_deed)
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=130)
+    # revert: Deed doesn't have an accepted offer to be paid back
+    # misleading error code. Deed expired
+    with pytest.raises(exceptions.VirtualMachineError):
+        repay_loan(did_erc20_time_out, PLEDGER, pwn)
+
+
+def test_claim_deed(base_set_up):
+    PWN_OWNER = get_account(index=0)
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    RANDOM_USER = get_account(index=3)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    did_erc20 = pwn_create_deed(erc20.address, 0, 3600, 0, 100, PLEDGER, pwn)
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_erc721 = pwn_create_deed(
+        erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER, pwn
+    )
+    set_approve(PLEDGER, pwn_vault.address, erc1155, ERC1155_VAL, erc1155_id)
+    did_erc1155 = pwn_create_deed(erc1155.address, 2, 3600, erc1155_id, 3, PLEDGER, pwn)
+
+    offer_erc20 = make_offer(erc20.address, 110, did_erc20, 130, LENDER, pwn)
+    offer_erc721 = make_offer(erc20.address, 110, did_erc721, 130, LENDER, pwn)
+    offer_erc1155 = make_offer(erc20.address, 110, did_erc1155, 130, LENDER, pwn)
+
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=1000)
+
+    accept_offer(offer_erc20, PLEDGER, pwn)
+    accept_offer(offer_erc721, PLEDGER, pwn)
+    accept_offer(offer_erc1155, PLEDGER, pwn)
+
+    # revert: Deed can't be claimed yet
+    with pytest.raises(exceptions.VirtualMachineError):
+        claim_deed(did_erc721, LENDER, pwn)
+
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=390)
+    repay_loan(did_erc20, PLEDGER, pwn)
+    repay_loan(did_erc721, PLEDGER, pwn)
+    repay_loan(did_erc1155, PLEDGER, pwn)
+
+    # revert: Caller is not the deed owner
+    with pytest.raises(exceptions.VirtualMachineError):
+        claim_deed(did_erc721, RANDOM_USER, pwn)
+    chain.mine(1)
+    claim_deed(did_erc20, LENDER, pwn)
+    claim_deed(did_erc721, LENDER, pwn)
+    claim_deed(did_erc1155, LENDER, pwn)
+
+    assert 860 == erc20.balanceOf(LENDER)
+    assert 0 == pwn_deed.balanceOf(LENDER, did_erc20)
+    assert 0 == pwn_deed.getDeedStatus(did_erc20)
+
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_erc721_timeout_after_payment = pwn_create_deed(
+        erc721.address, 1, 5, erc721_token_id, 1, PLEDGER, pwn
+    )
+    offer_timeout_after_payment = make_offer(
+        erc20.address, 110, did_erc721_timeout_after_payment, 130, LENDER, pwn
+    )
+    accept_offer(offer_timeout_after_payment, PLEDGER, pwn)
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=130)
+    repay_loan(did_erc721_timeout_after_payment, PLEDGER, pwn)
+    # paid back Deed stays paid back even after its expiration
+    expire_deed(did_erc721_timeout_after_payment, pwn_deed)
+    assert 3 == pwn_deed.getDeedStatus(did_erc721_timeout_after_payment)
+
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_erc721_time_out = pwn_create_deed(
+        erc721.address, 1, 1, erc721_token_id, 1, PLEDGER, pwn
+    )
+    offer_timeout = make_offer(
+        erc20.address, 110, did_erc721_time_out, 130, LENDER, pwn
+    )
+    accept_offer(offer_timeout, PLEDGER, pwn)
+    expire_deed(did_erc721_time_out, pwn_deed)
+    assert 4 == pwn_deed.getDeedStatus(did_erc721_time_out)
+    claim_deed(did_erc721_time_out, LENDER, pwn)
+    assert 1 == erc721.balanceOf(LENDER)
+
+
+def event_position(tx, name, address):
+    # position of the first `name` event emitted by `address` within the transaction
+    return next(
+        event.pos[0]
+        for event in tx.events
+        if (event.name, event.address) == (name, address)
+    )
+
+
+def test_deed_transition_return_values(base_set_up):
+    PWN_OWNER = get_account(index=0)
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    FAKE_PWN = get_account(index=5)
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=150)
+    did_open = pwn_create_deed(erc20.address, 0, 3600, 0, 50, PLEDGER, pwn)
+    did_running = pwn_create_deed(erc20.address, 0, 3600, 0, 60, PLEDGER, pwn)
+    did_paid_back = pwn_create_deed(erc20.address, 0, 3600, 0, 40, PLEDGER, pwn)
+    offer_open = make_offer(erc20.address, 10, did_open, 11, LENDER, pwn)
+    offer_running = make_offer(erc20.address, 20, did_running, 22, LENDER, pwn)
+    offer_paid_back = make_offer(erc20.address, 30, did_paid_back, 33, LENDER, pwn)
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=50)
+    accept_offer(offer_running, PLEDGER, pwn)
+    accept_offer(offer_paid_back, PLEDGER, pwn)
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=33)
+    repay_loan(did_paid_back, PLEDGER, pwn)
+
+    # the transitions are called the way PWN calls them & their results read without
+    # sending them
+    pwn_deed.setPWN(FAKE_PWN, {"from": PWN_OWNER})
+    as_pwn = {"from": FAKE_PWN}
+    assert pwn_deed.acceptOffer.call(offer_open, PLEDGER, as_pwn) == (
+        did_open,
+        LENDER.address,
+        (erc20.address, ERC20_VAL, 10, 0),
+    )
+    assert pwn_deed.revoke.call(did_open, PLEDGER, as_pwn) == (
+        erc20.address,
+        ERC20_VAL,
+        50,
+        0,
+    )
+    assert pwn_deed.repayLoan.call(did_running, as_pwn) == (
+        PLEDGER.address,
+        (erc20.address, ERC20_VAL, 60, 0),
+        (erc20.address, ERC20_VAL, 22, 0),
+    )
+    # a paid back Deed releases the repayment, an expired one the collateral
+    assert pwn_deed.claim.call(did_paid_back, LENDER, as_pwn) == (
+        erc20.address,
+        ERC20_VAL,
+        33,
+        0,
+    )
+    expire_deed(did_running, pwn_deed)
+    assert pwn_deed.claim.call(did_running, LENDER, as_pwn) == (
+        erc20.address,
+        ERC20_VAL,
+        60,
+        0,
+    )
+
+    # revert: Caller is not the PWN
+    with pytest.raises(exceptions.VirtualMachineError):
+        pwn_deed.claim.call(did_running, LENDER, {"from": LENDER})
+
+
+def test_vault_transfer_order(base_set_up):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    did_revoked = pwn_create_deed(erc20.address, 0, 3600, 0, 50, PLEDGER, pwn)
+    did = pwn_create_deed(erc20.address, 0, 3600, 0, 50, PLEDGER, pwn)
+    offer = make_offer(erc20.address, 10, did, 11, LENDER, pwn)
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=10)
+
+    # the Deed token is burned before the collateral leaves the vault
+    tx = revoke_deed(did_revoked, PLEDGER, pwn)
+    assert event_position(tx, "TransferSingle", pwn_deed.address) < event_position(
+        tx, "VaultPull", pwn_vault.address
+    )
+
+    # the loan goes to the borrower & the Deed token to the lender in one vault call - the
+    # Deed token is sent with amount 0, which MultiToken turns into 1 before it's emitted
+    tx = accept_offer(offer, PLEDGER, pwn)
+    assert [
+        (event["asset"], event["origin"], event["beneficiary"])
+        for event in tx.events["VaultProxy"]
+    ] == [
+        ((erc20.address, ERC20_VAL, 10, 0), LENDER, PLEDGER),
+        ((pwn_deed.address, ERC1155_VAL, 1, did), PLEDGER, LENDER),
+    ]
+    assert 1 == pwn_deed.balanceOf(LENDER, did)
+
+    # the repayment is locked before the collateral is released
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=11)
+    tx = repay_loan(did, PLEDGER, pwn)
+    assert event_position(tx, "PaidBack", pwn_deed.address) < event_position(
+        tx, "VaultPush", pwn_vault.address
+    )
+    assert event_position(tx, "VaultPush", pwn_vault.address) < event_position(
+        tx, "VaultPull", pwn_vault.address
+    )
+    assert (erc20.address, ERC20_VAL, 11, 0) == tx.events["VaultPush"]["asset"]
+    assert (erc20.address, ERC20_VAL, 50, 0) == tx.events["VaultPull"]["asset"]
+
+    # the Deed token is burned before the repayment leaves the vault
+    tx = claim_deed(did, LENDER, pwn)
+    assert event_position(tx, "TransferSingle", pwn_deed.address) < event_position(
+        tx, "VaultPull", pwn_vault.address
+    )
+    assert (erc20.address, ERC20_VAL, 11, 0) == tx.events["VaultPull"]["asset"]
+    assert 0 == pwn_deed.balanceOf(LENDER, did)
@@ -0,0 +1,336 @@
+from scripts.helpful_scripts import get_account
+from brownie import exceptions
+from scripts.deploy_pwn import (
+    set_approve,
+    send_token,
+    pwn_create_deed,
+    make_offer,
+    accept_offer,
+    revoke_offer,
+    ERC1155_VAL,
+    ERC721_VAL,
+    ERC20_VAL,
+)
+import pytest
+
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+def test_make_offer(base_set_up):
+    PWN_OWNER = get_account(index=0)
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    did_erc20 = pwn_create_deed(erc20.address, 0, 3600, 0, 100, PLEDGER, pwn)
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_erc721 = pwn_create_deed(
+        erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER, pwn
+    )
+    set_approve(PLEDGER, pwn_vault.address, erc1155, ERC1155_VAL, erc1155_id)
+    did_erc1155 = pwn_create_deed(erc1155.address, 2, 3600, erc1155_id, 3, PLEDGER, pwn)
+
+    # this should make exception not sufficient balance
+    offer_id = make_offer(erc20.address, 1100, did_erc20, 1500, LENDER, pwn)
+
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_offer(offer_id, PLEDGER, pwn)
+
+    # set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+
+    offer_erc20 = make_offer(erc20.address, 110, did_erc20, 130, LENDER, pwn)
+    offer_erc721 = make_offer(erc20.address, 110, did_erc721, 130, LENDER, pwn)
+    offer_erc1155 = make_offer(erc20.address, 110, did_erc1155, 130, LENDER, pwn)
+
+    assert (1, 130, LENDER.address, (erc20.address, 0, 110, 0)) == pwn_deed.offers(
+        offer_erc20
+    )
+    assert (2, 130, LENDER.address, (erc20.address, 0, 110, 0)) == pwn_deed.offers(
+        offer_erc721
+    )
+    assert (3, 130, LENDER.address, (erc20.address, 0, 110, 0)) == pwn_deed.offers(
+        offer_erc1155
+    )
+
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=110)
+    accept_offer(offer_erc721, PLEDGER, pwn)
+    with pytest.raises(exceptions.VirtualMachineError):
+        offer_erc721 = make_offer(erc721.address, 110, did_erc721, 130, LENDER, pwn)
+
+
+def test_revoke_offer(base_set_up):
+    PWN_OWNER = get_account(index=0)
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    RANDOM_USER = get_account(index=3)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    did_erc20 = pwn_create_deed(erc20.address, 0, 3600, 0, 100, PLEDGER, pwn)
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_erc721 = pwn_create_deed(
+        erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER, pwn
+    )
+    set_approve(PLEDGER, pwn_vault.address, erc1155, ERC1155_VAL, erc1155_id)
+    did_erc1155 = pwn_create_deed(erc1155.address, 2, 3600, erc1155_id, 3, PLEDGER, pwn)
+
+    offer_erc20 = make_offer(erc20.address, 110, did_erc20, 130, LENDER, pwn)
+    offer_erc721 = make_offer(erc20.address, 110, did_erc721, 130, LENDER, pwn)
+    offer_erc1155 = make_offer(erc20.address, 110, did_erc1155, 130, LENDER, pwn)
+
+    with pytest.raises(exceptions.VirtualMachineError):
+        revoke_offer(offer_erc721, RANDOM_USER, pwn)
+
+    offer_erc721_2 = make_offer(erc20.address, 110, did_erc721, 130, LENDER, pwn)
+    revoke_offer(offer_erc721_2, LENDER, pwn)
+    assert (
+        0,
+        0,
+        "0x0000000000000000000000000000000000000000",
+        ("0x0000000000000000000000000000000000000000", 0, 0, 0),
+    ) == pwn_deed.offers(offer_erc721_2)
+
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=110)
+    accept_offer(offer_erc721, PLEDGER, pwn)
+    print(pwn_deed.deeds(did_erc721))
+    with pytest.raises(exceptions.VirtualMachineError):
+        revoke_offer(offer_erc721, LENDER, pwn)
+
+
+def test_accept_offer(base_set_up):
+    PWN_OWNER = get_account(index=0)
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    RANDOM_USER = get_account(index=3)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+    did_erc20 = pwn_create_deed(erc20.address, 0, 3600, 0, 100, PLEDGER, pwn)
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did_erc721 = pwn_create_deed(
+        erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER, pwn
+    )
+    set_approve(PLEDGER, pwn_vault.address, erc1155, ERC1155_VAL, erc1155_id)
+    did_erc1155 = pwn_create_deed(erc1155.address, 2, 3600, erc1155_id, 3, PLEDGER, pwn)
+
+    offer_erc20 = make_offer(erc20.address, 110, did_erc20, 130, LENDER, pwn)
+    offer_erc721 = make_offer(erc20.address, 110, did_erc721, 130, LENDER, pwn)
+    offer_erc721_2 = make_offer(erc20.address, 1000, did_erc721, 1100, LENDER, pwn)
+    offer_erc721_3 = make_offer(erc20.address, 90, did_erc721, 130, LENDER, pwn)
+    offer_erc1155 = make_offer(erc20.address, 110, did_erc1155, 130, LENDER, pwn)
+
+    # ERC20: insufficient allowance
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_offer(offer_erc721_2, PLEDGER, pwn)
+
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=1000)
+
+    # ERC20: transfer amount exceeds balance
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_offer(offer_erc721_2, PLEDGER, pwn)
+
+    # ERC1155: caller is not owner nor approved
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_offer(offer_erc721, PLEDGER, pwn)
+
+    # revert: The deed doesn't belong to the caller
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_offer(offer_erc721, RANDOM_USER, pwn)
+
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    accept_offer(offer_erc20, PLEDGER, pwn)
+    accept_offer(offer_erc721, PLEDGER, pwn)
+    accept_offer(offer_erc1155, PLEDGER, pwn)
+    assert offer_erc20 == pwn_deed.getAcceptedOffer(did_erc20)
+    assert offer_erc721 == pwn_deed.getAcceptedOffer(did_erc721)
+    assert offer_erc1155 == pwn_deed.getAcceptedOffer(did_erc1155)
+
+    assert 100 == erc20.balanceOf(pwn_vault)
+    assert 1 == erc721.balanceOf(pwn_vault)
+    assert 3 == erc1155.balanceOf(pwn_vault, erc1155_id)
+    assert 430 == erc20.balanceOf(PLEDGER)
+    assert 1 == pwn_deed.balanceOf(LENDER, did_erc20)
+    assert 1 == pwn_deed.balanceOf(LENDER, did_erc721)
+    assert 1 == pwn_deed.balanceOf(LENDER, did_erc1155)
+
+    # revert: Deed can't accept more offers
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_offer(offer_erc721_3, LENDER, pwn)
+
+
+def test_lend_ecr1155(base_set_up):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    send_token(LENDER, PLEDGER, 3, erc1155, ERC1155_VAL, erc1155_id)
+
+    print(erc20.balanceOf(LENDER))
+    print(erc721.balanceOf(PLEDGER))
+    print(erc1155.balanceOf(LENDER, erc1155_id))
+
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC1155_VAL, erc721_token_id)
+    deed_token_id = pwn_create_deed(
+        erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER, pwn
+    )
+    print(pwn_deed.balanceOf(PLEDGER, deed_token_id))
+
+    offer_id = make_offer(erc1155.address, 1, deed_token_id, 1, LENDER, pwn)
+    print(pwn_deed.offers(offer_id))
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc1155, ERC1155_VAL)
+    accept_offer(offer_id, PLEDGER, pwn)
+
+    assert erc1155.balanceOf(PLEDGER, erc1155_id) == 1
+
+
+def test_get_offers(base_set_up):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    set_approve(PLEDGER, pwn_vault.address, erc721, ERC721_VAL, erc721_token_id)
+    did = pwn_create_deed(erc721.address, 1, 3600, erc721_token_id, 1, PLEDGER, pwn)
+    offers = [make_offer(erc20.address, 10, did, 11, LENDER, pwn) for _ in range(5)]
+    assert list(pwn_deed.getOffers(did)) == offers
+
+    # revoked offers are replaced by the last one
+    revoke_offer(offers[1], LENDER, pwn)
+    assert list(pwn_deed.getOffers(did)) == [offers[0], offers[4], offers[2], offers[3]]
+    revoke_offer(offers[3], LENDER, pwn)
+    assert list(pwn_deed.getOffers(did)) == [offers[0], offers[4], offers[2]]
+
+    assert pwn_deed.getOffers(did, 0, 2) == ([offers[0], offers[4]], 2)
+    assert pwn_deed.getOffers(did, 2, 2) == ([offers[2]], 0)
+    assert pwn_deed.getOffers(did, 3, 2) == ([], 0)
+    assert pwn_deed.getOffers(did, 1, 2**256 - 1) == ([offers[4], offers[2]], 0)
+    # revert: Limit has to be positive
+    with pytest.raises(exceptions.VirtualMachineError):
+        pwn_deed.getOffers(did, 0, 0)
+
+    # a running deed has no pending offers
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=10)
+    accept_offer(offers[2], PLEDGER, pwn)
+    assert list(pwn_deed.getOffers(did)) == []
+    assert pwn_deed.getOffers(did, 0, 10) == ([], 0)
+
+
+def test_packed_offers(base_set_up):
+    PLEDGER = get_account(index=1)
+    LENDER = get_account(index=2)
+    RANDOM_USER = get_account(index=3)
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    # `offers` keeps the ABI of the former public mapping of unpacked offers
+    outputs = pwn_deed.offers.abi["outputs"]
+    assert [(output["name"], output["type"]) for output in outputs] == [
+        ("did", "uint256"),
+        ("toBePaid", "uint256"),
+        ("lender", "address"),
+        ("loan", "tuple"),
+    ]
+    assert [(item["name"], item["type"]) for item in outputs[3]["components"]] == [
+        ("assetAddress", "address"),
+        ("category", "uint8"),
+        ("amount", "uint256"),
+        ("id", "uint256"),
+    ]
+
+    set_approve(PLEDGER, pwn_vault.address, erc1155, ERC1155_VAL, erc1155_id)
+    did = pwn_create_deed(erc1155.address, 2, 3600, erc1155_id, 3, PLEDGER, pwn)
+    lenders = [LENDER, RANDOM_USER, LENDER]
+    offers = [
+        make_offer(erc20.address, 10 + i, did, 2**200 + i, lender, pwn)
+        for i, lender in enumerate(lenders)
+    ]
+
+    # the uint96 deed ID & the lender share a slot, the amounts keep all 256 bits
+    for i, (offer, lender) in enumerate(zip(offers, lenders)):
+        assert pwn_deed.offers(offer) == (
+            did,
+            2**200 + i,
+            lender.address,
+            (erc20.address, 0, 10 + i, 0),
+        )
+        assert pwn_deed.getDeedID(offer) == did
+        assert pwn_deed.getLender(offer) == lender.address
+
+    # the last offer moves into the slot of the revoked one & its stored pending index
+    # follows - revoking it afterwards removes the right entry
+    revoke_offer(offers[0], LENDER, pwn)
+    assert pwn_deed.offers(offers[0]) == (0, 0, ZERO_ADDRESS, (ZERO_ADDRESS, 0, 0, 0))
+    assert list(pwn_deed.getOffers(did)) == [offers[2], offers[1]]
+    revoke_offer(offers[2], LENDER, pwn)
+    assert list(pwn_deed.getOffers(did)) == [offers[1]]
+    assert pwn_deed.offers(offers[1]) == (
+        did,
+        2**200 + 1,
+        RANDOM_USER.address,
+        (erc20.address, 0, 11, 0),
+    )
+
+    # the accepted offer stays readable for the repayment & claim
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    set_approve(RANDOM_USER, pwn_vault.address, erc20, ERC20_VAL, amount=11)
+    send_token(RANDOM_USER, LENDER, 11, erc20, ERC20_VAL)
+    accept_offer(offers[1], PLEDGER, pwn)
+    assert pwn_deed.offers(offers[1]) == (
+        did,
+        2**200 + 1,
+        RANDOM_USER.address,
+        (erc20.address, 0, 11, 0),
+    )
+    assert pwn_deed.getAcceptedOffer(did) == offers[1]
@@ -0,0 +1,95 @@
+from scripts.helpful_scripts import get_account
+from brownie import accounts, chain, exceptions
+from scripts.deploy_pwn import (
+    set_approve,
+    send_token,
+    pwn_create_deed_with_permit,
+    make_offer,
+    sign_loan_permit,
+    accept_offer_with_permit,
+    repay_loan_with_permit,
+    claim_deed,
+    ERC20_VAL,
+    ERC1155_VAL,
+)
+from scripts.signed_offers import sign_permit
+import pytest
+
+
+def set_up_accounts(erc20):
+    # permits are signed with local keys, unlocked development accounts can't sign in process
+    PLEDGER = accounts.add()
+    LENDER = accounts.add()
+    for account in (PLEDGER, LENDER):
+        get_account(index=2).transfer(account, "1 ether")
+        send_token(account, get_account(index=2), 150, erc20, ERC20_VAL)
+    return PLEDGER, LENDER
+
+
+def test_loan_with_permits(base_set_up):
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    PLEDGER, LENDER = set_up_accounts(erc20)
+    # the Deed token approval is a one-off operator approval, not one per loan
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+
+    did = pwn_create_deed_with_permit(erc20.address, 3600, 50, PLEDGER, pwn)
+    assert erc20.balanceOf(pwn_vault) == 50
+    assert pwn_deed.getDeedStatus(did) == 1
+
+    offer = make_offer(erc20.address, 100, did, 110, LENDER, pwn)
+    accept_offer_with_permit(offer, sign_loan_permit(offer, LENDER, pwn), PLEDGER, pwn)
+    assert pwn_deed.getDeedStatus(did) == 2
+    assert pwn_deed.balanceOf(LENDER, did) == 1
+    assert erc20.balanceOf(PLEDGER) == 200
+
+    repay_loan_with_permit(did, PLEDGER, pwn)
+    assert pwn_deed.getDeedStatus(did) == 3
+    assert erc20.balanceOf(PLEDGER) == 140
+    assert erc20.balanceOf(pwn_vault) == 110
+
+    claim_deed(did, LENDER, pwn)
+    assert erc20.balanceOf(LENDER) == 160
+    # every permit was used up by its call
+    assert erc20.allowance(PLEDGER, pwn_vault) == 0
+    assert erc20.allowance(LENDER, pwn_vault) == 0
+
+
+def test_front_run_permit(base_set_up):
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    PLEDGER, LENDER = set_up_accounts(erc20)
+    RANDOM_USER = get_account(index=3)
+
+    # anyone submitting the permit first doesn't break the call using it
+    permit = sign_permit(erc20, PLEDGER, pwn_vault.address, 50)
+    erc20.permit(PLEDGER, pwn_vault, *permit, {"from": RANDOM_USER})
+    did = pwn.createDeedWithPermit(
+        erc20.address, 3600, 50, permit, {"from": PLEDGER}
+    ).return_value
+    assert pwn_deed.getDeedStatus(did) == 1
+    assert erc20.balanceOf(pwn_vault) == 50
+
+
+def test_permit_reverts(base_set_up):
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    PLEDGER, LENDER = set_up_accounts(erc20)
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+
+    # revert: ERC20: insufficient allowance - a permit for less than the collateral
+    permit = sign_permit(erc20, PLEDGER, pwn_vault.address, 49)
+    with pytest.raises(exceptions.VirtualMachineError):
+        pwn.createDeedWithPermit(erc20.address, 3600, 50, permit, {"from": PLEDGER})
+
+    # revert: ERC20: insufficient allowance - an expired permit
+    permit = sign_permit(erc20, PLEDGER, pwn_vault.address, 50, chain.time() - 1)
+    with pytest.raises(exceptions.VirtualMachineError):
+        pwn.createDeedWithPermit(erc20.address, 3600, 50, permit, {"from": PLEDGER})
+
+    did = pwn_create_deed_with_permit(erc20.address, 3600, 50, PLEDGER, pwn)
+    offer = make_offer(erc20.address, 100, did, 110, LENDER, pwn)
+
+    # revert: ERC20: insufficient allowance - the permit is signed by the borrower
+    # instead of the lender
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_offer_with_permit(
+            offer, sign_loan_permit(offer, PLEDGER, pwn), PLEDGER, pwn
+        )
@@ -0,0 +1,145 @@
+from scripts.helpful_scripts import get_account
+from brownie import accounts, chain, exceptions
+from scripts.deploy_pwn import (
+    set_approve,
+    send_token,
+    pwn_create_deed,
+    accept_signed_offer,
+    revoke_signed_offers,
+    repay_loan,
+    claim_deed,
+    ERC20_VAL,
+    ERC1155_VAL,
+)
+from scripts.signed_offers import (
+    offer_terms,
+    sign_offer,
+    offer_hash,
+    terms_tuple,
+    verify_offer,
+    next_nonce,
+)
+import pytest
+
+
+def set_up_signed_offer(base_set_up, nonce=0, deadline=None):
+    # the lender signs with a local key, unlocked development accounts can't sign in process
+    PLEDGER = get_account(index=1)
+    LENDER = accounts.add()
+    (
+        pwn_deed,
+        pwn_vault,
+        pwn,
+        erc20,
+        erc721,
+        erc721_token_id,
+        erc1155,
+        erc1155_id,
+    ) = base_set_up
+    get_account(index=2).transfer(LENDER, "1 ether")
+    send_token(LENDER, get_account(index=2), 100, erc20, ERC20_VAL)
+    set_approve(LENDER, pwn_vault.address, erc20, ERC20_VAL, amount=100)
+
+    set_approve(PLEDGER, pwn_vault.address, erc1155, ERC1155_VAL)
+    set_approve(PLEDGER, pwn_vault.address, pwn_deed, ERC1155_VAL)
+    did = pwn_create_deed(
+        erc1155.address, ERC1155_VAL, 3600, erc1155_id, 1, PLEDGER, pwn
+    )
+
+    deadline = chain.time() + 3600 if deadline is None else deadline
+    terms = offer_terms(LENDER, did, erc20.address, 100, 110, nonce, deadline)
+    signature = sign_offer(terms, LENDER, pwn_deed)
+    return PLEDGER, LENDER, did, terms, signature
+
+
+def test_accept_signed_offer(base_set_up):
+    pwn_deed, pwn_vault, pwn, erc20 = base_set_up[:4]
+    PLEDGER, LENDER, did, terms, signature = set_up_signed_offer(base_set_up)
+
+    assert pwn_deed.getSignedOfferHash(terms_tuple(terms)) == offer_hash(
+        terms, pwn_deed
+    )
+    assert verify_offer(terms, signature, pwn_deed) == (True, None)
+
+    pledger_balance = erc20.balanceOf(PLEDGER)
+    offer = accept_signed_offer(terms, signature, PLEDGER, pwn)
+
+    assert offer == offer_hash(terms, pwn_deed)
+    assert pwn_deed.getAcceptedOffer(did) == offer
+    assert pwn_deed.getDeedStatus(did) == 2
+    assert pwn_deed.getLender(offer) == LENDER
+    assert pwn_deed.toBePaid(offer) == 110
+    assert pwn_deed.balanceOf(LENDER, did) == 1
+    assert erc20.balanceOf(PLEDGER) == pledger_balance + 100
+    assert pwn_deed.isOfferNonceUsed(LENDER, terms["nonce"])
+    assert verify_offer(terms, signature, pwn_deed) == (
+        False,
+        "Offer nonce already used",
+    )
+
+    # an accepted signed offer is repaid & claimed like any other offer
+    set_approve(PLEDGER, pwn_vault.address, erc20, ERC20_VAL, amount=110)
+    repay_loan(did, PLEDGER, pwn)
+    claim_deed(did, LENDER, pwn)
+    assert erc20.balanceOf(LENDER) == 110
+
+
+def test_accept_signed_offer_reverts(base_set_up):
+    pwn_deed, pwn_vault, pwn = base_set_up[:3]
+    PLEDGER, LENDER, did, terms, signature = set_up_signed_offer(base_set_up)
+    RANDOM_USER = get_account(index=3)
+
+    # revert: The deed doesn't belong to the caller
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_signed_offer(terms, signature, RANDOM_USER, pwn)
+
+    # revert: Invalid offer signature - the borrower can't change the signed terms
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_signed_offer(dict(terms, toBePaid=100), signature, PLEDGER, pwn)
+
+    # revert: Invalid offer signature - signed by someone else than the lender
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_signed_offer(
+            terms, sign_offer(terms, accounts.add(), pwn_deed), PLEDGER, pwn
+        )
+
+    accept_signed_offer(terms, signature, PLEDGER, pwn)
+
+    # revert: Offer nonce already used - a signature can't be replayed
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_signed_offer(terms, signature, PLEDGER, pwn)
+
+
+def test_signed_offer_expired(base_set_up):
+    pwn_deed = base_set_up[0]
+    pwn = base_set_up[2]
+    PLEDGER, LENDER, did, terms, signature = set_up_signed_offer(
+        base_set_up, deadline=chain.time() + 60
+    )
+    chain.sleep(120)
+    chain.mine()
+
+    assert verify_offer(terms, signature, pwn_deed) == (False, "Offer expired")
+    # revert: Offer expired
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_signed_offer(terms, signature, PLEDGER, pwn)
+
+
+def test_revoke_signed_offers(base_set_up):
+    pwn_deed = base_set_up[0]
+    pwn = base_set_up[2]
+    PLEDGER, LENDER, did, terms, signature = set_up_signed_offer(base_set_up, nonce=3)
+
+    assert next_nonce(LENDER, pwn_deed=pwn_deed) == 0
+    tx = revoke_signed_offers(0, 0b1011, LENDER, pwn)
+    assert tx.events["OfferNoncesRevoked"]["mask"] == 0b1011
+    assert next_nonce(LENDER, pwn_deed=pwn_deed) == 2
+    assert pwn_deed.isOfferNonceUsed(LENDER, 3)
+
+    # revert: Offer nonce already used
+    with pytest.raises(exceptions.VirtualMachineError):
+        accept_signed_offer(terms, signature, PLEDGER, pwn)
+
+    # a revoked whole word is skipped
+    revoke_signed_offers(1, 2**256 - 1, LENDER, pwn)
+    assert next_nonce(LENDER, start=256, pwn_deed=pwn_deed) == 512